@@ -0,0 +1,133 @@
+"""Per-tick CPU cost of AnimationService playback.
+
+Compares the array-backed `_continue_playback` against the previous
+dict-per-frame implementation on the same recording, with a robot stub
+whose `send_action`/`send_positions` do nothing, so only trajectory
+handling is timed.
+Blend ticks (the ramp into a clip) and steady playback ticks are reported
+separately.
+
+    uv run -m benchmarks.bench_animation_tick --name idle --ticks 5000
+"""
+import argparse
+import time
+
+from lelamp.service.motors.animation_service import AnimationService
+
+from .common import RECORDINGS_DIR
+
+
+class NullRobot:
+    def send_action(self, action):
+        return action
+
+    def send_positions(self, positions, checked=False):
+        return positions
+
+
+class LegacyAnimationService(AnimationService):
+    """The dict-per-frame playback AnimationService used before the array cache"""
+
+    def _handle_play(self, recording_name):
+        actions = self._load_recording(recording_name)
+        self._current_recording = recording_name
+        self._current_actions = actions
+        self._current_frame_index = 0
+        if self._current_state is not None:
+            self._interpolation_frames = int(self.duration * self.fps)
+            self._interpolation_target = actions[0]
+        else:
+            self._interpolation_frames = 0
+            self._interpolation_target = None
+
+    def _continue_playback(self):
+        if self._interpolation_frames > 0 and self._interpolation_target is not None:
+            progress = 1.0 - (self._interpolation_frames / (self.duration * self.fps))
+            progress = max(0.0, min(1.0, progress))
+            interpolated_action = {}
+            for joint in self._interpolation_target.keys():
+                current_val = self._current_state.get(joint, 0)
+                target_val = self._interpolation_target[joint]
+                interpolated_action[joint] = current_val + (target_val - current_val) * progress
+            self.robot.send_action(interpolated_action)
+            self._current_state = interpolated_action.copy()
+            self._interpolation_frames -= 1
+            return
+
+        if self._current_frame_index < len(self._current_actions):
+            action = self._current_actions[self._current_frame_index]
+            self.robot.send_action(action)
+            self._current_state = action.copy()
+            self._current_frame_index += 1
+        else:
+            self._current_frame_index = 0
+
+    def _load_recording(self, recording_name):
+        cache = self.__dict__.setdefault("_legacy_cache", {})
+        if recording_name not in cache:
+            recording = super()._load_recording(recording_name)
+            cache[recording_name] = [dict(zip(self._joint_names, row)) for row in recording.tolist()]
+        return cache[recording_name]
+
+
+def make_service(service_cls, name, fps, duration, recordings_dir):
+    service = service_cls(port="sim://", lamp_id="bench", fps=fps, duration=duration, idle_recording=name)
+    service.recordings_dir = recordings_dir
+    service.robot = NullRobot()
+    return service
+
+
+def time_ticks(service, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        service._continue_playback()
+    return (time.perf_counter() - start) / ticks
+
+
+def bench(service_cls, name, ticks, fps, duration, recordings_dir):
+    """Returns (blend tick seconds, playback tick seconds)"""
+    service = make_service(service_cls, name, fps, duration, recordings_dir)
+
+    # Play once to establish a current state, then time the ramp into a replay
+    service._handle_play(name)
+    service._continue_playback()
+    service._handle_play(name)
+    if service._blend_frames is not None:
+        blend_frames = len(service._blend_frames)
+    else:
+        blend_frames = int(duration * fps)
+    blend = time_ticks(service, blend_frames)
+    playback = time_ticks(service, ticks)
+    return blend, playback
+
+
+def run(name="idle", ticks=5000, fps=30, duration=3.0, recordings_dir=RECORDINGS_DIR):
+    legacy_blend, legacy_playback = bench(LegacyAnimationService, name, ticks, fps, duration, recordings_dir)
+    array_blend, array_playback = bench(AnimationService, name, ticks, fps, duration, recordings_dir)
+    return {
+        "recording": name,
+        "blend_us": {"legacy": legacy_blend * 1e6, "array": array_blend * 1e6},
+        "playback_us": {"legacy": legacy_playback * 1e6, "array": array_playback * 1e6},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AnimationService per-tick CPU")
+    parser.add_argument('--name', type=str, default='idle', help='Recording to play (default: idle)')
+    parser.add_argument('--ticks', type=int, default=5000, help='Number of playback ticks to time')
+    parser.add_argument('--fps', type=int, default=30, help='Playback rate (default: 30)')
+    parser.add_argument('--duration', type=float, default=3.0, help='Blend duration in seconds')
+    parser.add_argument('--dir', type=str, default=RECORDINGS_DIR, help='Recordings directory')
+    args = parser.parse_args()
+
+    result = run(args.name, args.ticks, args.fps, args.duration, args.dir)
+
+    print(f"{'':12} {'legacy':>10} {'array':>10} {'speedup':>8}")
+    for phase in ("blend", "playback"):
+        legacy = result[f"{phase}_us"]["legacy"]
+        array = result[f"{phase}_us"]["array"]
+        print(f"{phase:12} {legacy:8.2f}us {array:8.2f}us {legacy / array:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
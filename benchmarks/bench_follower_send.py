@@ -0,0 +1,74 @@
+"""Per-frame cost of LeLampFollower's send path, excluding serial I/O.
+
+Times the previous dict-based `send_action` body against the array
+`send_positions` fast path and the `send_action` wrapper over it. The bus
+is replaced by a stub whose `sync_write` does nothing.
+
+    uv run -m benchmarks.bench_follower_send --frames 20000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from lelamp.follower import LeLampFollower, LeLampFollowerConfig
+
+
+class StubBus:
+    is_connected = True
+
+    def __init__(self, motors):
+        self.motors = motors
+
+    def sync_write(self, data_name, values):
+        pass
+
+    def sync_read(self, data_name):
+        return dict.fromkeys(self.motors, 0.0)
+
+
+def legacy_send_action(robot, action):
+    """The dict-comprehension send path LeLampFollower.send_action used to run"""
+    goal_pos = {key.removesuffix(".pos"): val for key, val in action.items() if key.endswith(".pos")}
+    robot.bus.sync_write("Goal_Position", goal_pos)
+    return {f"{motor}.pos": val for motor, val in goal_pos.items()}
+
+
+def time_frames(send, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        send(frame)
+    return (time.perf_counter() - start) / len(frames)
+
+
+def run(frames=20000):
+    robot = LeLampFollower(LeLampFollowerConfig(port="bench", id="bench"))
+    robot.bus = StubBus(robot.bus.motors)
+    keys = list(robot.action_features)
+
+    positions = np.random.default_rng(0).uniform(-100, 100, size=(frames, len(keys)))
+    actions = [dict(zip(keys, row)) for row in positions.tolist()]
+
+    return {
+        "legacy_send_action_us": time_frames(lambda action: legacy_send_action(robot, action), actions) * 1e6,
+        "send_action_us": time_frames(robot.send_action, actions) * 1e6,
+        "send_positions_us": time_frames(robot.send_positions, positions) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LeLampFollower send paths")
+    parser.add_argument('--frames', type=int, default=20000, help='Number of frames to send')
+    args = parser.parse_args()
+
+    result = run(args.frames)
+    legacy = result["legacy_send_action_us"]
+    fast = result["send_positions_us"]
+
+    print(f"legacy send_action:   {legacy:8.2f} us")
+    print(f"send_action wrapper:  {result['send_action_us']:8.2f} us")
+    print(f"send_positions:       {fast:8.2f} us  ({legacy / fast:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
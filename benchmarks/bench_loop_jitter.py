@@ -0,0 +1,64 @@
+"""End-to-end jitter of the AnimationService control loop over a long run.
+
+Starts the service on a simulated bus (idle playback plus a gesture every
+few seconds) and measures the interval between consecutive Goal_Position
+writes as seen by the bus.
+
+    uv run -m benchmarks.bench_loop_jitter --seconds 600
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from lelamp.service.motors.animation_service import AnimationService
+
+from .common import DEFAULT_SIM_PORT, RECORDINGS_DIR, distribution
+
+
+def run(seconds=30.0, fps=30, gesture="nod", gesture_every=5.0, port=DEFAULT_SIM_PORT,
+        recordings_dir=RECORDINGS_DIR):
+    service = AnimationService(port=port, lamp_id="bench", fps=fps)
+    service.recordings_dir = recordings_dir
+    service.start()
+    try:
+        end = time.perf_counter() + seconds
+        next_gesture = time.perf_counter() + gesture_every
+        while time.perf_counter() < end:
+            time.sleep(0.05)
+            if gesture and time.perf_counter() >= next_gesture:
+                service.dispatch("play", gesture)
+                next_gesture += gesture_every
+        times, _ = service.robot.bus.goal_trajectory()
+        stats = service.timing_stats
+    finally:
+        service.stop()
+
+    intervals = np.diff(times)
+    return {
+        "seconds": seconds,
+        "fps": fps,
+        "frames": int(len(times)),
+        "achieved_hz": float((len(times) - 1) / (times[-1] - times[0])) if len(times) > 1 else 0.0,
+        "interval_ms": distribution(intervals),
+        "jitter_ms": distribution(np.abs(intervals - 1.0 / fps)),
+        "scheduler": stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AnimationService loop jitter on a simulated bus")
+    parser.add_argument('--seconds', type=float, default=30.0, help='Run length in seconds')
+    parser.add_argument('--fps', type=int, default=30, help='Control rate (default: 30)')
+    parser.add_argument('--gesture', type=str, default='nod', help='Gesture to play periodically')
+    parser.add_argument('--gesture-every', type=float, default=5.0, help='Seconds between gestures')
+    parser.add_argument('--port', type=str, default=DEFAULT_SIM_PORT, help='Simulated bus port')
+    parser.add_argument('--dir', type=str, default=RECORDINGS_DIR, help='Recordings directory')
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.seconds, args.fps, args.gesture, args.gesture_every, args.port, args.dir), indent=2))
+
+
+if __name__ == "__main__":
+    main()
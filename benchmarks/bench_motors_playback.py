@@ -0,0 +1,92 @@
+"""MotorsService playback timing against a simulated bus.
+
+`playback` plays a recording through MotorsService._handle_play and
+compares the time of every Goal_Position write with the ideal 1/fps grid.
+`throughput` drives the follower from a FixedRateScheduler at several
+control rates and reports the rate actually achieved given the bus latency.
+
+    uv run -m benchmarks.bench_motors_playback --name nod --rates 30 60 120
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from lelamp.follower import LeLampFollower, LeLampFollowerConfig
+from lelamp.service.motors import MotorsService
+from lelamp.utils import FixedRateScheduler
+
+from .common import DEFAULT_SIM_PORT, RECORDINGS_DIR, distribution
+
+
+def bench_playback(name, fps, port, recordings_dir):
+    service = MotorsService(port=port, lamp_id="bench", fps=fps)
+    service.recordings_dir = recordings_dir
+    service.robot = LeLampFollower(service.robot_config)
+    service.robot.connect(calibrate=False)
+    try:
+        service._handle_play(name)
+        times, _ = service.robot.bus.goal_trajectory()
+    finally:
+        service.robot.disconnect()
+
+    ideal = times[0] + np.arange(len(times)) / fps
+    return {
+        "recording": name,
+        "fps": fps,
+        "frames": int(len(times)),
+        "duration_s": float(times[-1] - times[0]),
+        "expected_duration_s": float((len(times) - 1) / fps),
+        "timing_error_ms": distribution(times - ideal),
+        "scheduler": service.last_timing_stats,
+    }
+
+
+def bench_throughput(rate_hz, seconds, port):
+    robot = LeLampFollower(LeLampFollowerConfig(port=port, id="bench"))
+    robot.connect(calibrate=False)
+    frame = np.zeros(len(robot.bus.motors))
+    try:
+        scheduler = FixedRateScheduler(rate_hz)
+        n_ticks = int(seconds * rate_hz)
+        start = time.perf_counter()
+        scheduler.start(start)
+        for _ in range(n_ticks):
+            robot.send_positions(frame)
+            scheduler.wait()
+        elapsed = time.perf_counter() - start
+        times, _ = robot.bus.goal_trajectory()
+    finally:
+        robot.disconnect()
+
+    return {
+        "target_hz": rate_hz,
+        "achieved_hz": len(times) / elapsed,
+        "write_interval_ms": distribution(np.diff(times)),
+        "scheduler": scheduler.stats.summary(),
+    }
+
+
+def run(name="nod", fps=30, rates=(30, 60, 120), seconds=5.0, port=DEFAULT_SIM_PORT, recordings_dir=RECORDINGS_DIR):
+    return {
+        "playback": bench_playback(name, fps, port, recordings_dir),
+        "throughput": {str(rate): bench_throughput(rate, seconds, port) for rate in rates},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MotorsService playback timing on a simulated bus")
+    parser.add_argument('--name', type=str, default='nod', help='Recording to play (default: nod)')
+    parser.add_argument('--fps', type=int, default=30, help='Playback rate (default: 30)')
+    parser.add_argument('--rates', type=int, nargs='+', default=[30, 60, 120], help='Control rates for throughput')
+    parser.add_argument('--seconds', type=float, default=5.0, help='Duration of each throughput run')
+    parser.add_argument('--port', type=str, default=DEFAULT_SIM_PORT, help='Simulated bus port')
+    parser.add_argument('--dir', type=str, default=RECORDINGS_DIR, help='Recordings directory')
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.name, args.fps, args.rates, args.seconds, args.port, args.dir), indent=2))
+
+
+if __name__ == "__main__":
+    main()
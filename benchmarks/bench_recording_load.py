@@ -0,0 +1,62 @@
+"""Time to load recordings from CSV versus the memory-mapped binary format.
+
+The binary copies are written to a temporary directory so the recordings
+directory is left untouched.
+
+    uv run -m benchmarks.bench_recording_load --repeat 20
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from lelamp.motion import list_recording_names, read_binary, read_csv, write_binary
+
+from .common import RECORDINGS_DIR
+
+
+def time_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(recordings_dir=RECORDINGS_DIR, repeat=20):
+    results = {}
+    tmp_dir = tempfile.mkdtemp(prefix="lelamp-bench-")
+    try:
+        for name in list_recording_names(recordings_dir):
+            csv_path = os.path.join(recordings_dir, f"{name}.csv")
+            if not os.path.exists(csv_path):
+                continue
+            bin_path = os.path.join(tmp_dir, f"{name}.bin")
+            recording = read_csv(csv_path)
+            write_binary(recording, bin_path)
+
+            csv_s = time_call(lambda: read_csv(csv_path), repeat)
+            bin_s = time_call(lambda: read_binary(bin_path).frames[-1], repeat)
+            results[name] = {
+                "frames": len(recording),
+                "csv_ms": csv_s * 1e3,
+                "binary_ms": bin_s * 1e3,
+                "speedup": csv_s / bin_s,
+            }
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recording load time")
+    parser.add_argument('--dir', type=str, default=RECORDINGS_DIR, help='Recordings directory')
+    parser.add_argument('--repeat', type=int, default=20, help='Loads per recording and format')
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.dir, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
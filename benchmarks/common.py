@@ -0,0 +1,27 @@
+import os
+from typing import Dict, Iterable
+
+import numpy as np
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(__file__), "..", "lelamp", "recordings")
+
+# Serial turnaround of a USB-serial adapter plus servo return delay, roughly
+# what a Waveshare bus servo adapter shows on a Pi.
+DEFAULT_SIM_PORT = "sim://?latency_ms=1.0&jitter_ms=0.3&seed=0"
+
+
+def distribution(samples: Iterable[float], scale: float = 1e3) -> Dict[str, float]:
+    """Summary statistics of samples, scaled (seconds to milliseconds by default)"""
+    values = np.asarray(list(samples), dtype=np.float64) * scale
+    if values.size == 0:
+        return {"count": 0}
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "p50": float(np.percentile(values, 50)),
+        "p90": float(np.percentile(values, 90)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
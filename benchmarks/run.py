@@ -0,0 +1,126 @@
+"""Run the control-path benchmark suite and write the results as JSON.
+
+Everything runs against a simulated bus or a stub robot, so no hardware is
+needed. Results from different runs can be compared with `--compare`.
+
+    uv run -m benchmarks.run --output benchmarks/results/latest.json
+    uv run -m benchmarks.run --quick --only load tick
+    uv run -m benchmarks.run --compare before.json after.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from . import bench_animation_tick, bench_follower_send, bench_loop_jitter, bench_motors_playback, bench_recording_load
+from .common import DEFAULT_SIM_PORT, RECORDINGS_DIR
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def suite(args):
+    """Benchmark name -> zero-argument callable returning a JSON-serializable result"""
+    quick = args.quick
+    return {
+        "load": lambda: bench_recording_load.run(args.dir, repeat=5 if quick else 20),
+        "tick": lambda: bench_animation_tick.run("idle", ticks=1000 if quick else 5000, recordings_dir=args.dir),
+        "send": lambda: bench_follower_send.run(frames=2000 if quick else 20000),
+        "playback": lambda: bench_motors_playback.run(
+            "nod", rates=args.rates, seconds=2.0 if quick else 10.0, port=args.port, recordings_dir=args.dir
+        ),
+        "jitter": lambda: bench_loop_jitter.run(
+            seconds=10.0 if quick else args.jitter_seconds, port=args.port, recordings_dir=args.dir
+        ),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(__file__), capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def flatten(result, prefix=""):
+    """{"a": {"b": 1}} -> {"a.b": 1}, numbers only"""
+    flat = {}
+    for key, value in result.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = flatten(json.load(f)["results"])
+    with open(after_path) as f:
+        after = flatten(json.load(f)["results"])
+
+    for key in sorted(set(before) & set(after)):
+        old, new = before[key], after[key]
+        change = f"{(new - old) / old * 100:+7.1f}%" if old else "      -"
+        print(f"{key:70} {old:12.4f} {new:12.4f} {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the LeLamp control-path benchmarks")
+    parser.add_argument('--only', type=str, nargs='+', help='Benchmarks to run (default: all)')
+    parser.add_argument('--quick', action='store_true', help='Shorter runs for a fast sanity check')
+    parser.add_argument('--rates', type=int, nargs='+', default=[30, 60, 120], help='Control rates for throughput')
+    parser.add_argument('--jitter-seconds', type=float, default=300.0, help='Length of the long jitter run')
+    parser.add_argument('--port', type=str, default=DEFAULT_SIM_PORT, help='Simulated bus port')
+    parser.add_argument('--dir', type=str, default=RECORDINGS_DIR, help='Recordings directory')
+    parser.add_argument('--output', type=str, help='Result file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', type=str, nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    benchmarks = suite(args)
+    selected = args.only or list(benchmarks)
+    unknown = [name for name in selected if name not in benchmarks]
+    if unknown:
+        parser.error(f"Unknown benchmarks {unknown}, expected some of {list(benchmarks)}")
+
+    started = datetime.datetime.now(datetime.timezone.utc)
+    results = {}
+    for name in selected:
+        print(f"Running {name}...")
+        t0 = time.perf_counter()
+        results[name] = benchmarks[name]()
+        print(f"  done in {time.perf_counter() - t0:.1f}s")
+
+    report = {
+        "meta": {
+            "started": started.isoformat(),
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "quick": args.quick,
+            "port": args.port,
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{started.strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+from .timeline import Cue, Timeline, read_timeline, write_timeline
+from .player import PreparedTimeline, SoundDeviceOutput, TimelinePlayer, render_motion
+
+__all__ = [
+    'Cue',
+    'Timeline',
+    'PreparedTimeline',
+    'TimelinePlayer',
+    'SoundDeviceOutput',
+    'render_motion',
+    'read_timeline',
+    'write_timeline',
+]
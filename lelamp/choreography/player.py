@@ -0,0 +1,348 @@
+import asyncio
+import dataclasses
+import math
+import os
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..follower import BusWorker
+from ..motion import JointLimits, MotionLimits, Trajectory, check_trajectory, crossfade, trajectory_cache
+from ..motion.procedural import per_joint
+from ..motion.validation import SOURCE_FPS
+from ..utils import JitterStats, PrecisionTimer
+from ..utils.timing import DEFAULT_SPIN_MARGIN
+from .timeline import TRACKS, Timeline
+
+# Lead time between play() and the first cue, so the loop is asleep on its first deadline when it comes
+DEFAULT_START_DELAY = 0.1
+# Waits longer than this are slept on the stop event, so stop() is not held up by a distant cue
+COARSE_MARGIN = 0.005
+
+
+@dataclass
+class PreparedTimeline:
+    """A timeline with its assets loaded and its motion rendered, so starting it does no I/O"""
+
+    timeline: Timeline
+    fps: float
+    duration: float
+    # Joint frames on the 1/fps grid from t=0, or None without joint cues
+    motion: Optional[np.ndarray]
+    joint_names: List[str]
+    # The motion is within the player's joint limits, so frames may be clamped against a predicted position
+    safe: bool
+    # (time, track, kind, payload) of every LED and audio cue in time order;
+    # audio payloads are (samples, sample_rate)
+    cues: List[Tuple[float, str, str, Any]]
+
+
+def read_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Samples of a 16-bit PCM WAV file as float32 (frames, channels), and its sample rate"""
+    with wave.open(path, 'rb') as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path} is not 16-bit PCM, convert it with e.g. ffmpeg -c:a pcm_s16le")
+        channels = f.getnchannels()
+        rate = f.getframerate()
+        data = f.readframes(f.getnframes())
+    samples = np.frombuffer(data, dtype="<i2").reshape(-1, channels)
+    return samples.astype(np.float32) / 32768.0, rate
+
+
+def sample_frames(frames: np.ndarray, position: float) -> np.ndarray:
+    """Frame at fractional index `position`, interpolated linearly and held past either end"""
+    last = len(frames) - 1
+    if position <= 0.0:
+        return frames[0]
+    if position >= last:
+        return frames[last]
+    index = int(position)
+    return frames[index] + (frames[index + 1] - frames[index]) * (position - index)
+
+
+def render_motion(start: np.ndarray, clips: List[Tuple[int, np.ndarray, MotionLimits]], fps: float) -> np.ndarray:
+    """Lay clips on one joint track, each crossfading in from wherever the track is at its start tick.
+
+    `clips` holds (start_tick, frames, limits) in start order. A 1-D clip is
+    a pose to move to, with NaN for joints that stay where they are. The
+    track starts at `start`, holds its pose between clips and ends where the
+    last clip settles.
+    """
+    track = np.asarray(start, dtype=np.float64)[None, :]
+    for tick, clip, limits in clips:
+        if len(track) <= tick:
+            track = np.concatenate([track, np.repeat(track[-1:], tick + 1 - len(track), axis=0)])
+        state = track[tick]
+        velocity = (track[tick] - track[tick - 1]) * fps if tick > 0 else None
+        if clip.ndim == 1:
+            clip = np.where(np.isnan(clip), state, clip)[None, :]
+        # The blend starts on the frame the track was going to play, so the switch holds no frame
+        blend, consumed = crossfade(state, clip, fps, limits, velocity)
+        # A clip shorter than its blend is reached on the frame after it
+        rest = clip[consumed:] if consumed < len(clip) else clip[-1:]
+        track = np.concatenate([track[:tick], blend, rest])
+    return track
+
+
+def _run_coroutine(coroutine):
+    """Run a coroutine to completion, also from a thread whose event loop is already running"""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
+class SoundDeviceOutput:
+    """Audio cue output on a sounddevice stream; a cue cuts off one still playing"""
+
+    def __init__(self, device=None):
+        # Imported here so timelines without audio need no audio stack
+        import sounddevice
+        self._sounddevice = sounddevice
+        self.device = device
+
+    def play(self, samples: np.ndarray, sample_rate: int):
+        self._sounddevice.play(samples, sample_rate, device=self.device)
+
+    def stop(self):
+        self._sounddevice.stop()
+
+
+class TimelinePlayer:
+    """Plays a Timeline's joint, LED and audio tracks against one perf_counter clock.
+
+    `prepare()` does everything slow up front: it loads and validates the
+    recordings, renders the joint track into one frame array starting from
+    the lamp's present pose, reads WAV files and synthesizes speech. `play()`
+    then runs a single thread that sleeps on absolute deadlines: joint frames
+    go out at `fps`, each sampled at the exact time the tick woke up, and LED
+    and audio cues fire on their own deadlines between ticks instead of
+    waiting for the next frame. Nothing drifts, since every output is timed
+    from the same start instant.
+
+    `latency` is how long each track takes from command to effect (servo lag,
+    audio buffering), in seconds keyed by track; that track is commanded that
+    much earlier so the outputs land together. `robot` is a connected
+    follower, `leds` anything with RGBService's dispatch() and `audio` an
+    object with play(samples, sample_rate) and stop(); a track without an
+    output is skipped.
+    """
+
+    def __init__(self, robot=None, leds=None, audio=None, fps: int = 30,
+                 latency: Optional[Dict[str, float]] = None, motion_limits: Optional[MotionLimits] = None,
+                 joint_limits: Optional[JointLimits] = None, recordings_dir: Optional[str] = None,
+                 interpolation: str = "linear", voice: str = "en-US-AvaNeural",
+                 spin_margin: float = DEFAULT_SPIN_MARGIN):
+        latency = dict(latency or {})
+        unknown = set(latency) - set(TRACKS)
+        if unknown:
+            raise KeyError(f"Unknown tracks {sorted(unknown)}, expected some of {TRACKS}")
+        self.robot = robot
+        self.leds = leds
+        self.audio = audio
+        self.fps = fps
+        self.latency = {track: float(latency.get(track, 0.0)) for track in TRACKS}
+        self.motion_limits = motion_limits or MotionLimits()
+        self.joint_limits = joint_limits or JointLimits()
+        self.recordings_dir = recordings_dir or os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                                             "recordings")
+        self.interpolation = interpolation
+        self.voice = voice
+        self.spin_margin = spin_margin
+
+        self._cache = trajectory_cache()
+        self._timer: Optional[PrecisionTimer] = None
+        self._lateness: Dict[str, JitterStats] = {}
+        self._worker: Optional[BusWorker] = None
+        self._stop_requested = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def prepare(self, timeline: Timeline, base_dir: Optional[str] = None) -> PreparedTimeline:
+        """Load every asset of `timeline` and render its joint track; relative audio paths start at `base_dir`"""
+        base_dir = base_dir or os.getcwd()
+        joint_names = list(self.robot.action_features) if self.robot is not None else None
+
+        # (tick, frames or pose, limits) of the joint track
+        clips = []
+        for cue in timeline.joints:
+            tick = int(round(cue.time * self.fps))
+            limits = self.motion_limits
+            if cue.kind == "recording":
+                entry = self._cache.get(self.recordings_dir, cue.value, joint_names, self.fps, self.interpolation)
+                if entry is None or len(entry.frames) == 0:
+                    raise FileNotFoundError(f"Recording not found: {cue.value}")
+                joint_names = joint_names or entry.joint_names
+                clips.append((tick, entry.frames, limits))
+            else:
+                if joint_names is None:
+                    raise ValueError("A pose cue needs a robot or an earlier recording cue to name the joints")
+                if "duration" in cue.options:
+                    duration = float(cue.options["duration"])
+                    limits = dataclasses.replace(limits, min_duration=duration, max_duration=duration)
+                clips.append((tick, per_joint(joint_names, cue.value, default=np.nan), limits))
+
+        cues = []
+        ends = [cue.time for cue in timeline.leds]
+        if timeline.leds and self.leds is None:
+            print(f"No LED output, skipping {len(timeline.leds)} LED cues")
+        elif timeline.leds:
+            cues.extend((cue.time, "leds", cue.kind, cue.value) for cue in timeline.leds)
+        if timeline.audio and self.audio is None:
+            self.audio = SoundDeviceOutput()
+        for cue in timeline.audio:
+            if cue.kind == "file":
+                samples, sample_rate = read_wav(os.path.join(base_dir, cue.value))
+            else:
+                samples, sample_rate = self._synthesize(cue.value, cue.options.get("voice", self.voice))
+            cues.append((cue.time, "audio", cue.kind, (samples, sample_rate)))
+            ends.append(cue.time + len(samples) / sample_rate)
+        cues.sort(key=lambda cue: cue[0])
+
+        motion = None
+        safe = False
+        if clips:
+            if self.robot is not None:
+                start = self.robot.read_present()
+            else:
+                first = clips[0][1]
+                start = first[0] if first.ndim == 2 else np.nan_to_num(first)
+            motion = render_motion(start, clips, self.fps)
+            ends.append((len(motion) - 1) / self.fps)
+
+        duration = timeline.duration if timeline.duration is not None else max(ends, default=0.0)
+        if motion is not None:
+            n_frames = int(round(duration * self.fps)) + 1
+            if len(motion) < n_frames:
+                motion = np.concatenate([motion, np.repeat(motion[-1:], n_frames - len(motion), axis=0)])
+            motion = motion[:n_frames]
+            # Checked at the rate recordings are checked at, since finite differences grow with the frame rate;
+            # only reported, as fixing it would move the joints off the other tracks' timing
+            times = np.arange(len(motion), dtype=np.float64) / self.fps
+            report = check_trajectory(Trajectory(times, motion, joint_names).resample(SOURCE_FPS), SOURCE_FPS,
+                                      self.joint_limits)
+            if report.violations:
+                print(f"Timeline {timeline.name} breaks joint limits ({report.position_violations} position, "
+                      f"{report.velocity_violations} velocity, {report.acceleration_violations} acceleration "
+                      f"samples at {SOURCE_FPS:.0f} fps), playing it unchanged")
+            motion.setflags(write=False)
+            safe = report.safe
+
+        return PreparedTimeline(timeline, self.fps, duration, motion, joint_names or [], safe, cues)
+
+    def play(self, prepared: PreparedTimeline, start_delay: float = DEFAULT_START_DELAY) -> float:
+        """Start playing in the background; returns the perf_counter time the timeline's t=0 falls on"""
+        if self.is_playing:
+            raise RuntimeError("A timeline is already playing")
+        # Late enough that the track with the most latency can still be commanded on time
+        start = time.perf_counter() + max(start_delay, max(self.latency.values()))
+        self._timer = PrecisionTimer(self.spin_margin)
+        self._lateness = {track: JitterStats() for track in TRACKS}
+        self._worker = None
+        if prepared.motion is not None and self.robot is not None:
+            self._worker = BusWorker(self.robot, name="timeline-io")
+            self._worker.start()
+        self._stop_requested.clear()
+        self._thread = threading.Thread(target=self._run, args=(prepared, start), name="timeline-player",
+                                        daemon=True)
+        self._thread.start()
+        return start
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the timeline to finish. Returns True if finished, False if timeout."""
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        return not self.is_playing
+
+    def stop(self, timeout: float = 2.0):
+        self._stop_requested.set()
+        self.wait(timeout)
+        if self.audio is not None:
+            self.audio.stop()
+
+    @property
+    def is_playing(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """How late each track's outputs were commanded relative to their deadlines"""
+        stats = {track: lateness.summary() for track, lateness in self._lateness.items()}
+        if self._worker is not None:
+            stats["bus"] = self._worker.stats
+        return stats
+
+    def _synthesize(self, text: str, voice: str) -> Tuple[np.ndarray, int]:
+        from ..service.tts import EdgeTTS
+
+        with tempfile.NamedTemporaryFile(suffix="_16k.wav", delete=False) as f:
+            path = f.name
+        try:
+            _run_coroutine(EdgeTTS(voice).synthesize(text, path))
+            return read_wav(path)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _run(self, prepared: PreparedTimeline, start: float):
+        try:
+            self._loop(prepared, start)
+        except Exception as e:
+            print(f"Error in timeline player: {e}")
+        finally:
+            if self._worker is not None:
+                self._worker.stop()
+
+    def _loop(self, prepared: PreparedTimeline, start: float):
+        motion = prepared.motion if self._worker is not None else None
+        period = 1.0 / prepared.fps
+        # Each track runs `latency` ahead of the shared clock
+        motion_lead = self.latency["joints"]
+        next_tick = start - motion_lead if motion is not None else math.inf
+        cues = [(start + cue_time - self.latency[track], track, kind, payload)
+                for cue_time, track, kind, payload in prepared.cues]
+        cues.sort(key=lambda cue: cue[0])
+        next_cue = 0
+        sent = False
+        skipped = False
+
+        while not self._stop_requested.is_set():
+            deadline = min(next_tick, cues[next_cue][0] if next_cue < len(cues) else math.inf)
+            if deadline == math.inf:
+                break
+            if self._stop_requested.wait(max(0.0, deadline - time.perf_counter() - COARSE_MARGIN)):
+                break
+            self._timer.sleep_until(deadline)
+
+            now = time.perf_counter()
+            while next_cue < len(cues) and cues[next_cue][0] <= now:
+                cue_deadline, track, kind, payload = cues[next_cue]
+                self._lateness[track].record(time.perf_counter() - cue_deadline)
+                if track == "leds":
+                    self.leds.dispatch(kind, payload)
+                else:
+                    self.audio.play(*payload)
+                next_cue += 1
+
+            if now >= next_tick:
+                # Sampled at the time the tick actually woke, so wake-up jitter does not become pose error
+                elapsed = now - start + motion_lead
+                self._worker.post(sample_frames(motion, elapsed * prepared.fps), prepared.safe and sent and not skipped)
+                self._lateness["joints"].record(time.perf_counter() - next_tick)
+                sent = True
+                if elapsed >= prepared.duration:
+                    next_tick = math.inf
+                else:
+                    next_tick += period
+                    # Resume on the grid after an overrun; the frame step is then larger than validated
+                    skipped = now >= next_tick
+                    if skipped:
+                        next_tick += math.ceil((now - next_tick) / period) * period
+                        if next_tick <= now:
+                            next_tick += period
+
+        # Let the last sound finish before reporting the timeline done
+        self._stop_requested.wait(max(0.0, start + prepared.duration - time.perf_counter()))
@@ -0,0 +1,111 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+TRACKS = ("joints", "leds", "audio")
+# What a cue of each track can hold; a cue names exactly one of these
+CUE_KINDS = {
+    "joints": ("recording", "pose"),
+    "leds": ("solid", "paint"),
+    "audio": ("file", "say"),
+}
+
+
+@dataclass
+class Cue:
+    """One time-stamped entry of a track.
+
+    `kind` says what `value` is: a recording name or a {joint: position}
+    pose, an RGBService "solid" colour or "paint" pattern, or a WAV file or
+    text to "say". Other fields of the cue, such as a pose's transition
+    `duration` or the `voice` of speech, are kept in `options`.
+    """
+
+    time: float
+    kind: str
+    value: Any
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Timeline:
+    """Time-stamped joint, LED and audio cues played against one clock.
+
+    Times are seconds from the start of the timeline. `duration` cuts the
+    timeline off; None plays until the last cue has finished.
+    """
+
+    name: str = ""
+    joints: List[Cue] = field(default_factory=list)
+    leds: List[Cue] = field(default_factory=list)
+    audio: List[Cue] = field(default_factory=list)
+    duration: Optional[float] = None
+
+    @property
+    def tracks(self) -> Dict[str, List[Cue]]:
+        return {track: getattr(self, track) for track in TRACKS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Timeline":
+        tracks = data.get("tracks", {})
+        unknown = set(tracks) - set(TRACKS)
+        if unknown:
+            raise ValueError(f"Unknown tracks {sorted(unknown)}, expected some of {TRACKS}")
+        duration = data.get("duration")
+        return cls(
+            name=data.get("name", ""),
+            duration=float(duration) if duration is not None else None,
+            **{track: _parse_track(track, tracks.get(track, [])) for track in TRACKS},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"name": self.name}
+        if self.duration is not None:
+            data["duration"] = self.duration
+        data["tracks"] = {
+            track: [{"time": cue.time, cue.kind: _to_json(cue.value), **cue.options} for cue in cues]
+            for track, cues in self.tracks.items() if cues
+        }
+        return data
+
+
+def read_timeline(path: str) -> Timeline:
+    with open(path, 'r') as f:
+        return Timeline.from_dict(json.load(f))
+
+
+def write_timeline(timeline: Timeline, path: str):
+    with open(path, 'w') as f:
+        json.dump(timeline.to_dict(), f, indent=2)
+
+
+def _parse_track(track: str, entries: List[Dict[str, Any]]) -> List[Cue]:
+    cues = []
+    for entry in entries:
+        kinds = [kind for kind in CUE_KINDS[track] if kind in entry]
+        if len(kinds) != 1:
+            raise ValueError(f"A {track} cue needs exactly one of {CUE_KINDS[track]}, got {entry}")
+        if "time" not in entry or float(entry["time"]) < 0:
+            raise ValueError(f"A {track} cue needs a time of zero or more seconds, got {entry}")
+        kind = kinds[0]
+        options = {key: value for key, value in entry.items() if key not in ("time", kind)}
+        cues.append(Cue(float(entry["time"]), kind, _from_json(kind, entry[kind]), options))
+    # Stable, so cues at the same time keep their file order
+    return sorted(cues, key=lambda cue: cue.time)
+
+
+def _from_json(kind: str, value: Any) -> Any:
+    # RGBService takes colours as (r, g, b) tuples or packed ints; JSON only has lists
+    if kind == "solid":
+        return tuple(value) if isinstance(value, list) else value
+    if kind == "paint":
+        return [tuple(color) if isinstance(color, list) else color for color in value]
+    return value
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return list(value)
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    return value
@@ -0,0 +1,79 @@
+import argparse
+import os
+
+from .motion.keyframes import DEFAULT_TOLERANCE, KeyframeTrajectory, write_keyframes
+from .motion.recording import (
+    BINARY_SUFFIX,
+    CSV_SUFFIX,
+    KEYFRAME_SUFFIX,
+    list_recording_names,
+    read_recording,
+    recording_path,
+    read_binary,
+    read_csv,
+    write_binary,
+    write_csv,
+)
+
+
+def convert_recording(recordings_dir, recording_name, to_format, force=False, tolerance=DEFAULT_TOLERANCE):
+    """Convert a single recording between CSV, binary and keyframes. Returns the written path or None."""
+    csv_path = os.path.join(recordings_dir, f"{recording_name}{CSV_SUFFIX}")
+    bin_path = os.path.join(recordings_dir, f"{recording_name}{BINARY_SUFFIX}")
+
+    if to_format == "key":
+        src_path = recording_path(recordings_dir, recording_name) or csv_path
+        dst_path = os.path.join(recordings_dir, f"{recording_name}{KEYFRAME_SUFFIX}")
+        reader = read_recording
+
+        def writer(recording, path):
+            write_keyframes(KeyframeTrajectory.from_recording(recording, tolerance), path)
+    elif to_format == "bin":
+        src_path, dst_path, reader, writer = csv_path, bin_path, read_csv, write_binary
+    else:
+        src_path, dst_path, reader, writer = bin_path, csv_path, read_binary, write_csv
+
+    if not os.path.exists(src_path):
+        print(f"Skipping {recording_name}: {os.path.basename(src_path)} not found")
+        return None
+
+    if os.path.exists(dst_path) and not force:
+        if os.path.getmtime(dst_path) >= os.path.getmtime(src_path):
+            print(f"Skipping {recording_name}: {os.path.basename(dst_path)} is up to date")
+            return None
+
+    recording = reader(src_path)
+    writer(recording, dst_path)
+
+    src_size = os.path.getsize(src_path)
+    dst_size = os.path.getsize(dst_path)
+    print(f"{recording_name}: {len(recording)} frames, {src_size} -> {dst_size} bytes")
+    return dst_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert recordings between CSV, binary and keyframe format")
+    parser.add_argument('--to', type=str, choices=['bin', 'csv', 'key'], default='bin', help='Target format (default: bin)')
+    parser.add_argument('--name', type=str, help='Name of the recording to convert (default: all recordings)')
+    parser.add_argument('--dir', type=str, default=os.path.join(os.path.dirname(__file__), "recordings"),
+                        help='Recordings directory')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Max keyframe reconstruction error in joint units (default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--force', action='store_true', help='Overwrite targets that are already up to date')
+    args = parser.parse_args()
+
+    names = [args.name] if args.name else list_recording_names(args.dir)
+    if not names:
+        print(f"No recordings found in {args.dir}")
+        return
+
+    converted = 0
+    for name in names:
+        if convert_recording(args.dir, name, args.to, force=args.force, tolerance=args.tolerance):
+            converted += 1
+
+    print(f"Converted {converted} of {len(names)} recordings to {args.to}")
+
+
+if __name__ == "__main__":
+    main()
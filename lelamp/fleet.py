@@ -0,0 +1,326 @@
+import argparse
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .follower import BusWorker, LeLampFollower, LeLampFollowerConfig
+from .motion import CachedTrajectory, MotionLimits, crossfade, trajectory_cache
+from .utils import FixedRateScheduler, OverrunPolicy
+from .utils.timing import DEFAULT_SPIN_MARGIN
+
+
+class _FleetLamp:
+    """Playback state of one lamp, advanced by the fleet loop's global tick"""
+
+    def __init__(self, lamp_id: str, robot: LeLampFollower, worker: BusWorker):
+        self.lamp_id = lamp_id
+        self.robot = robot
+        self.worker = worker
+        self.recording: Optional[str] = None
+        self.frames: Optional[np.ndarray] = None
+        self.safe = False
+        self.start_tick = 0
+        self.blend: Optional[np.ndarray] = None
+        self.consumed = 0
+        self.checked = False
+        self.switched = False
+        # Clip waiting for its start tick: (recording, frames, safe, start_tick)
+        self.scheduled: Optional[Tuple[str, np.ndarray, bool, int]] = None
+        self.current_state: Optional[np.ndarray] = None
+        self.previous_state: Optional[np.ndarray] = None
+
+    def switch(self, recording: str, frames: np.ndarray, safe: bool, tick: int, fps: float, limits: MotionLimits):
+        """Start `frames` at `tick`, crossfading from the pose last sent"""
+        self.recording = recording
+        self.frames = frames
+        self.safe = safe
+        self.start_tick = tick
+        self.blend = None
+        self.consumed = 0
+        self.checked = safe
+        # The first frame after a switch is sent unchecked
+        self.switched = True
+        if self.current_state is not None:
+            velocity = None
+            if self.previous_state is not None:
+                velocity = (self.current_state - self.previous_state) * fps
+            self.blend, self.consumed = crossfade(self.current_state, frames, fps, limits, velocity)
+
+    def frame_at(self, tick: int) -> Optional[np.ndarray]:
+        """Frame of the current clip at `tick`, or None once the clip has ended"""
+        if self.frames is None:
+            return None
+        elapsed = tick - self.start_tick
+        if self.blend is not None and elapsed < len(self.blend):
+            return self.blend[elapsed]
+        index = self.consumed + elapsed - (len(self.blend) if self.blend is not None else 0)
+        if index >= len(self.frames):
+            return None
+        return self.frames[index]
+
+    def send(self, frame: np.ndarray, checked: bool):
+        self.previous_state = self.current_state
+        self.current_state = frame
+        self.worker.post(frame, checked and not self.switched)
+        self.switched = False
+
+
+class LampFleet:
+    """Drives several follower lamps from one deadline-scheduled control loop.
+
+    A single thread ticks at `fps` on absolute deadlines and computes every
+    lamp's next frame from one global tick counter, so lamps started on the
+    same tick stay frame-locked for as long as they play, instead of drifting
+    apart like one process per lamp. Each bus gets its own BusWorker thread,
+    so a slow bus delays only its own writes. `play()` starts a recording on
+    all or some lamps, together or staggered by a phase offset; lamps return
+    to the idle recording when their clip ends.
+    """
+
+    def __init__(self, lamps: Union[Dict[str, str], Sequence[Tuple[str, str]]], fps: int = 30,
+                 idle_recording: str = "idle", overrun_policy: OverrunPolicy = OverrunPolicy.SKIP,
+                 interpolation: str = "linear", motion_limits: Optional[MotionLimits] = None,
+                 spin_margin: float = DEFAULT_SPIN_MARGIN, recordings_dir: Optional[str] = None):
+        # lamp_id -> port; ports may be "sim://..." for simulated buses
+        self.ports = dict(lamps)
+        self.fps = fps
+        self.idle_recording = idle_recording
+        self.overrun_policy = overrun_policy
+        self.interpolation = interpolation
+        self.motion_limits = motion_limits or MotionLimits()
+        self.spin_margin = spin_margin
+        self.recordings_dir = recordings_dir or os.path.join(os.path.dirname(__file__), "recordings")
+        self.tick = 0
+
+        self._lamps: Dict[str, _FleetLamp] = {}
+        self._joint_names: Optional[List[str]] = None
+        self._cache = trajectory_cache()
+        # Idle frames, resolved off the control loop and refreshed by each play()
+        self._idle: Optional[np.ndarray] = None
+        # (recording, frames, safe, {lamp_id: delay}) resolved by play() for the loop to schedule
+        self._commands: List[Tuple[str, np.ndarray, bool, Dict[str, float]]] = []
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._scheduler: Optional[FixedRateScheduler] = None
+
+    @property
+    def lamp_ids(self) -> List[str]:
+        return list(self.ports)
+
+    def start(self):
+        try:
+            for lamp_id, port in self.ports.items():
+                self._lamps[lamp_id] = self._connect(lamp_id, port)
+                if self._joint_names is None:
+                    self._joint_names = list(self._lamps[lamp_id].robot.action_features)
+                print(f"Fleet lamp {lamp_id} connected to {port}")
+
+            # Without idle a lamp would have nothing to return to once its clip ends
+            idle = self._cache.pin(self.recordings_dir, self.idle_recording, self._joint_names, self.fps,
+                                   self.interpolation)
+            if idle is None or len(idle.frames) == 0:
+                raise FileNotFoundError(f"Idle recording not found: {self.idle_recording}")
+        except Exception:
+            # Leave no lamp connected when one fails
+            self._disconnect_all()
+            raise
+
+        self.play(self.idle_recording)
+
+        self._running.set()
+        self._thread = threading.Thread(target=self._loop, name="fleet-control", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._running.clear()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._disconnect_all()
+
+    @staticmethod
+    def _connect(lamp_id: str, port: str) -> _FleetLamp:
+        robot = LeLampFollower(LeLampFollowerConfig(port=port, id=lamp_id))
+        worker = None
+        try:
+            robot.connect(calibrate=False)
+            worker = BusWorker(robot, name=f"fleet-io-{lamp_id}")
+            worker.start()
+        except Exception:
+            # connect() may fail after opening the bus, e.g. while configuring the motors
+            if worker is not None:
+                worker.stop()
+            if robot.bus.is_connected:
+                robot.bus.disconnect(robot.config.disable_torque_on_disconnect)
+            raise
+        return _FleetLamp(lamp_id, robot, worker)
+
+    def _disconnect_all(self):
+        for lamp in self._lamps.values():
+            lamp.worker.stop()
+            lamp.robot.disconnect()
+        self._lamps.clear()
+
+    def play(self, recording_name: str, lamps: Optional[Sequence[str]] = None,
+             offset: Union[float, Dict[str, float]] = 0.0):
+        """Start a recording on `lamps` (default all) on the next tick.
+
+        With a scalar `offset`, the i-th lamp starts `i * offset` seconds after
+        the first; a {lamp_id: seconds} mapping sets each lamp's delay. Lamps
+        with the same delay play frame-locked.
+        """
+        lamps = list(lamps) if lamps is not None else self.lamp_ids
+        unknown = [lamp_id for lamp_id in lamps if lamp_id not in self.ports]
+        if unknown:
+            raise KeyError(f"Unknown lamps {unknown}, expected some of {self.lamp_ids}")
+        if isinstance(offset, dict):
+            delays = {lamp_id: float(offset.get(lamp_id, 0.0)) for lamp_id in lamps}
+        else:
+            delays = {lamp_id: i * float(offset) for i, lamp_id in enumerate(lamps)}
+
+        # Loaded here, in the caller's thread, so a cold load never stalls the control loop
+        entry = self._get(recording_name)
+        if entry is None:
+            print(f"Recording not found: {recording_name}")
+            return
+        idle = self._get(self.idle_recording)
+        # Idle loops, and its seam is not a validated step
+        safe = entry.safe and recording_name != self.idle_recording
+
+        with self._lock:
+            if idle is not None:
+                self._idle = idle.frames
+            self._commands.append((recording_name, entry.frames, safe, delays))
+
+    @property
+    def is_playing(self) -> bool:
+        """True while any lamp plays or waits to play something other than idle"""
+        with self._lock:
+            if self._commands:
+                return True
+        return any(
+            lamp.scheduled is not None or (lamp.recording is not None and lamp.recording != self.idle_recording)
+            for lamp in list(self._lamps.values())
+        )
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every lamp is back on idle. Returns True if idle, False if timeout."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self.is_playing:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ticks": self.tick,
+            "jitter": self._scheduler.stats.summary() if self._scheduler is not None else {},
+            "lamps": {lamp_id: lamp.worker.stats for lamp_id, lamp in self._lamps.items()},
+        }
+
+    def _loop(self):
+        self._scheduler = FixedRateScheduler(self.fps, overrun=self.overrun_policy, spin_margin=self.spin_margin)
+        self._scheduler.start()
+        skipped = False
+        while self._running.is_set():
+            try:
+                self._apply_commands()
+                for lamp in self._lamps.values():
+                    self._advance(lamp, skipped)
+            except Exception as e:
+                print(f"Error in fleet loop: {e}")
+
+            ticks = self._scheduler.wait()
+            skipped = ticks > 1
+            self.tick += ticks
+
+    def _apply_commands(self):
+        # Under the lock so is_playing never sees a command between the queue and its lamps
+        with self._lock:
+            for recording_name, frames, safe, delays in self._commands:
+                for lamp_id, delay in delays.items():
+                    start_tick = self.tick + int(round(delay * self.fps))
+                    self._lamps[lamp_id].scheduled = (recording_name, frames, safe, start_tick)
+            self._commands = []
+
+    def _get(self, recording_name: str) -> Optional[CachedTrajectory]:
+        entry = self._cache.get(self.recordings_dir, recording_name, self._joint_names, self.fps, self.interpolation)
+        if entry is None or len(entry.frames) == 0:
+            return None
+        return entry
+
+    def _advance(self, lamp: _FleetLamp, skipped: bool):
+        tick = self.tick
+        if lamp.scheduled is not None and tick >= lamp.scheduled[3]:
+            recording_name, frames, safe, _ = lamp.scheduled
+            lamp.scheduled = None
+            lamp.switch(recording_name, frames, safe, tick, self.fps, self.motion_limits)
+
+        frame = lamp.frame_at(tick)
+        if frame is None and lamp.frames is not None:
+            if lamp.recording != self.idle_recording:
+                # Back to idle from wherever the clip ended
+                idle = self._idle
+                if idle is not None:
+                    lamp.switch(self.idle_recording, idle, False, tick, self.fps, self.motion_limits)
+                else:
+                    # Nothing to return to: hold the last frame sent and count the lamp as idle
+                    lamp.recording, lamp.frames = None, None
+            else:
+                # Loop idle
+                lamp.start_tick, lamp.blend, lamp.consumed = tick, None, 0
+            frame = lamp.frame_at(tick)
+        if frame is None:
+            return
+
+        lamp.send(frame, lamp.checked and not skipped)
+
+
+def parse_lamp(value: str) -> Tuple[str, str]:
+    lamp_id, sep, port = value.partition("=")
+    if not sep or not lamp_id or not port:
+        raise argparse.ArgumentTypeError(f"Expected ID=PORT, got {value!r}")
+    return lamp_id, port
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play recordings on several lamps from one control loop")
+    parser.add_argument('--lamp', type=parse_lamp, action='append', required=True,
+                        help='Lamp as ID=PORT, repeat for each lamp (PORT may be sim://)')
+    parser.add_argument('--name', type=str, action='append', required=True,
+                        help='Recording to play, repeat to play several in sequence')
+    parser.add_argument('--offset', type=float, default=0.0,
+                        help='Seconds between one lamp starting and the next (default: 0, synchronized)')
+    parser.add_argument('--fps', type=int, default=30, help='Control rate (default: 30)')
+    parser.add_argument('--spin-margin-ms', type=float, default=DEFAULT_SPIN_MARGIN * 1000,
+                        help='Spin this long before each frame deadline instead of sleeping (default: %(default)s)')
+    args = parser.parse_args()
+
+    fleet = LampFleet(args.lamp, fps=args.fps, spin_margin=args.spin_margin_ms / 1000)
+    fleet.start()
+    try:
+        for name in args.name:
+            print(f"Playing {name} on {len(fleet.lamp_ids)} lamps, {args.offset:.2f}s apart")
+            fleet.play(name, offset=args.offset)
+            fleet.wait_until_idle()
+    except KeyboardInterrupt:
+        print("Stopping fleet...")
+    finally:
+        stats = fleet.stats
+        fleet.stop()
+        jitter = stats["jitter"]
+        print(f"{stats['ticks']} ticks, jitter p99 {jitter.get('p99_ms', 0.0):.2f} ms, "
+              f"overruns {jitter.get('overruns', 0)}")
+        for lamp_id, bus in stats["lamps"].items():
+            frame = bus["frame"]
+            print(f"  {lamp_id}: {bus['written']} frames written, {bus['dropped']} dropped, "
+                  f"write p50 {frame['p50_ms']:.2f} p99 {frame['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,3 +16,4 @@
 
 from .config_lelamp_follower import LeLampFollowerConfig
 from .lelamp_follower import LeLampFollower
+from .bus_worker import BusWorker
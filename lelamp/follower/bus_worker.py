@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from lelamp.utils import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class _TimedBus:
+    """Forwards to a motors bus, timing every transaction into per-kind histograms"""
+
+    def __init__(self, bus, histograms: Dict[str, LatencyHistogram]):
+        self._bus = bus
+        self._histograms = histograms
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._bus, name)
+
+    def _timed(self, kind: str, data_name: str, call, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return call(data_name, *args, **kwargs)
+        finally:
+            key = f"{kind} {data_name}"
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.record(time.perf_counter() - start)
+
+    def sync_read(self, data_name: str, *args, **kwargs):
+        return self._timed("sync_read", data_name, self._bus.sync_read, *args, **kwargs)
+
+    def sync_write(self, data_name: str, *args, **kwargs):
+        return self._timed("sync_write", data_name, self._bus.sync_write, *args, **kwargs)
+
+    def read(self, data_name: str, *args, **kwargs):
+        return self._timed("read", data_name, self._bus.read, *args, **kwargs)
+
+    def write(self, data_name: str, *args, **kwargs):
+        return self._timed("write", data_name, self._bus.write, *args, **kwargs)
+
+
+class BusWorker:
+    """Owns a connected follower's bus and writes target frames from its own thread.
+
+    Producers call `post()` with the latest target; the mailbox holds a single
+    frame, so a target that the bus has not picked up yet is overwritten (and
+    counted as dropped) instead of queued behind. Every bus transaction is
+    timed into `histograms`, keyed by transaction kind and register, and
+    `frame_latency` records how long each written target waited in the mailbox
+    plus its write time. `on_write(timestamp, goal)`, if given, is called from
+    the worker thread after each write with the goal actually sent.
+    """
+
+    def __init__(self, robot, name: str = "bus-io", on_write: Optional[Callable[[float, np.ndarray], Any]] = None):
+        self.robot = robot
+        self.name = name
+        self.on_write = on_write
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.frame_latency = LatencyHistogram()
+        self.posted = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+
+        n_motors = len(robot.action_features)
+        self._slot = np.zeros(n_motors, dtype=np.float64)
+        self._work = np.zeros(n_motors, dtype=np.float64)
+        self._slot_time = 0.0
+        self._slot_checked = False
+        self._work_checked = False
+        self._fresh = False
+        self._lock = threading.Lock()
+        self._available = threading.Event()
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._bus = None
+
+    def start(self):
+        if self._running.is_set():
+            return
+        # From here on only the worker thread talks to the bus
+        self._bus = self.robot.bus
+        self.robot.bus = _TimedBus(self._bus, self.histograms)
+        self._running.set()
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Write the last posted frame, then stop the thread and hand the bus back to the robot"""
+        if not self._running.is_set():
+            return
+        self._running.clear()
+        self._available.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning(f"{self.name} did not stop within timeout")
+        self.robot.bus = self._bus
+
+    def post(self, positions: np.ndarray, checked: bool = False):
+        """Make `positions` the next frame to write, replacing any frame not yet written.
+
+        `checked` is passed on to `send_positions`; it is cleared when the frame
+        replaces an unwritten one, since the step from the last write is then
+        larger than the validated trajectory's.
+        """
+        with self._lock:
+            if self._fresh:
+                self.dropped += 1
+            self._slot_checked = checked and not self._fresh
+            self._slot[:] = positions
+            self._slot_time = time.perf_counter()
+            self._fresh = True
+            self.posted += 1
+        self._available.set()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "posted": self.posted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "frame": self.frame_latency.summary(),
+            "transactions": {key: histogram.summary() for key, histogram in self.histograms.items()},
+        }
+
+    def _take(self) -> Optional[float]:
+        """Move the mailbox frame into the work buffer; returns its post time or None if empty"""
+        with self._lock:
+            if not self._fresh:
+                return None
+            self._work[:] = self._slot
+            self._work_checked = self._slot_checked
+            self._fresh = False
+            return self._slot_time
+
+    def _loop(self):
+        while True:
+            self._available.wait(timeout=0.1)
+            self._available.clear()
+            posted_at = self._take()
+            if posted_at is not None:
+                try:
+                    sent = self.robot.send_positions(self._work, checked=self._work_checked)
+                    written_at = time.perf_counter()
+                    self.written += 1
+                    self.frame_latency.record(written_at - posted_at)
+                    if self.on_write is not None:
+                        self.on_write(written_at, sent)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"{self.name} write failed: {e}")
+            if not self._running.is_set():
+                break
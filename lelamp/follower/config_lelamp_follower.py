@@ -24,7 +24,8 @@ from lerobot.robots import RobotConfig
 @RobotConfig.register_subclass("lelamp_follower")
 @dataclass
 class LeLampFollowerConfig(RobotConfig):
-    # Port to connect to the arm
+    # Port to connect to the arm. Use "sim://" (optionally with query options such as
+    # "sim://?latency_ms=2&tau_ms=60") for a simulated bus, see lelamp.sim.SimBusConfig.
     port: str
 
     disable_torque_on_disconnect: bool = True
@@ -34,6 +35,32 @@ class LeLampFollowerConfig(RobotConfig):
     # the number of motors in your follower arms.
     max_relative_target: int | None = None
 
+    # With `max_relative_target`, Present_Position is read before every write by default (interval 0), and the
+    # clamp is taken against the measured position. A positive `present_read_interval` opts into reading at
+    # most that often and clamping against a prediction in between, made from the commanded goals by modeling
+    # each servo as a first-order lag with time constant `servo_lag_ms`; a stalled or pushed joint then goes
+    # unnoticed until the next read.
+    present_read_interval: float = 0.0
+    servo_lag_ms: float = 50.0
+    # Frames sent with `checked=True` continue a trajectory validated against joint limits. They are still
+    # clamped, but read Present_Position at most every `checked_read_interval` seconds and are clamped against
+    # the prediction in between.
+    checked_read_interval: float = 0.1
+
+    # Tracking telemetry: read Present_Position on this fraction of writes (0 disables it) and compare it with
+    # the commanded goals. Rolling statistics cover `telemetry_window` reads; if `telemetry_path` is set the
+    # recorded arrays are saved there (.npz) on disconnect.
+    telemetry_fraction: float = 0.0
+    telemetry_window: int = 300
+    telemetry_path: str | None = None
+
+    # Goal_Position writes skip motors whose goal moved less than `write_deadband` (in the motors' normalized
+    # units) since the value last written to them. Set a scalar for all motors, a list in motor order or a
+    # {motor: deadband} dict. Off (0) by default, so every frame writes every motor; with a deadband, held goals
+    # are only rewritten on every `full_write_interval`-th frame, which writes all motors.
+    write_deadband: float | list[float] | dict[str, float] = 0.0
+    full_write_interval: int = 30
+
     # cameras
     cameras: dict[str, CameraConfig] = field(default_factory=dict)
 
@@ -19,17 +19,18 @@ import time
 from functools import cached_property
 from typing import Any
 
+import numpy as np
 from lerobot.cameras.utils import make_cameras_from_configs
 from lerobot.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
 from lerobot.motors import Motor, MotorCalibration, MotorNormMode
-from lerobot.motors.feetech import (
-    FeetechMotorsBus,
-    OperatingMode,
-)
+from lerobot.motors.feetech import OperatingMode
 
 from lerobot.robots import Robot
-from lerobot.robots.utils import ensure_safe_goal_position
+from lelamp.sim import make_motors_bus
 from .config_lelamp_follower import LeLampFollowerConfig
+from .present_estimator import PresentPositionEstimator
+from .telemetry import TrackingTelemetry
+from .write_filter import DeltaWriteFilter
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +47,7 @@ class LeLampFollower(Robot):
         super().__init__(config)
         self.config = config
         norm_mode_body = MotorNormMode.DEGREES if config.use_degrees else MotorNormMode.RANGE_M100_100
-        self.bus = FeetechMotorsBus(
+        self.bus = make_motors_bus(
             port=self.config.port,
             motors={
                 "base_yaw": Motor(1, "sts3215", norm_mode_body),
@@ -60,6 +61,25 @@ class LeLampFollower(Robot):
 
         self.cameras = make_cameras_from_configs(self.config.cameras)
 
+        # Fixed motor order and reusable buffers for the array send path
+        self._motor_names = list(self.bus.motors)
+        self._action_keys = [f"{motor}.pos" for motor in self._motor_names]
+        self._goal = np.zeros(len(self._motor_names), dtype=np.float64)
+        self._goal_dict = dict.fromkeys(self._motor_names, 0.0)
+        self._has_goal = False
+        self._write_filter = DeltaWriteFilter(
+            self._motor_names, self.config.write_deadband, self.config.full_write_interval
+        )
+        self._present = PresentPositionEstimator(
+            len(self._motor_names), self.config.servo_lag_ms * 1e-3, self.config.present_read_interval
+        )
+        self.telemetry: TrackingTelemetry | None = None
+        self._telemetry_every = 0
+        self._ticks = 0
+        if self.config.telemetry_fraction > 0:
+            self.telemetry = TrackingTelemetry(self._motor_names, window=self.config.telemetry_window)
+            self._telemetry_every = max(1, round(1.0 / self.config.telemetry_fraction))
+
     @property
     def _motors_ft(self) -> dict[str, type]:
         return {f"{motor}.pos": float for motor in self.bus.motors}
@@ -104,6 +124,7 @@ class LeLampFollower(Robot):
             cam.connect()
 
         self.configure()
+        self._write_filter.reset()
         logger.info(f"{self} connected.")
 
     @property
@@ -173,6 +194,7 @@ class LeLampFollower(Robot):
         # Read arm position
         start = time.perf_counter()
         obs_dict = self.bus.sync_read("Present_Position")
+        self._present.correct(np.array([obs_dict[motor] for motor in self._motor_names]), time.perf_counter())
         obs_dict = {f"{motor}.pos": val for motor, val in obs_dict.items()}
         dt_ms = (time.perf_counter() - start) * 1e3
         logger.debug(f"{self} read state: {dt_ms:.1f}ms")
@@ -197,6 +219,8 @@ class LeLampFollower(Robot):
         `max_relative_target`. In this case, the action sent differs from original action.
         Thus, this function always returns the action actually sent.
 
+        Joints missing from `action` hold their last commanded goal.
+
         Raises:
             RobotDeviceNotConnectedError: if robot is not connected.
 
@@ -206,19 +230,116 @@ class LeLampFollower(Robot):
         if not self.is_connected:
             raise DeviceNotConnectedError(f"{self} is not connected.")
 
-        goal_pos = {key.removesuffix(".pos"): val for key, val in action.items() if key.endswith(".pos")}
+        try:
+            positions = [action[key] for key in self._action_keys]
+        except KeyError:
+            if not self._has_goal:
+                present_pos = self.bus.sync_read("Present_Position")
+                self._goal[:] = [present_pos[motor] for motor in self._motor_names]
+            positions = [action.get(key, goal) for key, goal in zip(self._action_keys, self._goal.tolist())]
+
+        sent = self.send_positions(positions)
+        return dict(zip(self._action_keys, sent.tolist()))
+
+    def send_positions(self, positions, checked: bool = False) -> np.ndarray:
+        """Command all motors from a float array ordered like `self.bus.motors`.
+
+        This is the per-frame fast path: it writes into preallocated buffers and
+        does no key parsing. The returned array is the goal actually sent
+        (possibly clipped by `max_relative_target`) and is reused by the next call.
+        `checked=True` states that the frame continues a trajectory already
+        validated against joint limits. It is still clipped to
+        `max_relative_target`, but against the predicted present position
+        between reads every `checked_read_interval`.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+
+        goal = self._goal
+        goal[:] = positions
 
-        # Cap goal position when too far away from present position.
-        # /!\ Slower fps expected due to reading from the follower.
+        # Interleave a tracking read every `_telemetry_every` writes
+        self._ticks += 1
+        if self.telemetry is not None and self._ticks % self._telemetry_every == 0:
+            present = self.read_present()
+            self.telemetry.record(time.perf_counter(), present)
+
+        # Cap goal position when too far away from present position, read from the follower before
+        # every write, or every `present_read_interval` and predicted from the commanded goals in between.
+        # Checked frames only save the read, never the clamp.
         if self.config.max_relative_target is not None:
-            present_pos = self.bus.sync_read("Present_Position")
-            goal_present_pos = {key: (g_pos, present_pos[key]) for key, g_pos in goal_pos.items()}
-            goal_pos = ensure_safe_goal_position(goal_present_pos, self.config.max_relative_target)
+            now = time.perf_counter()
+            interval = self.config.present_read_interval
+            if checked:
+                interval = max(interval, self.config.checked_read_interval)
+            if self._present.needs_read(now, interval):
+                self.read_present()
+            self._clip_to_present(goal, self._present.estimate(now))
+
+        if self._write_filter.enabled:
+            self._write_changed(goal)
+        else:
+            goal_dict = self._goal_dict
+            for motor, value in zip(self._motor_names, goal.tolist()):
+                goal_dict[motor] = value
+
+            # Send goal position to the arm
+            self.bus.sync_write("Goal_Position", goal_dict)
+        self._has_goal = True
+        now = time.perf_counter()
+        self._present.command(goal, now)
+        if self.telemetry is not None:
+            self.telemetry.command(now, goal)
+        return goal
+
+    def read_present(self) -> np.ndarray:
+        """Read Present_Position of all motors in motor order, correcting the present position estimate"""
+        present_pos = self.bus.sync_read("Present_Position")
+        present = np.array([present_pos[motor] for motor in self._motor_names], dtype=np.float64)
+        self._present.correct(present, time.perf_counter())
+        return present
+
+    def _write_changed(self, goal: np.ndarray):
+        """One sync_write for the motors whose goal moved past the deadband, none if nothing did"""
+        changed = self._write_filter.select(goal)
+        if changed.all():
+            goal_dict = self._goal_dict
+            for motor, value in zip(self._motor_names, goal.tolist()):
+                goal_dict[motor] = value
+        elif changed.any():
+            goal_dict = {self._motor_names[i]: float(goal[i]) for i in np.flatnonzero(changed)}
+        else:
+            return
+        self.bus.sync_write("Goal_Position", goal_dict)
 
+    @property
+    def tracking_stats(self) -> dict[str, dict[str, float]]:
+        """Rolling per-motor tracking error and latency, empty when telemetry is off"""
+        if self.telemetry is None:
+            return {}
+        return self.telemetry.summary()
 
-        # Send goal position to the arm
-        self.bus.sync_write("Goal_Position", goal_pos)
-        return {f"{motor}.pos": val for motor, val in goal_pos.items()}
+    @property
+    def present_estimate_stats(self) -> dict[str, float]:
+        """Present_Position reads, predictions and the prediction error measured at each read"""
+        return self._present.stats
+
+    @property
+    def write_stats(self) -> dict[str, int]:
+        """Goal_Position packets and bytes sent and saved by the write deadband"""
+        return self._write_filter.stats.summary()
+
+    def _clip_to_present(self, goal: np.ndarray, present: np.ndarray):
+        """In-place equivalent of lerobot's ensure_safe_goal_position for arrays"""
+        max_relative = np.asarray(self.config.max_relative_target, dtype=np.float64)
+        safe = np.clip(goal, present - max_relative, present + max_relative)
+        if not np.array_equal(safe, goal):
+            logger.warning(
+                "Relative goal position magnitude had to be clamped to be safe.\n"
+                f"  requested: {dict(zip(self._motor_names, goal.tolist()))}\n"
+                f"  clamped:   {dict(zip(self._motor_names, safe.tolist()))}"
+            )
+            goal[:] = safe
 
     def disconnect(self):
         if not self.is_connected:
@@ -228,4 +349,7 @@ class LeLampFollower(Robot):
         for cam in self.cameras.values():
             cam.disconnect()
 
+        if self.telemetry is not None and self.config.telemetry_path and len(self.telemetry):
+            self.telemetry.dump(self.config.telemetry_path)
+
         logger.info(f"{self} disconnected.")
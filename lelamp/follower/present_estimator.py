@@ -0,0 +1,78 @@
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class PresentPositionEstimator:
+    """Predicts servo positions between reads from the commanded goals.
+
+    Each servo is modeled as a first-order lag toward its last goal with time
+    constant `lag`, the same response the simulated bus uses. A true
+    Present_Position read replaces the estimate, and the difference between
+    prediction and measurement is kept as the estimator's error.
+    """
+
+    def __init__(self, n_motors: int, lag: float = 0.05, read_interval: float = 0.0):
+        self.lag = lag
+        self.read_interval = read_interval
+        self.reads = 0
+        self.predictions = 0
+        self.last_error = 0.0
+        self.max_error = 0.0
+        self._error_total = 0.0
+        self._estimate = np.zeros(n_motors, dtype=np.float64)
+        self._goal = np.zeros(n_motors, dtype=np.float64)
+        self._has_goal = False
+        self._updated_at: Optional[float] = None
+        self._read_at: Optional[float] = None
+
+    def needs_read(self, now: float, interval: Optional[float] = None) -> bool:
+        interval = self.read_interval if interval is None else interval
+        return self._read_at is None or now - self._read_at >= interval
+
+    def correct(self, present: np.ndarray, now: float):
+        """Replace the estimate with a measured position"""
+        if self._updated_at is not None:
+            error = float(np.max(np.abs(self.predict(now) - present), initial=0.0))
+            self.last_error = error
+            self.max_error = max(self.max_error, error)
+            self._error_total += error
+        self._estimate[:] = present
+        self._updated_at = now
+        self._read_at = now
+        self.reads += 1
+        if not self._has_goal:
+            self._goal[:] = present
+
+    def predict(self, now: float) -> np.ndarray:
+        """Estimated position at `now`, advancing the lag model from the last update"""
+        dt = now - self._updated_at
+        if dt > 0 and self._has_goal:
+            alpha = 1.0 if self.lag <= 0 else 1.0 - math.exp(-dt / self.lag)
+            self._estimate += (self._goal - self._estimate) * alpha
+        self._updated_at = now
+        return self._estimate
+
+    def estimate(self, now: float) -> np.ndarray:
+        self.predictions += 1
+        return self.predict(now)
+
+    def command(self, goal: np.ndarray, now: float):
+        """Record a goal written to the servos"""
+        if self._updated_at is not None:
+            self.predict(now)
+        self._goal[:] = goal
+        self._has_goal = True
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        # The first read has nothing to be compared against
+        compared = max(self.reads - 1, 0)
+        return {
+            "reads": self.reads,
+            "predictions": self.predictions,
+            "last_error": self.last_error,
+            "max_error": self.max_error,
+            "mean_error": self._error_total / compared if compared else 0.0,
+        }
@@ -0,0 +1,111 @@
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TrackingTelemetry:
+    """Compares sparse Present_Position reads with the goals commanded before them.
+
+    Every commanded goal is kept in a short ring buffer. When a read arrives,
+    the tracking error is the present position minus the latest goal, and a
+    joint's latency is how long ago the most recent goal it has caught up with
+    was sent; joints whose goal barely moved over the buffer have no
+    meaningful latency and record NaN. Rolling statistics cover the last
+    `window` reads, and up to `history` reads are kept for `dump()`.
+    """
+
+    def __init__(self, motor_names: List[str], window: int = 300, history: int = 20000,
+                 command_buffer: int = 64, min_motion: float = 0.5):
+        self.motor_names = list(motor_names)
+        self.window = window
+        self.min_motion = min_motion
+        n_motors = len(self.motor_names)
+
+        self._cmd_times = np.full(command_buffer, np.nan)
+        self._cmd_goals = np.zeros((command_buffer, n_motors), dtype=np.float64)
+        self._cmd_index = 0
+        self._has_command = False
+
+        self._times = np.zeros(history, dtype=np.float64)
+        self._commanded = np.zeros((history, n_motors), dtype=np.float64)
+        self._present = np.zeros((history, n_motors), dtype=np.float64)
+        self._latency = np.zeros((history, n_motors), dtype=np.float64)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, len(self._times))
+
+    def command(self, now: float, goal: np.ndarray):
+        index = self._cmd_index
+        self._cmd_times[index] = now
+        self._cmd_goals[index] = goal
+        self._cmd_index = (index + 1) % len(self._cmd_times)
+        self._has_command = True
+
+    def record(self, now: float, present: np.ndarray):
+        if not self._has_command:
+            return
+        latest = self._cmd_goals[self._cmd_index - 1]
+
+        # Commands newest first; the first local minimum of the distance to the present position is
+        # the goal the servo has reached, which avoids matching an older pass through the same pose
+        order = np.roll(np.arange(len(self._cmd_times))[::-1], self._cmd_index)
+        order = order[~np.isnan(self._cmd_times[order])]
+        times = self._cmd_times[order]
+        goals = self._cmd_goals[order]
+        distance = np.abs(goals - present)
+        if len(order) > 1:
+            local_min = np.vstack([distance[:-1] <= distance[1:], np.ones((1, distance.shape[1]), dtype=bool)])
+            closest = np.argmax(local_min, axis=0)
+        else:
+            closest = np.zeros(distance.shape[1], dtype=int)
+        latency = now - times[closest]
+        moving = goals.max(axis=0) - goals.min(axis=0) > self.min_motion
+        latency[~moving] = np.nan
+
+        row = self._count % len(self._times)
+        self._times[row] = now
+        self._commanded[row] = latest
+        self._present[row] = present
+        self._latency[row] = latency
+        self._count += 1
+
+    def arrays(self, last: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Recorded reads in chronological order: times, commanded, present, error, latency"""
+        n = len(self)
+        if last is not None:
+            n = min(n, last)
+        rows = (np.arange(self._count - n, self._count)) % len(self._times)
+        commanded = self._commanded[rows]
+        present = self._present[rows]
+        return {
+            "motor_names": np.array(self.motor_names),
+            "times": self._times[rows],
+            "commanded": commanded,
+            "present": present,
+            "error": present - commanded,
+            "latency": self._latency[rows],
+        }
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-motor rolling RMS and max tracking error and mean latency over the last `window` reads"""
+        recent = self.arrays(self.window)
+        error = recent["error"]
+        latency = recent["latency"]
+        result = {}
+        for i, motor in enumerate(self.motor_names):
+            joint_latency = latency[:, i][~np.isnan(latency[:, i])]
+            result[motor] = {
+                "samples": int(error.shape[0]),
+                "rms_error": float(np.sqrt(np.mean(error[:, i] ** 2))) if error.shape[0] else 0.0,
+                "max_error": float(np.max(np.abs(error[:, i]), initial=0.0)),
+                "latency_ms": float(joint_latency.mean() * 1e3) if joint_latency.size else float("nan"),
+            }
+        return result
+
+    def dump(self, path: str):
+        np.savez(path, **self.arrays())
+        logger.info(f"Tracking telemetry with {len(self)} reads written to {path}")
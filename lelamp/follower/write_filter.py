@@ -0,0 +1,93 @@
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+from lelamp.utils.feetech import packet_bytes
+
+Deadband = Union[float, Sequence[float], Dict[str, float]]
+
+
+@dataclass
+class WriteFilterStats:
+    """Goal_Position traffic sent and saved by a DeltaWriteFilter"""
+
+    frames: int = 0
+    full_writes: int = 0
+    packets_sent: int = 0
+    packets_saved: int = 0
+    bytes_sent: int = 0
+    bytes_saved: int = 0
+    motor_writes_saved: int = 0
+
+    def summary(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class DeltaWriteFilter:
+    """Selects which motors need a Goal_Position write this frame.
+
+    A motor is written when its goal moved by more than its deadband since the
+    value last written to it, so slow drifts still go out once they add up.
+    Every `full_write_interval`-th frame writes all motors, which bounds how
+    long a servo can miss a goal (e.g. after a dropped packet).
+    """
+
+    def __init__(self, motor_names: List[str], deadband: Deadband = 0.0, full_write_interval: int = 30):
+        self.motor_names = list(motor_names)
+        self.deadband = self._deadband_array(deadband)
+        self.full_write_interval = full_write_interval
+        self.stats = WriteFilterStats()
+        self._full_packet_bytes = packet_bytes("sync_write", "Goal_Position", len(self.motor_names))
+        self._last_written = np.zeros(len(self.motor_names), dtype=np.float64)
+        self._frames_since_full = 0
+        self._has_written = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(np.any(self.deadband > 0))
+
+    def reset(self):
+        """Forget what was written, so the next frame is a full write"""
+        self._has_written = False
+
+    def select(self, goal: np.ndarray) -> np.ndarray:
+        """Boolean mask of the motors to write for this goal; updates the counters"""
+        self._frames_since_full += 1
+        full = (
+            not self._has_written
+            or (self.full_write_interval > 0 and self._frames_since_full >= self.full_write_interval)
+        )
+        if full:
+            changed = np.ones(len(goal), dtype=bool)
+            self._frames_since_full = 0
+            self._has_written = True
+            self.stats.full_writes += 1
+        else:
+            changed = np.abs(goal - self._last_written) > self.deadband
+
+        self._last_written[changed] = goal[changed]
+        self._count(int(np.count_nonzero(changed)))
+        return changed
+
+    def _count(self, n_changed: int):
+        stats = self.stats
+        stats.frames += 1
+        stats.motor_writes_saved += len(self.motor_names) - n_changed
+        if n_changed == 0:
+            stats.packets_saved += 1
+            stats.bytes_saved += self._full_packet_bytes
+            return
+        sent = packet_bytes("sync_write", "Goal_Position", n_changed)
+        stats.packets_sent += 1
+        stats.bytes_sent += sent
+        stats.bytes_saved += self._full_packet_bytes - sent
+
+    def _deadband_array(self, deadband: Deadband) -> np.ndarray:
+        if isinstance(deadband, dict):
+            unknown = set(deadband) - set(self.motor_names)
+            if unknown:
+                raise KeyError(f"Unknown motors {sorted(unknown)} in deadband, expected some of {self.motor_names}")
+            return np.array([deadband.get(motor, 0.0) for motor in self.motor_names], dtype=np.float64)
+        values = np.broadcast_to(np.asarray(deadband, dtype=np.float64), (len(self.motor_names),))
+        return values.copy()
@@ -22,7 +22,8 @@ from lerobot.teleoperators import TeleoperatorConfig
 @TeleoperatorConfig.register_subclass("lelamp_leader")
 @dataclass
 class LeLampLeaderConfig(TeleoperatorConfig):
-    # Port to connect to the arm
+    # Port to connect to the arm. Use "sim://" (optionally with query options such as
+    # "sim://?latency_ms=2&tau_ms=60") for a simulated bus, see lelamp.sim.SimBusConfig.
     port: str
 
     use_degrees: bool = False
@@ -19,12 +19,10 @@ import time
 
 from lerobot.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
 from lerobot.motors import Motor, MotorCalibration, MotorNormMode
-from lerobot.motors.feetech import (
-    FeetechMotorsBus,
-    OperatingMode,
-)
+from lerobot.motors.feetech import OperatingMode
 
 from lerobot.teleoperators import Teleoperator
+from lelamp.sim import make_motors_bus
 from .config_lelamp_leader import LeLampLeaderConfig
 
 logger = logging.getLogger(__name__)
@@ -42,7 +40,7 @@ class LeLampLeader(Teleoperator):
         super().__init__(config)
         self.config = config
         norm_mode_body = MotorNormMode.DEGREES if config.use_degrees else MotorNormMode.RANGE_M100_100
-        self.bus = FeetechMotorsBus(
+        self.bus = make_motors_bus(
             port=self.config.port,
             motors={
                 "base_yaw": Motor(1, "sts3215", norm_mode_body),
@@ -1,59 +1,47 @@
 import argparse
 import os
-import glob
-import csv
 from datetime import datetime
 
+from .motion import recording_index
 
-def list_recordings(lamp_id):
+
+def list_recordings(lamp_id, recordings_dir=None):
     """List all recordings for a given lamp ID."""
     # Get the recordings directory path
-    recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
-    
+    recordings_dir = recordings_dir or os.path.join(os.path.dirname(__file__), "recordings")
+
     if not os.path.exists(recordings_dir):
         print(f"No recordings directory found at {recordings_dir}")
         return
-    
-    # Pattern to match recordings for the specific lamp ID
-    pattern = os.path.join(recordings_dir, f"*.csv")
-    recording_files = glob.glob(pattern)
-    
-    if not recording_files:
+
+    # Metadata comes from the recording index, which only re-reads files that changed
+    entries = recording_index(recordings_dir).entries()
+
+    if not entries:
         print(f"No recordings found for lamp ID: {lamp_id}")
         return
-    
+
     print(f"Recordings for lamp ID '{lamp_id}':")
     print()
-    
-    for file_path in sorted(recording_files):
-        filename = os.path.basename(file_path)
-        # Extract recording name by removing the lamp_id suffix
-        recording_name = filename.replace(f".csv", "")
-        
-        # Count rows in CSV file
-        try:
-            with open(file_path, 'r') as csvfile:
-                reader = csv.reader(csvfile)
-                row_count = sum(1 for row in reader) - 1  # Subtract header row
-        except Exception as e:
-            row_count = "Error reading file"
-        
-        # Get modified time
-        stat = os.stat(file_path)
-        modified_time = datetime.fromtimestamp(stat.st_mtime)
-        
-        print(f"{recording_name}")
-        print(f"  File: {filename}")
-        print(f"  Rows: {row_count}")
+
+    for entry in entries:
+        modified_time = datetime.fromtimestamp(entry.mtime)
+
+        print(f"{entry.name}")
+        print(f"  File: {entry.filename}")
+        print(f"  Rows: {entry.frames}")
+        print(f"  Duration: {entry.duration:.2f}s")
+        print(f"  Modified: {modified_time:%Y-%m-%d %H:%M:%S}")
         print()
 
 
 def main():
     parser = argparse.ArgumentParser(description="List recordings for a specific lamp ID")
     parser.add_argument('--id', type=str, required=True, help='ID of the lamp to list recordings for')
+    parser.add_argument('--dir', type=str, help='Recordings directory (default: lelamp/recordings)')
     args = parser.parse_args()
-    
-    list_recordings(args.id)
+
+    list_recordings(args.id, args.dir)
 
 
 if __name__ == "__main__":
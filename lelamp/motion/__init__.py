@@ -0,0 +1,56 @@
+from .recording import (
+    Recording,
+    load_recording,
+    read_recording,
+    recording_path,
+    list_recording_names,
+    read_csv,
+    write_csv,
+    read_binary,
+    write_binary,
+)
+from .trajectory import Trajectory
+from .keyframes import KeyframeTrajectory, load_trajectory, read_keyframes, write_keyframes
+from .index import RecordingEntry, RecordingIndex, recording_index
+from .cache import CachedTrajectory, TrajectoryCache, trajectory_cache
+from .recorder import RecordingWriter
+from .layers import BlendMode, LayerStack, joint_mask
+from .procedural import IdleMotion, ProceduralIdle
+from .validation import JointLimits, ValidationReport, check_trajectory, validate_trajectory
+from .transitions import MotionLimits, crossfade, transition_duration
+
+__all__ = [
+    'Recording',
+    'Trajectory',
+    'KeyframeTrajectory',
+    'MotionLimits',
+    'BlendMode',
+    'LayerStack',
+    'joint_mask',
+    'IdleMotion',
+    'ProceduralIdle',
+    'JointLimits',
+    'ValidationReport',
+    'check_trajectory',
+    'validate_trajectory',
+    'crossfade',
+    'transition_duration',
+    'load_recording',
+    'load_trajectory',
+    'read_recording',
+    'recording_path',
+    'list_recording_names',
+    'RecordingEntry',
+    'RecordingIndex',
+    'recording_index',
+    'CachedTrajectory',
+    'TrajectoryCache',
+    'trajectory_cache',
+    'RecordingWriter',
+    'read_csv',
+    'write_csv',
+    'read_binary',
+    'write_binary',
+    'read_keyframes',
+    'write_keyframes',
+]
\ No newline at end of file
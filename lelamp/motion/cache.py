@@ -0,0 +1,216 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .keyframes import keyframe_path, load_trajectory
+from .recording import recording_path
+from .validation import JointLimits, ValidationReport, validate_source
+
+logger = logging.getLogger(__name__)
+
+# Resampled trajectories are small (idle is ~70 kB at 30 fps), so this holds a large library
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+@dataclass
+class CachedTrajectory:
+    """A recording resampled onto a loop's tick grid, plus the file it came from"""
+
+    frames: np.ndarray
+    joint_names: List[str]
+    path: str
+    mtime: float
+    size: int
+    pinned: bool = False
+    # Within the cache's joint limits at the recorded rate (once fixed, if the cache fixes), so players may
+    # clamp against predicted rather than freshly read positions
+    safe: bool = False
+    report: Optional[ValidationReport] = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.frames.nbytes
+
+
+CacheKey = Tuple[str, str, Optional[Tuple[str, ...]], float, str]
+
+
+class TrajectoryCache:
+    """Bounded LRU cache of resampled trajectories shared by the motor services.
+
+    Entries are keyed by recording and by how they were resampled (joint
+    order, rate, interpolation). Every lookup stats the source file and
+    reloads the entry if its mtime or size changed, so re-recorded clips are
+    picked up while the agent runs. Least recently used entries are evicted
+    once the cached frames exceed `max_bytes`; pinned entries never are.
+
+    Each trajectory is validated once as it loads, on its own samples so the
+    result is the same at every playback rate (see validate_source). By
+    default (`validation="report"`) violations are logged and the frames are
+    kept; "clip" or "stretch" fix them before resampling. Entries within the
+    limits are marked safe. `validation=None` skips the check.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, limits: Optional[JointLimits] = None,
+                 validation: Optional[str] = "report"):
+        self.max_bytes = max_bytes
+        self.limits = limits or JointLimits()
+        self.validation = validation
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[CacheKey, CachedTrajectory]" = OrderedDict()
+        self._pinned: set = set()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, recordings_dir: str, name: str, joint_names: Optional[List[str]] = None, fps: float = 30.0,
+            interpolation: str = "linear") -> Optional[CachedTrajectory]:
+        """The recording resampled at `fps`, loading it on a miss or when its file changed"""
+        key = self._key(recordings_dir, name, joint_names, fps, interpolation)
+        path = keyframe_path(recordings_dir, name) or recording_path(recordings_dir, name)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if path is None:
+                if entry is not None:
+                    self._drop(key)
+                return None
+
+            stat = os.stat(path)
+            if entry is not None:
+                if entry.path == path and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                logger.info(f"Recording {name} changed on disk, reloading")
+                self.reloads += 1
+                self._drop(key)
+            self.misses += 1
+
+        # Load outside the lock so a slow read does not block playback lookups
+        trajectory = load_trajectory(recordings_dir, name, joint_names, fps=fps)
+        if trajectory is None:
+            return None
+        report = None
+        if self.validation is not None:
+            trajectory, report = validate_source(trajectory, self.limits, self.validation)
+            if report.violations:
+                action = {"report": "playing it unchanged", "clip": "clipped to fit",
+                          "stretch": "time-stretched to fit"}[self.validation]
+                logger.warning(
+                    f"Recording {name} breaks joint limits ({report.position_violations} position, "
+                    f"{report.velocity_violations} velocity, {report.acceleration_violations} acceleration "
+                    f"samples at {report.fps:.0f} fps), {action}"
+                )
+        frames = trajectory.resample(fps, interpolation)
+        frames.setflags(write=False)
+        entry = CachedTrajectory(frames, list(trajectory.joint_names), path, stat.st_mtime, stat.st_size,
+                                 safe=report is not None and report.safe, report=report)
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            entry.pinned = key in self._pinned
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            self._evict()
+        return entry
+
+    def pin(self, recordings_dir: str, name: str, joint_names: Optional[List[str]] = None, fps: float = 30.0,
+            interpolation: str = "linear") -> Optional[CachedTrajectory]:
+        """Load a recording and keep it cached regardless of the memory budget"""
+        key = self._key(recordings_dir, name, joint_names, fps, interpolation)
+        with self._lock:
+            self._pinned.add(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.pinned = True
+        return self.get(recordings_dir, name, joint_names, fps, interpolation)
+
+    def unpin(self, recordings_dir: str, name: str, joint_names: Optional[List[str]] = None, fps: float = 30.0,
+              interpolation: str = "linear"):
+        key = self._key(recordings_dir, name, joint_names, fps, interpolation)
+        with self._lock:
+            self._pinned.discard(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.pinned = False
+            self._evict()
+
+    def warm(self, recordings_dir: str, names: Iterable[str], joint_names: Optional[List[str]] = None,
+             fps: float = 30.0, interpolation: str = "linear", background: bool = True) -> Optional[threading.Thread]:
+        """Load recordings ahead of their first play, by default from a daemon thread"""
+        names = list(names)
+
+        def load_all():
+            for name in names:
+                try:
+                    if self.get(recordings_dir, name, joint_names, fps, interpolation) is None:
+                        logger.warning(f"Cannot warm missing recording {name}")
+                except Exception as e:
+                    logger.warning(f"Error warming recording {name}: {e}")
+            logger.debug(f"Warmed {len(names)} recordings from {recordings_dir}")
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="trajectory-cache-warm", daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "evictions": self.evictions,
+        }
+
+    def _drop(self, key: CacheKey):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+
+    def _evict(self):
+        if self._bytes <= self.max_bytes:
+            return
+        for key in [key for key, entry in self._entries.items() if not entry.pinned]:
+            if self._bytes <= self.max_bytes:
+                break
+            self._drop(key)
+            self.evictions += 1
+
+    @staticmethod
+    def _key(recordings_dir: str, name: str, joint_names: Optional[List[str]], fps: float,
+             interpolation: str) -> CacheKey:
+        joints = tuple(joint_names) if joint_names is not None else None
+        return os.path.realpath(recordings_dir), name, joints, float(fps), interpolation
+
+
+_shared_cache = TrajectoryCache()
+
+
+def trajectory_cache() -> TrajectoryCache:
+    """The process-wide cache used by the motor services"""
+    return _shared_cache
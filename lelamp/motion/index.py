@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .keyframes import keyframe_path, read_keyframes
+from .recording import BINARY_SUFFIX, CSV_SUFFIX, KEYFRAME_SUFFIX, read_recording, recording_path
+from .trajectory import Trajectory
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = ".index.json"
+INDEX_VERSION = 1
+# How long a directory scan is trusted before stat-ing the files again
+DEFAULT_REFRESH_INTERVAL = 2.0
+
+
+@dataclass
+class RecordingEntry:
+    """Metadata of one recording, taken from the file playback would load"""
+
+    name: str
+    filename: str
+    frames: int
+    duration: float
+    joint_names: List[str] = field(default_factory=list)
+    joint_min: List[float] = field(default_factory=list)
+    joint_max: List[float] = field(default_factory=list)
+    sha256: str = ""
+    mtime: float = 0.0
+    size: int = 0
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def describe_recording(recordings_dir: str, name: str, fps: float = 30.0) -> Optional[RecordingEntry]:
+    """Read a recording and summarize it, or None if it has no file"""
+    path = keyframe_path(recordings_dir, name) or recording_path(recordings_dir, name)
+    if path is None:
+        return None
+
+    if path.endswith(KEYFRAME_SUFFIX):
+        trajectory = read_keyframes(path)
+        frames = trajectory.resample(fps)
+        n_frames = len(frames)
+    else:
+        recording = read_recording(path)
+        trajectory = Trajectory.from_recording(recording, fps=fps)
+        frames = trajectory.frames
+        n_frames = len(recording)
+
+    stat = os.stat(path)
+    return RecordingEntry(
+        name=name,
+        filename=os.path.basename(path),
+        frames=n_frames,
+        duration=trajectory.duration,
+        joint_names=list(trajectory.joint_names),
+        joint_min=np.min(frames, axis=0).tolist() if n_frames else [],
+        joint_max=np.max(frames, axis=0).tolist() if n_frames else [],
+        sha256=file_sha256(path),
+        mtime=stat.st_mtime,
+        size=stat.st_size,
+    )
+
+
+class RecordingIndex:
+    """Persistent metadata for every recording in a directory.
+
+    The index is kept in `.index.json` inside the recordings directory. A
+    refresh stats the recording files and re-reads only those whose mtime or
+    size changed; lookups in between are answered from memory, and the
+    directory is rescanned at most every `refresh_interval` seconds.
+    """
+
+    def __init__(self, recordings_dir: str, refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+                 index_path: Optional[str] = None):
+        self.recordings_dir = recordings_dir
+        self.refresh_interval = refresh_interval
+        self.index_path = index_path or os.path.join(recordings_dir, INDEX_FILENAME)
+        self._entries: Dict[str, RecordingEntry] = {}
+        self._names: List[str] = []
+        self._scanned_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.names())
+
+    def __contains__(self, name: str) -> bool:
+        self._maybe_refresh()
+        return name in self._entries
+
+    def names(self) -> List[str]:
+        self._maybe_refresh()
+        return list(self._names)
+
+    def get(self, name: str) -> Optional[RecordingEntry]:
+        self._maybe_refresh()
+        return self._entries.get(name)
+
+    def entries(self) -> List[RecordingEntry]:
+        self._maybe_refresh()
+        return [self._entries[name] for name in self._names]
+
+    def refresh(self) -> int:
+        """Rescan the directory, re-reading changed recordings. Returns how many entries changed."""
+        with self._lock:
+            changed = self._rescan()
+            self._scanned_at = time.monotonic()
+            if changed:
+                self._save()
+            return changed
+
+    def _maybe_refresh(self):
+        if self._scanned_at is None or time.monotonic() - self._scanned_at >= self.refresh_interval:
+            self.refresh()
+
+    def _rescan(self) -> int:
+        names = set()
+        if os.path.isdir(self.recordings_dir):
+            for entry in os.scandir(self.recordings_dir):
+                for suffix in (CSV_SUFFIX, BINARY_SUFFIX, KEYFRAME_SUFFIX):
+                    if entry.name.endswith(suffix):
+                        names.add(entry.name[:-len(suffix)])
+
+        changed = 0
+        for name in list(self._entries):
+            if name not in names:
+                del self._entries[name]
+                changed += 1
+
+        for name in names:
+            path = keyframe_path(self.recordings_dir, name) or recording_path(self.recordings_dir, name)
+            try:
+                if path is None:
+                    raise FileNotFoundError(name)
+                stat = os.stat(path)
+                entry = self._entries.get(name)
+                if (entry is not None and entry.filename == os.path.basename(path)
+                        and entry.mtime == stat.st_mtime and entry.size == stat.st_size):
+                    continue
+                entry = describe_recording(self.recordings_dir, name)
+            except FileNotFoundError:
+                entry = None
+            except Exception as e:
+                logger.warning(f"Could not index recording {name}: {e}")
+                entry = None
+
+            if entry is None:
+                # Removed or unreadable since the directory was listed
+                if self._entries.pop(name, None) is not None:
+                    changed += 1
+                continue
+            self._entries[name] = entry
+            changed += 1
+
+        self._names = sorted(self._entries)
+        return changed
+
+    def _load(self):
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self._entries = {item["name"]: RecordingEntry(**item) for item in data.get("recordings", [])}
+        self._names = sorted(self._entries)
+
+    def _save(self):
+        data = {"version": INDEX_VERSION, "recordings": [asdict(self._entries[name]) for name in self._names]}
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            # A read-only recordings directory still gets an in-memory index
+            logger.debug(f"Could not write recording index {self.index_path}: {e}")
+
+
+_indexes: Dict[str, RecordingIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def recording_index(recordings_dir: str) -> RecordingIndex:
+    """The shared index of a recordings directory"""
+    key = os.path.realpath(recordings_dir)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = RecordingIndex(recordings_dir)
+        return index
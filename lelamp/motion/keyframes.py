@@ -0,0 +1,182 @@
+import os
+import struct
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from .recording import KEYFRAME_SUFFIX, Recording, load_recording, recording_path
+from .trajectory import Trajectory
+
+# Keyframe file layout (little endian):
+#   fixed header   magic, version, joint count, data offset
+#   joint names    utf-8, newline separated, zero padded up to the data offset
+#   counts         uint32 keyframe count per joint
+#   keyframes      per joint: float32 times, then float32 values
+KEYFRAME_MAGIC = b"LLKEY\x00\x00\x00"
+KEYFRAME_VERSION = 1
+KEYFRAME_HEADER_FORMAT = "<8sHHI"
+KEYFRAME_HEADER_SIZE = struct.calcsize(KEYFRAME_HEADER_FORMAT)
+
+# Default reconstruction tolerance, in the joints' normalized units
+DEFAULT_TOLERANCE = 0.25
+
+
+def simplify(times: np.ndarray, values: np.ndarray, tolerance: float) -> np.ndarray:
+    """Indices of the samples to keep so linear interpolation stays within `tolerance`.
+
+    Ramer-Douglas-Peucker on a time series: the error of a segment is the
+    vertical distance of the dropped samples to the line between its ends,
+    so the bound holds for every original sample.
+    """
+    n = len(times)
+    if n <= 2:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        t = times[first + 1:last]
+        slope = (values[last] - values[first]) / (times[last] - times[first])
+        error = np.abs(values[first + 1:last] - (values[first] + slope * (t - times[first])))
+        worst = int(np.argmax(error))
+        if error[worst] > tolerance:
+            split = first + 1 + worst
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
+
+
+class KeyframeTrajectory:
+    """Per-joint keyframes, sampled like a Trajectory at any time or tick rate.
+
+    Each joint keeps its own keyframe times, so a joint holding still costs two
+    keyframes however long the clip is. Scaling time only rescales the key
+    times.
+    """
+
+    def __init__(self, joint_names: List[str], keys: List[Tuple[np.ndarray, np.ndarray]]):
+        if len(keys) != len(joint_names):
+            raise ValueError(f"Expected keyframes for {len(joint_names)} joints, got {len(keys)}")
+        self.joint_names = list(joint_names)
+        self.keys = [(np.asarray(t, dtype=np.float64), np.asarray(v, dtype=np.float64)) for t, v in keys]
+        self._joints = [Trajectory(t, v[:, None], [name]) for name, (t, v) in zip(self.joint_names, self.keys)]
+
+    @classmethod
+    def from_trajectory(cls, trajectory: Trajectory, tolerance: float = DEFAULT_TOLERANCE) -> "KeyframeTrajectory":
+        keys = []
+        for column in range(trajectory.frames.shape[1]):
+            values = trajectory.frames[:, column]
+            index = simplify(trajectory.times, values, tolerance)
+            keys.append((trajectory.times[index], values[index]))
+        return cls(trajectory.joint_names, keys)
+
+    @classmethod
+    def from_recording(cls, recording: Recording, tolerance: float = DEFAULT_TOLERANCE,
+                       joint_names: Optional[List[str]] = None, fps: float = 30.0) -> "KeyframeTrajectory":
+        return cls.from_trajectory(Trajectory.from_recording(recording, joint_names, fps), tolerance)
+
+    @property
+    def duration(self) -> float:
+        return max(float(times[-1]) for times, _ in self.keys)
+
+    @property
+    def n_keyframes(self) -> int:
+        return sum(len(times) for times, _ in self.keys)
+
+    def select(self, joint_names: List[str]) -> "KeyframeTrajectory":
+        """The same keyframes with joints in another order"""
+        missing = [name for name in joint_names if name not in self.joint_names]
+        if missing:
+            raise KeyError(f"Keyframes have no joints {missing}")
+        return KeyframeTrajectory(joint_names, [self.keys[self.joint_names.index(name)] for name in joint_names])
+
+    def scaled(self, factor: float) -> "KeyframeTrajectory":
+        """Play `factor` times slower (factor > 1) or faster (factor < 1)"""
+        if factor <= 0:
+            raise ValueError(f"Time scale must be positive, got {factor}")
+        return KeyframeTrajectory(self.joint_names, [(times * factor, values) for times, values in self.keys])
+
+    def tick_times(self, rate_hz: float) -> np.ndarray:
+        n_ticks = int(np.floor(self.duration * rate_hz + 1e-9)) + 1
+        return np.arange(n_ticks, dtype=np.float64) / rate_hz
+
+    def resample(self, rate_hz: float, method: str = "linear") -> np.ndarray:
+        return self.sample(self.tick_times(rate_hz), method)
+
+    def sample(self, t: Union[float, np.ndarray], method: str = "linear") -> np.ndarray:
+        """Positions at elapsed time(s) `t`; each joint holds its last keyframe once it runs out"""
+        columns = [joint.sample(t, method) for joint in self._joints]
+        return np.concatenate(columns, axis=-1)
+
+    def to_recording(self, rate_hz: float = 30.0) -> Recording:
+        times = self.tick_times(rate_hz)
+        return Recording(self.joint_names, self.sample(times).astype(np.float32), times)
+
+
+def write_keyframes(keyframes: KeyframeTrajectory, path: str):
+    names = "\n".join(keyframes.joint_names).encode("utf-8")
+    data_offset = KEYFRAME_HEADER_SIZE + len(names)
+    header = struct.pack(KEYFRAME_HEADER_FORMAT, KEYFRAME_MAGIC, KEYFRAME_VERSION, len(keyframes.joint_names),
+                         data_offset)
+    counts = np.array([len(times) for times, _ in keyframes.keys], dtype="<u4")
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(names)
+        f.write(counts.tobytes())
+        for times, values in keyframes.keys:
+            f.write(times.astype("<f4").tobytes())
+            f.write(values.astype("<f4").tobytes())
+
+
+def read_keyframes(path: str) -> KeyframeTrajectory:
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    magic, version, n_joints, data_offset = struct.unpack_from(KEYFRAME_HEADER_FORMAT, data)
+    if magic != KEYFRAME_MAGIC:
+        raise ValueError(f"{path} is not a LeLamp keyframe file")
+    if version != KEYFRAME_VERSION:
+        raise ValueError(f"Unsupported keyframe version {version} in {path}")
+    names = data[KEYFRAME_HEADER_SIZE:data_offset].decode("utf-8").split("\n")
+
+    counts = np.frombuffer(data, dtype="<u4", count=n_joints, offset=data_offset)
+    offset = data_offset + counts.nbytes
+    keys = []
+    for count in counts.tolist():
+        times = np.frombuffer(data, dtype="<f4", count=count, offset=offset)
+        values = np.frombuffer(data, dtype="<f4", count=count, offset=offset + 4 * count)
+        keys.append((times, values))
+        offset += 8 * count
+    return KeyframeTrajectory(names, keys)
+
+
+def keyframe_path(recordings_dir: str, recording_name: str) -> Optional[str]:
+    """Path of an up-to-date keyframe file for a recording, if there is one"""
+    path = os.path.join(recordings_dir, f"{recording_name}{KEYFRAME_SUFFIX}")
+    if not os.path.exists(path):
+        return None
+    # Re-recorded or edited sources make the keyframes stale
+    source = recording_path(recordings_dir, recording_name)
+    if source is not None and os.path.getmtime(source) > os.path.getmtime(path):
+        return None
+    return path
+
+
+def load_trajectory(recordings_dir: str, recording_name: str, joint_names: Optional[List[str]] = None,
+                    fps: float = 30.0) -> Optional[Union[Trajectory, KeyframeTrajectory]]:
+    """Keyframes when an up-to-date keyframe file exists, else the full recording"""
+    path = keyframe_path(recordings_dir, recording_name)
+    if path is not None:
+        keyframes = read_keyframes(path)
+        return keyframes.select(joint_names) if joint_names is not None else keyframes
+
+    recording = load_recording(recordings_dir, recording_name)
+    if recording is None:
+        return None
+    return Trajectory.from_recording(recording, joint_names, fps=fps)
@@ -0,0 +1,174 @@
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .transitions import minimum_jerk
+
+
+class BlendMode(str, Enum):
+    # Replace the layers below on the masked joints
+    OVERRIDE = "override"
+    # Add the layer's motion relative to its first frame on top of the layers below
+    ADDITIVE = "additive"
+
+
+def joint_mask(joint_names: List[str], joints: Optional[Union[Sequence[str], Dict[str, float]]]) -> np.ndarray:
+    """Per-joint weights from a list of joints (weight 1) or a {joint: weight} mapping.
+
+    Joints may be given with or without the `.pos` suffix; None selects every joint.
+    """
+    if joints is None:
+        return np.ones(len(joint_names), dtype=np.float64)
+
+    weights = joints if isinstance(joints, dict) else {joint: 1.0 for joint in joints}
+    mask = np.zeros(len(joint_names), dtype=np.float64)
+    for joint, weight in weights.items():
+        key = joint if joint in joint_names else f"{joint}.pos"
+        if key not in joint_names:
+            raise KeyError(f"Unknown joint {joint!r}, expected one of {joint_names}")
+        mask[joint_names.index(key)] = np.clip(weight, 0.0, 1.0)
+    return mask
+
+
+class Layer:
+    def __init__(self, name: str, frames: np.ndarray, mask: np.ndarray, mode: BlendMode, loop: bool):
+        self.name = name
+        self.frames = frames
+        self.mask = mask
+        self.mode = BlendMode(mode)
+        self.loop = loop
+        self.index = 0
+        self.reference = frames[0]
+        self.weight = 0.0
+        self.removing = False
+        self._fade_from = 0.0
+        self._fade_to = 0.0
+        self._fade_ticks = 0
+        self._fade_elapsed = 0
+
+    def fade_to(self, weight: float, ticks: int):
+        self._fade_from = self.weight
+        self._fade_to = weight
+        self._fade_ticks = max(ticks, 0)
+        self._fade_elapsed = 0
+        if self._fade_ticks == 0:
+            self.weight = weight
+
+    def remove(self, ticks: int):
+        self.removing = True
+        self.fade_to(0.0, ticks)
+
+    @property
+    def finished(self) -> bool:
+        return self.removing and self._fade_elapsed >= self._fade_ticks
+
+    @property
+    def remaining_ticks(self) -> int:
+        if self.loop:
+            return -1
+        return len(self.frames) - self.index
+
+    def advance(self) -> np.ndarray:
+        """Current frame, then step the playhead and fade by one tick"""
+        frame = self.frames[min(self.index, len(self.frames) - 1)]
+        self.index += 1
+        if self.loop and self.index >= len(self.frames):
+            self.index = 0
+
+        if self._fade_elapsed < self._fade_ticks:
+            self._fade_elapsed += 1
+            progress = minimum_jerk(self._fade_elapsed / self._fade_ticks)
+            self.weight = self._fade_from + (self._fade_to - self._fade_from) * float(progress)
+        return frame
+
+
+class LayerStack:
+    """Layers composed on top of a base trajectory, evaluated once per control tick.
+
+    Layers apply in the order they were added. Each tick the base pose and the
+    current frame of every layer are stacked into one (n_layers + 1, n_joints)
+    matrix and reduced with a single weighted sum: a layer's effective weight
+    on a joint is its mask times its fade weight, attenuated by every override
+    layer above it.
+    """
+
+    def __init__(self, joint_names: List[str], rate_hz: float, fade_time: float = 0.3):
+        self.joint_names = list(joint_names)
+        self.rate_hz = rate_hz
+        self.fade_time = fade_time
+        self._layers: List[Layer] = []
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+    @property
+    def names(self) -> List[str]:
+        return [layer.name for layer in self._layers]
+
+    def get(self, name: str) -> Optional[Layer]:
+        for layer in self._layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def set_layer(self, name: str, frames: np.ndarray, joints=None, mode: BlendMode = BlendMode.OVERRIDE,
+                  loop: bool = False, weight: float = 1.0, fade: Optional[float] = None):
+        """Add a layer, or restart the layer with this name in place, fading it in"""
+        layer = Layer(name, frames, joint_mask(self.joint_names, joints), mode, loop)
+        existing = self.get(name)
+        if existing is not None:
+            layer.weight = existing.weight
+            self._layers[self._layers.index(existing)] = layer
+        else:
+            self._layers.append(layer)
+        layer.fade_to(float(np.clip(weight, 0.0, 1.0)), self._fade_ticks(fade))
+
+    def set_weight(self, name: str, weight: float, fade: Optional[float] = None):
+        layer = self.get(name)
+        if layer is None:
+            raise KeyError(f"No layer named {name!r}")
+        layer.fade_to(float(np.clip(weight, 0.0, 1.0)), self._fade_ticks(fade))
+
+    def remove_layer(self, name: str, fade: Optional[float] = None):
+        """Fade a layer out; it is dropped from the stack once its weight reaches zero"""
+        layer = self.get(name)
+        if layer is not None:
+            layer.remove(self._fade_ticks(fade))
+
+    def clear(self):
+        self._layers.clear()
+
+    def evaluate(self, base: np.ndarray) -> np.ndarray:
+        """Compose the layers over `base` and advance every layer by one tick"""
+        if not self._layers:
+            return base
+
+        n_layers = len(self._layers)
+        fade_ticks = self._fade_ticks(None)
+        poses = np.empty((n_layers + 1, len(base)), dtype=np.float64)
+        weights = np.empty_like(poses)
+        additive = np.zeros(n_layers + 1, dtype=bool)
+        poses[0] = base
+        weights[0] = 1.0
+
+        for row, layer in enumerate(self._layers, start=1):
+            # One-shot layers start fading out early enough to be gone by their last frame
+            if not layer.loop and not layer.removing and layer.remaining_ticks <= fade_ticks:
+                layer.remove(layer.remaining_ticks)
+            weights[row] = layer.mask * layer.weight
+            additive[row] = layer.mode == BlendMode.ADDITIVE
+            frame = layer.advance()
+            poses[row] = frame - layer.reference if additive[row] else frame
+
+        # Share of each layer that survives the override layers stacked above it
+        keep = np.where(additive[:, None], 1.0, 1.0 - weights)
+        above = np.ones_like(weights)
+        above[:-1] = np.cumprod(keep[:0:-1], axis=0)[::-1]
+        result = (weights * above * poses).sum(axis=0)
+
+        self._layers = [layer for layer in self._layers if not layer.finished]
+        return result
+
+    def _fade_ticks(self, fade: Optional[float]) -> int:
+        return int(round((self.fade_time if fade is None else fade) * self.rate_hz))
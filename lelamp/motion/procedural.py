@@ -0,0 +1,168 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+# Noise amplitude (about one standard deviation) and tempo (noise knots per second)
+# per joint, in joint units; chosen to resemble the recorded idle clip.
+DEFAULT_AMPLITUDE = {
+    "base_yaw": 12.0,
+    "base_pitch": 3.0,
+    "elbow_pitch": 6.0,
+    "wrist_roll": 10.0,
+    "wrist_pitch": 10.0,
+}
+DEFAULT_TEMPO = {
+    "base_yaw": 0.3,
+    "base_pitch": 0.4,
+    "elbow_pitch": 0.4,
+    "wrist_roll": 0.5,
+    "wrist_pitch": 0.6,
+}
+DEFAULT_BREATHING = {
+    "base_pitch": 1.5,
+    "elbow_pitch": 2.5,
+    "wrist_pitch": 1.5,
+}
+
+JointValues = Union[float, Dict[str, float]]
+
+
+@dataclass
+class IdleMotion:
+    """Parameters of the procedural idle.
+
+    Per-joint values are a scalar for every joint or a {joint: value} mapping,
+    with joints named with or without the `.pos` suffix. `neutral` is the pose
+    the motion is centred on; None leaves it to the caller.
+    """
+
+    amplitude: JointValues = field(default_factory=lambda: dict(DEFAULT_AMPLITUDE))
+    tempo: JointValues = field(default_factory=lambda: dict(DEFAULT_TEMPO))
+    breathing_amplitude: JointValues = field(default_factory=lambda: dict(DEFAULT_BREATHING))
+    breathing_rate: float = 0.25
+    neutral: Optional[Dict[str, float]] = None
+    # Seconds of motion generated at a time; also how soon a gain change starts to show
+    chunk: float = 0.5
+    seed: Optional[int] = None
+
+
+def per_joint(joint_names: List[str], values: JointValues, default: float = 0.0) -> np.ndarray:
+    """One value per joint from a scalar or a {joint: value} mapping"""
+    if not isinstance(values, dict):
+        return np.full(len(joint_names), float(values), dtype=np.float64)
+
+    result = np.full(len(joint_names), default, dtype=np.float64)
+    for joint, value in values.items():
+        key = joint if joint in joint_names else f"{joint}.pos"
+        if key not in joint_names:
+            raise KeyError(f"Unknown joint {joint!r}, expected one of {joint_names}")
+        result[joint_names.index(key)] = value
+    return result
+
+
+def catmull_rom(p0: np.ndarray, p1: np.ndarray, p2: np.ndarray, p3: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Catmull-Rom spline through p1 (t=0) and p2 (t=1)"""
+    return 0.5 * (
+        2.0 * p1
+        + (p2 - p0) * t
+        + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * t * t
+        + (3.0 * (p1 - p2) + p3 - p0) * t * t * t
+    )
+
+
+class ProceduralIdle:
+    """Endless idle motion: smooth noise plus a breathing sinusoid around a neutral pose.
+
+    Each joint follows a Catmull-Rom spline through random knots spaced
+    1/tempo seconds apart, so the motion is band-limited to roughly its tempo
+    and never repeats. A shared sinusoid at `breathing_rate` adds the
+    breathing. `render()` produces the next block of frames; only the few
+    knots around the playhead are kept, so memory stays constant however long
+    it runs. `set_gain()` scales the motion at runtime with a linear fade.
+    """
+
+    def __init__(self, joint_names: List[str], neutral: np.ndarray, motion: Optional[IdleMotion] = None,
+                 fps: float = 30.0):
+        motion = motion or IdleMotion()
+        self.joint_names = list(joint_names)
+        self.fps = fps
+        self.neutral = np.asarray(neutral, dtype=np.float64)
+        self.amplitude = per_joint(self.joint_names, motion.amplitude)
+        self.tempo = per_joint(self.joint_names, motion.tempo, default=0.5)
+        self.breathing_amplitude = per_joint(self.joint_names, motion.breathing_amplitude)
+        self.breathing_rate = motion.breathing_rate
+        self.chunk_frames = max(1, int(round(motion.chunk * fps)))
+        if np.any(self.tempo <= 0):
+            raise ValueError(f"Idle tempo must be positive, got {self.tempo}")
+
+        # One random stream per joint, so the motion does not depend on how it is chunked
+        seeds = np.random.SeedSequence(motion.seed).spawn(len(self.joint_names))
+        self._rngs = [np.random.default_rng(seed) for seed in seeds]
+        # Knots p[-1], p[0], p[1], p[2] of each joint's current spline segment, and the position in it
+        self._knots = [rng.standard_normal(4) for rng in self._rngs]
+        self._phase = np.zeros(len(self.joint_names), dtype=np.float64)
+        self._breathing_phase = 0.0
+        self._gain = 1.0
+        self._gain_target = 1.0
+        self._gain_step = 0.0
+
+    @property
+    def gain(self) -> float:
+        return self._gain
+
+    def set_gain(self, gain: float, fade: float = 1.0):
+        """Scale the motion around the neutral pose, e.g. calmer while speaking, over `fade` seconds"""
+        gain = max(0.0, float(gain))
+        ticks = fade * self.fps
+        self._gain_target = gain
+        if ticks < 1.0:
+            self._gain = gain
+            self._gain_step = 0.0
+        else:
+            self._gain_step = (gain - self._gain) / ticks
+
+    def render(self, n_frames: Optional[int] = None) -> np.ndarray:
+        """The next `n_frames` frames (default one chunk), as an (n_frames, n_joints) array"""
+        n = n_frames or self.chunk_frames
+        ticks = np.arange(n, dtype=np.float64)
+
+        offsets = np.empty((n, len(self.joint_names)), dtype=np.float64)
+        for j in range(len(self.joint_names)):
+            offsets[:, j] = self._noise(j, ticks) * self.amplitude[j]
+
+        breathing = np.sin(2.0 * np.pi * (self._breathing_phase + ticks * self.breathing_rate / self.fps))
+        self._breathing_phase = (self._breathing_phase + n * self.breathing_rate / self.fps) % 1.0
+        offsets += breathing[:, None] * self.breathing_amplitude
+
+        return self.neutral + self._gains(n)[:, None] * offsets
+
+    def _noise(self, j: int, ticks: np.ndarray) -> np.ndarray:
+        position = self._phase[j] + ticks * (self.tempo[j] / self.fps)
+        segment = np.floor(position).astype(np.int64)
+        end = self._phase[j] + len(ticks) * (self.tempo[j] / self.fps)
+        shift = int(np.floor(end))
+
+        knots = self._knots[j]
+        needed = max(int(segment[-1]), shift) + 4
+        if needed > len(knots):
+            knots = np.concatenate([knots, self._rngs[j].standard_normal(needed - len(knots))])
+
+        values = catmull_rom(knots[segment], knots[segment + 1], knots[segment + 2], knots[segment + 3],
+                             position - segment)
+        self._knots[j] = knots[shift:shift + 4]
+        self._phase[j] = end - shift
+        return values
+
+    def _gains(self, n: int) -> np.ndarray:
+        if self._gain_step == 0.0:
+            return np.full(n, self._gain)
+        gains = self._gain + self._gain_step * np.arange(1, n + 1)
+        if self._gain_step > 0:
+            gains = np.minimum(gains, self._gain_target)
+        else:
+            gains = np.maximum(gains, self._gain_target)
+        self._gain = float(gains[-1])
+        if self._gain == self._gain_target:
+            self._gain_step = 0.0
+        return gains
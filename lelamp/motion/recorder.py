@@ -0,0 +1,130 @@
+import csv
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .recording import TIMESTAMP_COLUMN, write_binary_header
+
+logger = logging.getLogger(__name__)
+
+RECORDING_FORMATS = ("csv", "bin")
+
+
+class RecordingWriter:
+    """Writes samples to a recording file from a background thread.
+
+    The capture loop `push()`es each sample into a preallocated ring buffer
+    and never touches the file; a writer thread drains the buffer in batches
+    of up to `batch` rows. When the buffer is full the sample is dropped and
+    counted rather than blocking the capture loop. Timestamps are the
+    sample's own monotonic clock reading.
+    """
+
+    def __init__(self, path: str, joint_names: List[str], fmt: str = "csv", capacity: int = 1024, batch: int = 30):
+        if fmt not in RECORDING_FORMATS:
+            raise ValueError(f"Unknown recording format {fmt!r}, expected one of {RECORDING_FORMATS}")
+        self.path = path
+        self.joint_names = list(joint_names)
+        self.fmt = fmt
+        self.batch = batch
+        self.pushed = 0
+        self.dropped = 0
+        self.written = 0
+
+        self._buffer = np.zeros((capacity, len(self.joint_names) + 1), dtype=np.float64)
+        self._head = 0  # next row to write into
+        self._tail = 0  # next row to drain
+        self._size = 0
+        self._lock = threading.Lock()
+        self._available = threading.Event()
+        self._closing = threading.Event()
+        self._t0: Optional[float] = None
+        self._file = open(path, 'w', newline='') if fmt == "csv" else open(path, 'wb')
+        self._csv = None
+        self._thread = threading.Thread(target=self._loop, name="recording-writer", daemon=True)
+        self._thread.start()
+
+    def push(self, timestamp: float, positions) -> bool:
+        """Queue one sample; returns False (and counts a drop) if the buffer is full"""
+        with self._lock:
+            if self._size == len(self._buffer):
+                self.dropped += 1
+                return False
+            row = self._buffer[self._head]
+            row[0] = timestamp
+            row[1:] = positions
+            self._head = (self._head + 1) % len(self._buffer)
+            self._size += 1
+            self.pushed += 1
+            wake = self._size >= self.batch
+        if wake:
+            self._available.set()
+        return True
+
+    def push_action(self, timestamp: float, action: Dict[str, float]) -> bool:
+        return self.push(timestamp, [action[name] for name in self.joint_names])
+
+    def close(self, timeout: Optional[float] = None):
+        """Write everything still buffered and finish the file"""
+        self._closing.set()
+        self._available.set()
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Recording writer for {self.path} did not finish within timeout")
+            return
+        if self.fmt == "bin":
+            # The frame count is only known now
+            write_binary_header(self._file, [TIMESTAMP_COLUMN] + self.joint_names, self.written, self._t0 or 0.0)
+        self._file.close()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"pushed": self.pushed, "written": self.written, "dropped": self.dropped}
+
+    def _take(self) -> Optional[np.ndarray]:
+        with self._lock:
+            n = min(self._size, self.batch)
+            if n == 0:
+                return None
+            rows = (self._tail + np.arange(n)) % len(self._buffer)
+            chunk = self._buffer[rows]
+            self._tail = (self._tail + n) % len(self._buffer)
+            self._size -= n
+            return chunk
+
+    def _loop(self):
+        while True:
+            # Wake for a full batch, or periodically so slow captures still reach the disk
+            self._available.wait(timeout=0.5)
+            self._available.clear()
+            while True:
+                chunk = self._take()
+                if chunk is None:
+                    break
+                try:
+                    self._write(chunk)
+                except Exception as e:
+                    logger.error(f"Error writing {self.path}: {e}")
+            if self._closing.is_set():
+                break
+
+    def _write(self, chunk: np.ndarray):
+        if self._t0 is None:
+            self._t0 = float(chunk[0, 0])
+            if self.fmt == "csv":
+                self._csv = csv.writer(self._file)
+                self._csv.writerow([TIMESTAMP_COLUMN] + self.joint_names)
+            else:
+                write_binary_header(self._file, [TIMESTAMP_COLUMN] + self.joint_names, 0, self._t0)
+
+        if self.fmt == "csv":
+            self._csv.writerows(chunk.tolist())
+        else:
+            # Timestamps are stored relative to t0, as write_binary does
+            rows = chunk.copy()
+            rows[:, 0] -= self._t0
+            self._file.write(np.ascontiguousarray(rows, dtype="<f4").tobytes())
+        self._file.flush()
+        self.written += len(chunk)
@@ -0,0 +1,184 @@
+import os
+import csv
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Binary recording layout (little endian):
+#   fixed header   magic, version, column count, frame count, data offset, t0
+#   column names   utf-8, newline separated, zero padded up to the data offset
+#   frame matrix   float32, shape (n_frames, n_columns), C order
+# The timestamp column (if any) is stored relative to t0 so float32 keeps
+# sub-millisecond resolution regardless of the monotonic clock's epoch.
+MAGIC = b"LLREC\x00\x00\x00"
+VERSION = 1
+HEADER_FORMAT = "<8sHHIId"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+DATA_ALIGNMENT = 64
+
+CSV_SUFFIX = ".csv"
+BINARY_SUFFIX = ".bin"
+KEYFRAME_SUFFIX = ".key"
+TIMESTAMP_COLUMN = "timestamp"
+
+
+@dataclass
+class Recording:
+    """A recorded motion: one row per frame, one column per joint."""
+
+    joint_names: List[str]
+    frames: np.ndarray
+    timestamps: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.frames.shape[0]
+
+    def action(self, index: int) -> Dict[str, float]:
+        return dict(zip(self.joint_names, self.frames[index].tolist()))
+
+    def actions(self) -> List[Dict[str, float]]:
+        names = self.joint_names
+        return [dict(zip(names, row)) for row in self.frames.tolist()]
+
+    def to_array(self, joint_names: Optional[List[str]] = None, dtype=np.float64) -> np.ndarray:
+        """Copy the frames into an (n_frames, n_joints) array in the given joint order"""
+        if joint_names is None or list(joint_names) == self.joint_names:
+            return np.array(self.frames, dtype=dtype)
+
+        missing = [name for name in joint_names if name not in self.joint_names]
+        if missing:
+            raise KeyError(f"Recording has no columns for {missing}")
+        order = [self.joint_names.index(name) for name in joint_names]
+        return np.array(self.frames[:, order], dtype=dtype)
+
+
+def read_csv(path: str) -> Recording:
+    with open(path, 'r', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader)
+        rows = [row for row in reader if row]
+
+    data = np.array(rows, dtype=np.float64).reshape(len(rows), len(header))
+    return _from_columns(header, data)
+
+
+def write_csv(recording: Recording, path: str):
+    columns = list(recording.joint_names)
+    data = np.asarray(recording.frames, dtype=np.float64)
+    if recording.timestamps is not None:
+        columns.insert(0, TIMESTAMP_COLUMN)
+        data = np.column_stack([recording.timestamps, data])
+
+    with open(path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(columns)
+        writer.writerows(data.tolist())
+
+
+def write_binary(recording: Recording, path: str):
+    columns = list(recording.joint_names)
+    matrix = np.asarray(recording.frames, dtype=np.float32)
+    t0 = 0.0
+    if recording.timestamps is not None:
+        t0 = float(recording.timestamps[0]) if len(recording.timestamps) else 0.0
+        relative = (np.asarray(recording.timestamps, dtype=np.float64) - t0).astype(np.float32)
+        columns.insert(0, TIMESTAMP_COLUMN)
+        matrix = np.column_stack([relative, matrix])
+
+    with open(path, 'wb') as f:
+        write_binary_header(f, columns, matrix.shape[0], t0)
+        f.write(np.ascontiguousarray(matrix, dtype="<f4").tobytes())
+
+
+def write_binary_header(f, columns: List[str], n_frames: int, t0: float) -> int:
+    """Write the header and column names at the start of `f`; returns the data offset"""
+    names = "\n".join(columns).encode("utf-8")
+    data_offset = _align(HEADER_SIZE + len(names))
+    f.seek(0)
+    f.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, len(columns), n_frames, data_offset, t0))
+    f.write(names.ljust(data_offset - HEADER_SIZE, b"\0"))
+    return data_offset
+
+
+def read_binary(path: str, mmap: bool = True) -> Recording:
+    with open(path, 'rb') as f:
+        magic, version, n_columns, n_frames, data_offset, t0 = struct.unpack(HEADER_FORMAT, f.read(HEADER_SIZE))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a LeLamp binary recording")
+        if version != VERSION:
+            raise ValueError(f"Unsupported recording version {version} in {path}")
+        columns = f.read(data_offset - HEADER_SIZE).rstrip(b"\0").decode("utf-8").split("\n")
+
+    if n_frames == 0:
+        matrix = np.empty((0, n_columns), dtype=np.float32)
+    elif mmap:
+        matrix = np.memmap(path, dtype="<f4", mode="r", offset=data_offset, shape=(n_frames, n_columns))
+    else:
+        matrix = np.fromfile(path, dtype="<f4", count=n_frames * n_columns, offset=data_offset)
+        matrix = matrix.reshape(n_frames, n_columns)
+
+    return _from_columns(columns, matrix, t0)
+
+
+def recording_path(recordings_dir: str, recording_name: str) -> Optional[str]:
+    """Path of the file backing a recording, preferring an up-to-date binary file"""
+    csv_path = os.path.join(recordings_dir, f"{recording_name}{CSV_SUFFIX}")
+    bin_path = os.path.join(recordings_dir, f"{recording_name}{BINARY_SUFFIX}")
+
+    if os.path.exists(bin_path):
+        # A CSV edited after conversion wins over the stale binary copy
+        if not os.path.exists(csv_path) or os.path.getmtime(bin_path) >= os.path.getmtime(csv_path):
+            return bin_path
+    if os.path.exists(csv_path):
+        return csv_path
+    return None
+
+
+def load_recording(recordings_dir: str, recording_name: str) -> Optional[Recording]:
+    path = recording_path(recordings_dir, recording_name)
+    if path is None:
+        return None
+    return read_recording(path)
+
+
+def read_recording(path: str) -> Recording:
+    if path.endswith(BINARY_SUFFIX):
+        return read_binary(path)
+    return read_csv(path)
+
+
+def list_recording_names(recordings_dir: str) -> List[str]:
+    if not os.path.exists(recordings_dir):
+        return []
+
+    names = set()
+    for filename in os.listdir(recordings_dir):
+        for suffix in (CSV_SUFFIX, BINARY_SUFFIX, KEYFRAME_SUFFIX):
+            if filename.endswith(suffix):
+                names.add(filename[:-len(suffix)])
+    return sorted(names)
+
+
+def _from_columns(columns: List[str], data: np.ndarray, t0: float = 0.0) -> Recording:
+    if TIMESTAMP_COLUMN not in columns:
+        return Recording(joint_names=list(columns), frames=data.astype(np.float32, copy=False))
+
+    ts_index = columns.index(TIMESTAMP_COLUMN)
+    joint_index = [i for i in range(len(columns)) if i != ts_index]
+    timestamps = np.asarray(data[:, ts_index], dtype=np.float64) + t0
+    if joint_index == list(range(1, len(columns))):
+        frames = data[:, 1:]
+    else:
+        frames = data[:, joint_index]
+
+    return Recording(
+        joint_names=[columns[i] for i in joint_index],
+        frames=frames.astype(np.float32, copy=False),
+        timestamps=timestamps,
+    )
+
+
+def _align(offset: int) -> int:
+    return (offset + DATA_ALIGNMENT - 1) // DATA_ALIGNMENT * DATA_ALIGNMENT
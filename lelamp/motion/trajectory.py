@@ -0,0 +1,113 @@
+from typing import List, Optional, Union
+
+import numpy as np
+
+from .recording import Recording
+
+INTERPOLATION_METHODS = ("linear", "cubic")
+
+
+class Trajectory:
+    """Joint positions as a function of time, sampled at arbitrary instants.
+
+    `times` are seconds from the start of the motion and `frames` holds one
+    row per time stamp with columns in `joint_names` order. Sampling is
+    vectorized: pass an array of times to get one row per time back.
+    """
+
+    def __init__(self, times: np.ndarray, frames: np.ndarray, joint_names: List[str]):
+        times = np.asarray(times, dtype=np.float64)
+        frames = np.asarray(frames, dtype=np.float64)
+        if frames.ndim != 2 or frames.shape[0] != times.shape[0]:
+            raise ValueError(f"Expected {times.shape[0]} frames, got array of shape {frames.shape}")
+        if frames.shape[0] == 0:
+            raise ValueError("Trajectory needs at least one frame")
+
+        # Drop samples whose clock did not advance so every segment has positive length
+        keep = np.concatenate(([True], np.diff(times) > 0))
+        self.times = times[keep] - times[0]
+        self.frames = frames[keep]
+        self.joint_names = list(joint_names)
+        self._tangents: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_recording(cls, recording: Recording, joint_names: Optional[List[str]] = None,
+                       fps: float = 30.0) -> "Trajectory":
+        """Build from a recording, falling back to a 1/fps grid when it has no timestamps"""
+        joint_names = list(joint_names) if joint_names is not None else list(recording.joint_names)
+        frames = recording.to_array(joint_names)
+        if recording.timestamps is not None:
+            times = recording.timestamps
+        else:
+            times = np.arange(len(recording), dtype=np.float64) / fps
+        return cls(times, frames, joint_names)
+
+    def __len__(self) -> int:
+        return self.frames.shape[0]
+
+    @property
+    def duration(self) -> float:
+        return float(self.times[-1])
+
+    def tick_times(self, rate_hz: float) -> np.ndarray:
+        """Tick instants of a loop running at `rate_hz` that fall inside the trajectory"""
+        n_ticks = int(np.floor(self.duration * rate_hz + 1e-9)) + 1
+        return np.arange(n_ticks, dtype=np.float64) / rate_hz
+
+    def resample(self, rate_hz: float, method: str = "linear") -> np.ndarray:
+        """Positions on the tick grid of a loop running at `rate_hz`, shape (n_ticks, n_joints)"""
+        return self.sample(self.tick_times(rate_hz), method)
+
+    def sample(self, t: Union[float, np.ndarray], method: str = "linear") -> np.ndarray:
+        """Positions at elapsed time(s) `t`, clamped to the first and last frame"""
+        if method not in INTERPOLATION_METHODS:
+            raise ValueError(f"Unknown interpolation method {method!r}, expected one of {INTERPOLATION_METHODS}")
+
+        scalar = np.ndim(t) == 0
+        t = np.clip(np.atleast_1d(np.asarray(t, dtype=np.float64)), 0.0, self.duration)
+
+        if len(self.times) == 1:
+            result = np.repeat(self.frames, len(t), axis=0)
+        else:
+            index = np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, len(self.times) - 2)
+            h = (self.times[index + 1] - self.times[index])[:, None]
+            s = (t[:, None] - self.times[index][:, None]) / h
+            y0 = self.frames[index]
+            y1 = self.frames[index + 1]
+
+            if method == "linear":
+                result = y0 + (y1 - y0) * s
+            else:
+                m = self._pchip_tangents()
+                s2 = s * s
+                s3 = s2 * s
+                result = ((2 * s3 - 3 * s2 + 1) * y0
+                          + (s3 - 2 * s2 + s) * h * m[index]
+                          + (-2 * s3 + 3 * s2) * y1
+                          + (s3 - s2) * h * m[index + 1])
+
+        return result[0] if scalar else result
+
+    def _pchip_tangents(self) -> np.ndarray:
+        """Shape-preserving (Fritsch-Carlson) tangents, so cubic sampling never overshoots a hold"""
+        if self._tangents is not None:
+            return self._tangents
+
+        h = np.diff(self.times)[:, None]
+        delta = np.diff(self.frames, axis=0) / h
+        m = np.zeros_like(self.frames)
+        m[0] = delta[0]
+        m[-1] = delta[-1]
+
+        if len(delta) > 1:
+            d0, d1 = delta[:-1], delta[1:]
+            h0, h1 = h[:-1], h[1:]
+            w1 = 2 * h1 + h0
+            w2 = h1 + 2 * h0
+            same_sign = d0 * d1 > 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                harmonic = (w1 + w2) / (w1 / d0 + w2 / d1)
+            m[1:-1] = np.where(same_sign, harmonic, 0.0)
+
+        self._tangents = m
+        return m
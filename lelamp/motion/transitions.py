@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+# Peak velocity and acceleration of a minimum-jerk move of distance D over time T
+# are 1.875 * D / T and (10 / sqrt(3)) * D / T**2 respectively.
+MIN_JERK_PEAK_VELOCITY = 1.875
+MIN_JERK_PEAK_ACCELERATION = 10.0 / np.sqrt(3.0)
+
+# Time constant of the decaying extrapolation used to carry the current
+# velocity into a transition without letting it run away on long blends.
+VELOCITY_DECAY = 0.1
+
+
+@dataclass
+class MotionLimits:
+    """Per-joint limits a transition must respect, in joint units (e.g. RANGE_M100_100) per second.
+
+    Scalars apply to every joint; arrays give one limit per joint.
+    """
+
+    max_velocity: Union[float, np.ndarray] = 90.0
+    max_acceleration: Union[float, np.ndarray] = 400.0
+    min_duration: float = 0.2
+    max_duration: float = 3.0
+
+
+def minimum_jerk(s: np.ndarray) -> np.ndarray:
+    """Minimum-jerk blend weight for normalized time s in [0, 1]"""
+    s = np.clip(s, 0.0, 1.0)
+    return s * s * s * (10.0 + s * (-15.0 + 6.0 * s))
+
+
+def transition_duration(start: np.ndarray, target: np.ndarray, limits: MotionLimits) -> float:
+    """Shortest minimum-jerk duration that moves every joint from start to target within limits"""
+    distance = np.abs(np.asarray(target, dtype=np.float64) - np.asarray(start, dtype=np.float64))
+    by_velocity = MIN_JERK_PEAK_VELOCITY * distance / limits.max_velocity
+    by_acceleration = np.sqrt(MIN_JERK_PEAK_ACCELERATION * distance / limits.max_acceleration)
+    duration = float(np.max(np.maximum(by_velocity, by_acceleration), initial=0.0))
+    return min(max(duration, limits.min_duration), limits.max_duration)
+
+
+def crossfade(start: np.ndarray, clip: np.ndarray, rate_hz: float, limits: MotionLimits,
+              start_velocity: Optional[np.ndarray] = None) -> Tuple[np.ndarray, int]:
+    """Blend from a pose into a clip that is already playing.
+
+    The clip starts advancing immediately and its output weight rises along a
+    minimum-jerk curve, so the lamp never stops on the clip's first frame.
+    The outgoing side continues the current velocity (decaying) to keep the
+    motion C1-continuous at the switch.
+
+    Returns the blended frames and how many clip frames they replace; playback
+    should continue from that clip index.
+    """
+    start = np.asarray(start, dtype=np.float64)
+    duration = transition_duration(start, clip[0], limits)
+    n_frames = max(1, int(round(duration * rate_hz)))
+
+    # Clips shorter than the transition hold their last frame
+    index = np.minimum(np.arange(n_frames), len(clip) - 1)
+    incoming = clip[index]
+
+    t = np.arange(n_frames, dtype=np.float64) / rate_hz
+    outgoing = np.broadcast_to(start, incoming.shape)
+    if start_velocity is not None:
+        drift = VELOCITY_DECAY * (1.0 - np.exp(-t / VELOCITY_DECAY))
+        outgoing = outgoing + drift[:, None] * start_velocity
+
+    # Weight reaches 1 exactly on the frame after the blend, i.e. clip[n_frames]
+    weight = minimum_jerk(np.arange(n_frames, dtype=np.float64) / n_frames)[:, None]
+    frames = outgoing + (incoming - outgoing) * weight
+    return frames, min(n_frames, len(clip))
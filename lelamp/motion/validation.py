@@ -0,0 +1,197 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from .keyframes import KeyframeTrajectory
+from .trajectory import Trajectory
+
+# "report" only counts violations; the others also fix them
+VALIDATION_MODES = ("report", "clip", "stretch")
+# Rate recordings are captured at; keyframe trajectories have no sample grid of their own and are checked at it
+SOURCE_FPS = 30.0
+# Stretch passes before falling back to clipping what is left
+MAX_STRETCH_PASSES = 5
+# Relative slack so frames fixed to exactly a limit are not failed by rounding
+LIMIT_TOLERANCE = 1e-9
+
+
+@dataclass
+class JointLimits:
+    """Range, velocity and acceleration limits of played trajectories, in joint units (e.g. RANGE_M100_100) per second.
+
+    Scalars apply to every joint; arrays give one limit per joint. Velocity and
+    acceleration are finite differences, so they depend on the rate frames are
+    sampled at: check recordings at the rate they were recorded at (see
+    validate_source), not at a playback rate. There the defaults sit above
+    every shipped recording and catch glitches such as a dropped sample
+    jumping the arm across its range.
+    """
+
+    position_min: Union[float, np.ndarray] = -100.0
+    position_max: Union[float, np.ndarray] = 100.0
+    max_velocity: Union[float, np.ndarray] = 250.0
+    max_acceleration: Union[float, np.ndarray] = 2500.0
+
+
+@dataclass
+class ValidationReport:
+    """What a validation pass found. Violation counts are (frame, joint) samples over a limit."""
+
+    frames: int
+    fps: float
+    position_violations: int = 0
+    velocity_violations: int = 0
+    acceleration_violations: int = 0
+    peak_velocity: List[float] = field(default_factory=list)
+    peak_acceleration: List[float] = field(default_factory=list)
+    # Duration of the fixed trajectory relative to the original; 1 unless segments were stretched
+    stretch: float = 1.0
+    fixed: bool = False
+    # The returned frames are within every limit
+    safe: bool = False
+
+    @property
+    def violations(self) -> int:
+        return self.position_violations + self.velocity_violations + self.acceleration_violations
+
+
+def derivatives(frames: np.ndarray, fps: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Finite-difference velocity (n-1 rows) and acceleration (n-2 rows) of a trajectory"""
+    velocity = np.diff(frames, axis=0) * fps
+    acceleration = np.diff(frames, n=2, axis=0) * (fps * fps)
+    return velocity, acceleration
+
+
+def check_trajectory(frames: np.ndarray, fps: float, limits: JointLimits) -> ValidationReport:
+    """Count limit violations of a trajectory sampled at `fps` without changing it"""
+    velocity, acceleration = derivatives(frames, fps)
+    n_joints = frames.shape[1]
+    report = ValidationReport(
+        frames=len(frames),
+        fps=fps,
+        position_violations=int(np.count_nonzero(
+            (frames < limits.position_min) | (frames > limits.position_max)
+        )),
+        velocity_violations=int(np.count_nonzero(
+            np.abs(velocity) > np.asarray(limits.max_velocity) * (1.0 + LIMIT_TOLERANCE)
+        )),
+        acceleration_violations=int(np.count_nonzero(
+            np.abs(acceleration) > np.asarray(limits.max_acceleration) * (1.0 + LIMIT_TOLERANCE)
+        )),
+        peak_velocity=np.max(np.abs(velocity), axis=0, initial=0.0).tolist() if n_joints else [],
+        peak_acceleration=np.max(np.abs(acceleration), axis=0, initial=0.0).tolist() if n_joints else [],
+    )
+    report.safe = report.violations == 0
+    return report
+
+
+def validate_trajectory(frames: np.ndarray, fps: float, limits: Optional[JointLimits] = None,
+                        mode: str = "clip") -> Tuple[np.ndarray, ValidationReport]:
+    """Check a trajectory against joint limits and fix what violates them.
+
+    `mode="report"` leaves the frames as they are. Otherwise positions
+    outside the range are clipped, and velocity and acceleration violations
+    are either clipped (`mode="clip"`: the offending stretch is replaced by
+    the fastest motion the limits allow, so timing is kept) or time-stretched
+    (`mode="stretch"`: offending segments are slowed down until they fit,
+    which lengthens the clip). Returns the frames to play, unchanged if
+    nothing violated, and a report whose counts describe the input.
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Unknown validation mode {mode!r}, expected one of {VALIDATION_MODES}")
+    limits = limits or JointLimits()
+    report = check_trajectory(frames, fps, limits)
+    if mode == "report":
+        return frames, report
+    if report.safe or len(frames) < 2:
+        report.safe = True
+        return frames, report
+
+    fixed = np.clip(frames, limits.position_min, limits.position_max)
+    if mode == "stretch":
+        for _ in range(MAX_STRETCH_PASSES):
+            if check_trajectory(fixed, fps, limits).safe:
+                break
+            fixed = _stretch(fixed, fps, limits)
+        report.stretch = len(fixed) / len(frames)
+    if not check_trajectory(fixed, fps, limits).safe:
+        fixed = _rate_limit(fixed, fps, limits)
+
+    report.fixed = True
+    report.safe = check_trajectory(fixed, fps, limits).safe
+    return fixed, report
+
+
+def source_rate(trajectory: Union[Trajectory, KeyframeTrajectory]) -> float:
+    """Rate a trajectory was sampled at: the median spacing of its samples, or SOURCE_FPS for keyframes"""
+    if isinstance(trajectory, Trajectory) and len(trajectory) > 1:
+        return float(1.0 / np.median(np.diff(trajectory.times)))
+    return SOURCE_FPS
+
+
+def validate_source(trajectory: Union[Trajectory, KeyframeTrajectory], limits: Optional[JointLimits] = None,
+                    mode: str = "report") -> Tuple[Union[Trajectory, KeyframeTrajectory], ValidationReport]:
+    """Validate a trajectory on its own samples, so the result does not depend on the playback rate.
+
+    Resampling to a faster loop turns each change of slope between samples
+    into a one-tick acceleration spike, so checks on played frames fail more
+    the faster the loop runs. Here the trajectory is checked, and fixed as
+    validate_trajectory would, at its source rate. Returns the trajectory,
+    replaced by the fixed one if frames changed, and the report.
+    """
+    fps = source_rate(trajectory)
+    frames = trajectory.resample(fps)
+    fixed, report = validate_trajectory(frames, fps, limits, mode)
+    if fixed is frames:
+        return trajectory, report
+    times = np.arange(len(fixed), dtype=np.float64) / fps
+    return Trajectory(times, fixed, trajectory.joint_names), report
+
+
+def _stretch(frames: np.ndarray, fps: float, limits: JointLimits) -> np.ndarray:
+    """Slow down the intervals that are too fast and resample onto the 1/fps grid"""
+    velocity, acceleration = derivatives(frames, fps)
+    # Factor each interval must be slowed by; velocity scales with 1/s, acceleration with 1/s^2
+    by_velocity = np.max(np.abs(velocity) / limits.max_velocity, axis=1)
+    by_acceleration = np.sqrt(np.max(np.abs(acceleration) / limits.max_acceleration, axis=1))
+    factor = by_velocity
+    factor[:-1] = np.maximum(factor[:-1], by_acceleration)
+    factor[1:] = np.maximum(factor[1:], by_acceleration)
+    # Widen each slowed region by an interval so the tempo change itself stays gentle
+    widened = factor.copy()
+    widened[1:] = np.maximum(widened[1:], factor[:-1])
+    widened[:-1] = np.maximum(widened[:-1], factor[1:])
+    factor = np.maximum(widened, 1.0)
+
+    # The grid ends on or after the last frame, which np.interp holds
+    times = np.concatenate([[0.0], np.cumsum(factor)]) / fps
+    grid = np.arange(int(np.ceil(times[-1] * fps - 1e-9)) + 1) / fps
+    stretched = np.empty((len(grid), frames.shape[1]), dtype=np.float64)
+    for j in range(frames.shape[1]):
+        stretched[:, j] = np.interp(grid, times, frames[:, j])
+    return stretched
+
+
+def _rate_limit(frames: np.ndarray, fps: float, limits: JointLimits) -> np.ndarray:
+    """Follow the trajectory as closely as the velocity and acceleration limits allow.
+
+    Each tick moves toward the target by at most the distance the joint can
+    still brake from, so it settles on holds instead of overshooting. Output
+    positions stay within the range given that the targets do.
+    """
+    n_joints = frames.shape[1]
+    max_step = np.broadcast_to(np.asarray(limits.max_velocity, dtype=np.float64) / fps, (n_joints,))
+    max_change = np.broadcast_to(np.asarray(limits.max_acceleration, dtype=np.float64) / (fps * fps), (n_joints,))
+
+    limited = np.empty_like(frames, dtype=np.float64)
+    limited[0] = frames[0]
+    step = np.clip(frames[1] - frames[0], -max_step, max_step)
+    for i in range(1, len(frames)):
+        error = frames[i] - limited[i - 1]
+        braking = np.sqrt(2.0 * max_change * np.abs(error))
+        desired = np.sign(error) * np.minimum(np.abs(error), braking)
+        step = np.clip(desired, step - max_change, step + max_change)
+        step = np.clip(step, -max_step, max_step)
+        limited[i] = limited[i - 1] + step
+    return np.clip(limited, limits.position_min, limits.position_max)
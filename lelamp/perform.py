@@ -0,0 +1,69 @@
+import argparse
+import os
+
+from .choreography import TimelinePlayer, read_timeline
+from .follower import LeLampFollower, LeLampFollowerConfig
+from .utils.timing import DEFAULT_SPIN_MARGIN
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a timeline of joint, LED and audio cues on one clock")
+    parser.add_argument('--timeline', type=str, required=True, help='Timeline JSON file')
+    parser.add_argument('--port', type=str, help='Serial port for the robot (may be sim://); omit to skip motion')
+    parser.add_argument('--id', type=str, default='lelamp', help='ID of the robot')
+    parser.add_argument('--leds', action='store_true', help='Play LED cues on the RGB strip')
+    parser.add_argument('--mute', action='store_true', help='Skip audio cues')
+    parser.add_argument('--fps', type=int, default=30, help='Joint frame rate (default: 30)')
+    parser.add_argument('--motion-latency-ms', type=float, default=0.0,
+                        help='Command joints this much early to make up for servo lag (default: 0)')
+    parser.add_argument('--led-latency-ms', type=float, default=0.0,
+                        help='Command LEDs this much early (default: 0)')
+    parser.add_argument('--audio-latency-ms', type=float, default=0.0,
+                        help='Start audio this much early to make up for output buffering (default: 0)')
+    parser.add_argument('--spin-margin-ms', type=float, default=DEFAULT_SPIN_MARGIN * 1000,
+                        help='Spin this long before each deadline instead of sleeping (default: %(default)s)')
+    args = parser.parse_args()
+
+    timeline = read_timeline(args.timeline)
+    if args.mute:
+        timeline.audio = []
+
+    robot = None
+    if args.port:
+        robot = LeLampFollower(LeLampFollowerConfig(port=args.port, id=args.id))
+        robot.connect(calibrate=False)
+    leds = None
+    if args.leds:
+        from .service.rgb import RGBService
+        leds = RGBService()
+        leds.start()
+
+    latency = {
+        "joints": args.motion_latency_ms / 1000,
+        "leds": args.led_latency_ms / 1000,
+        "audio": args.audio_latency_ms / 1000,
+    }
+    player = TimelinePlayer(robot, leds, fps=args.fps, latency=latency, spin_margin=args.spin_margin_ms / 1000)
+    try:
+        print(f"Preparing {timeline.name or args.timeline}...")
+        prepared = player.prepare(timeline, base_dir=os.path.dirname(os.path.abspath(args.timeline)))
+        print(f"Playing {prepared.duration:.2f}s: {len(timeline.joints)} joint, {len(timeline.leds)} LED and "
+              f"{len(timeline.audio)} audio cues")
+        player.play(prepared)
+        player.wait()
+    except KeyboardInterrupt:
+        print("Stopping timeline...")
+    finally:
+        player.stop()
+        for track, lateness in player.stats.items():
+            if track != "bus" and lateness["ticks"]:
+                print(f"  {track}: {lateness['ticks']} outputs, late p50 {lateness['p50_ms']:.2f} "
+                      f"p99 {lateness['p99_ms']:.2f} max {lateness['max_ms']:.2f} ms")
+        if leds is not None:
+            leds.stop()
+        if robot is not None:
+            robot.disconnect()
+
+
+if __name__ == "__main__":
+    main()
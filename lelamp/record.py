@@ -1,9 +1,11 @@
 import argparse
 import time
-import csv
 import os
 from .leader import LeLampLeader, LeLampLeaderConfig
-from lerobot.utils.robot_utils import busy_wait
+from .motion.recorder import RecordingWriter
+from .motion.recording import BINARY_SUFFIX, CSV_SUFFIX
+from .utils import FixedRateScheduler
+from .utils.timing import DEFAULT_SPIN_MARGIN
   
 def main():
     parser = argparse.ArgumentParser(description="Check motors status and position")
@@ -11,6 +13,10 @@ def main():
     parser.add_argument('--port', type=str, required=True, help='Serial port for the lamp')
     parser.add_argument('--name', type=str, help='Name of recording')
     parser.add_argument('--fps', type=int, default=30, help='Frames per second for recording (default: 30)')
+    parser.add_argument('--format', type=str, choices=['csv', 'bin'], default='csv',
+                        help='Output format (default: csv)')
+    parser.add_argument('--spin-margin-ms', type=float, default=DEFAULT_SPIN_MARGIN * 1000,
+                        help='Spin this long before each frame deadline instead of sleeping (default: %(default)s)')
     args = parser.parse_args()
 
     leader_config = LeLampLeaderConfig(
@@ -28,38 +34,43 @@ def main():
     recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
     os.makedirs(recordings_dir, exist_ok=True)
 
-    # Set up CSV file for recording
-    csv_filename = os.path.join(recordings_dir, f"{args.name or 'recording'}.csv")
-    with open(csv_filename, 'w', newline='') as csvfile:
-        csv_writer = None
-        
-        while True:
-            try:
-                t0 = time.perf_counter()
-                obs = leader.get_action()
-                
-                # Initialize CSV writer with headers based on first observation
-                if csv_writer is None:
-                    fieldnames = ['timestamp'] + list(obs.keys()) if isinstance(obs, dict) else ['timestamp', 'observation']
-                    csv_writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    csv_writer.writeheader()
-                
-                # Write observation to CSV
-                if isinstance(obs, dict):
-                    row = {'timestamp': t0, **obs}
-                else:
-                    row = {'timestamp': t0, 'observation': obs}
-                csv_writer.writerow(row)
-                csvfile.flush()
-                
-                print(obs)
-                
-                # Enforce FPS with busy wait
-                busy_wait(1.0 / args.fps - (time.perf_counter() - t0))
-                
-            except KeyboardInterrupt:
-                print("Shutting down teleop...")
-                break
+    # Samples go through a ring buffer to a writer thread so disk and terminal stalls
+    # cannot delay the capture loop
+    suffix = BINARY_SUFFIX if args.format == "bin" else CSV_SUFFIX
+    filename = os.path.join(recordings_dir, f"{args.name or 'recording'}{suffix}")
+    writer = None
+    frames = 0
+    # Sleeps until just before each frame deadline rather than spinning a core
+    scheduler = FixedRateScheduler(args.fps, spin_margin=args.spin_margin_ms / 1000)
+
+    print(f"Recording to {filename}, press Ctrl+C to stop")
+    scheduler.start()
+    while True:
+        try:
+            t0 = time.perf_counter()
+            obs = leader.get_action()
+
+            if writer is None:
+                writer = RecordingWriter(filename, list(obs), fmt=args.format)
+            writer.push_action(t0, obs)
+            frames += 1
+
+            # Enforce FPS on absolute deadlines; a capture that overruns its period skips ticks
+            scheduler.wait()
+
+        except KeyboardInterrupt:
+            print("Shutting down teleop...")
+            break
+
+    if writer is not None:
+        writer.close()
+        stats = writer.stats
+        print(f"Recorded {stats['written']} of {frames} frames to {filename}")
+        print(f"  Dropped (writer buffer full): {stats['dropped']}")
+        timing = scheduler.stats.summary()
+        print(f"  Late (capture overran the frame period): {timing['overruns']}, {timing['skipped']} ticks skipped")
+        print(f"  Wake-up error: p50 {timing['p50_ms']:.3f} ms, p99 {timing['p99_ms']:.3f} ms, "
+              f"max {timing['max_ms']:.3f} ms")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
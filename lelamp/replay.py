@@ -1,44 +1,50 @@
 import argparse
-import csv
-import time
 import os
 
 from .follower import LeLampFollowerConfig, LeLampFollower
-from lerobot.utils.robot_utils import busy_wait
+from .motion import load_trajectory
+from .utils import FixedRateScheduler
+from .utils.timing import DEFAULT_SPIN_MARGIN
 
 def main():
-    parser = argparse.ArgumentParser(description="Replay recorded actions from CSV file")
+    parser = argparse.ArgumentParser(description="Replay recorded actions from a recording file")
     parser.add_argument('--name', type=str, required=True, help='Name of the recording to replay')
     parser.add_argument('--port', type=str, required=True, help='Serial port for the robot')
     parser.add_argument('--id', type=str, required=True, help='ID of the robot')
     parser.add_argument('--fps', type=int, default=30, help='Frames per second for replay (default: 30)')
+    parser.add_argument('--interpolation', type=str, choices=['linear', 'cubic'], default='linear',
+                        help='How recorded samples are resampled to the replay rate (default: linear)')
+    parser.add_argument('--spin-margin-ms', type=float, default=DEFAULT_SPIN_MARGIN * 1000,
+                        help='Spin this long before each frame deadline instead of sleeping (default: %(default)s)')
     args = parser.parse_args()
 
     robot_config = LeLampFollowerConfig(port=args.port, id=args.id)
     robot = LeLampFollower(robot_config)
     robot.connect(calibrate=False)
 
-    # Build CSV filename from name and lamp ID
+    # Load keyframes or the recording (preferring the binary copy), resampled by their timestamps
+    # so dropped frames do not warp playback
     recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
-    csv_filename = f"{args.name}.csv"
-    csv_path = os.path.join(recordings_dir, csv_filename)
+    trajectory = load_trajectory(recordings_dir, args.name, list(robot.action_features), fps=args.fps)
+    if trajectory is None:
+        print(f"Recording not found: {args.name}")
+        robot.disconnect()
+        return
 
-    # Read CSV file and replay actions
-    with open(csv_path, 'r') as csvfile:
-        csv_reader = csv.DictReader(csvfile)
-        actions = list(csv_reader)
+    frames = trajectory.resample(args.fps, args.interpolation)
+    print(f"Replaying {len(frames)} frames from {args.name} at {args.fps} fps")
     
-    print(f"Replaying {len(actions)} actions from {csv_path}")
-    
-    for row in actions:
-        t0 = time.perf_counter()
-        
-        # Extract action data (exclude timestamp column)
-        action = {key: float(value) for key, value in row.items() if key != 'timestamp'}
-        robot.send_action(action)
-        
-        busy_wait(1.0 / args.fps - (time.perf_counter() - t0))
+    # Sleep until just before each absolute frame deadline; late frames are skipped to stay on time
+    scheduler = FixedRateScheduler(args.fps, spin_margin=args.spin_margin_ms / 1000)
+    scheduler.start()
+    index = 0
+    while index < len(frames):
+        robot.send_positions(frames[index])
+        index += scheduler.wait()
     
+    timing = scheduler.stats.summary()
+    print(f"Wake-up error: p50 {timing['p50_ms']:.3f} ms, p99 {timing['p99_ms']:.3f} ms, max {timing['max_ms']:.3f} ms, "
+          f"{timing['skipped']} frames skipped")
     robot.disconnect()
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
-from .base import ServiceBase, Priority
+from .base import ServiceBase, ServiceEvent, EventStatus, Priority
+from .async_service import AsyncService, EventHandle
 
-__all__ = ['ServiceBase', 'Priority']
\ No newline at end of file
+__all__ = ['ServiceBase', 'ServiceEvent', 'EventStatus', 'Priority', 'AsyncService', 'EventHandle']
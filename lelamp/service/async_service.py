@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Any, Optional, Set
+
+from .base import EventStatus, Priority, ServiceEvent
+
+logger = logging.getLogger(__name__)
+
+
+class EventHandle:
+    """Futures tracking one dispatched event on an asyncio loop.
+
+    `started` resolves to True when the service begins handling the event, or
+    to False if it finishes without starting (e.g. it was replaced while
+    pending). `done` resolves to the final EventStatus. Awaiting the handle
+    awaits `done`. Neither future raises; a failure is reported as
+    EventStatus.FAILED with the exception in `error`.
+    """
+
+    def __init__(self, event_type: str, payload: Any, loop: asyncio.AbstractEventLoop):
+        self.event_type = event_type
+        self.payload = payload
+        self.started: asyncio.Future = loop.create_future()
+        self.done: asyncio.Future = loop.create_future()
+        self.event: Optional[ServiceEvent] = None
+
+    def __await__(self):
+        return self.done.__await__()
+
+    @property
+    def status(self) -> EventStatus:
+        return self.event.status if self.event is not None else EventStatus.PENDING
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self.event.error if self.event is not None else None
+
+    def _update(self, started: bool, status: Optional[EventStatus]):
+        # Runs on the loop thread
+        if not self.started.done() and (started or status is not None):
+            self.started.set_result(started)
+        if status is not None and not self.done.done():
+            self.done.set_result(status)
+
+
+class AsyncService:
+    """Asyncio facade over a ServiceBase or the AnimationService.
+
+    The wrapped service handles events on its own thread; this facade attaches
+    a listener to each dispatched event and resolves the EventHandle futures
+    on the asyncio loop through `call_soon_threadsafe`, so coroutines can wait
+    for a gesture or light change without polling or blocking the loop.
+    """
+
+    def __init__(self, service, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.service = service
+        self._loop = loop
+        self._outstanding: Set[asyncio.Future] = set()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        # Bound lazily so the facade can be created before the loop runs
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop
+
+    def dispatch(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL) -> EventHandle:
+        """Dispatch without waiting; await the returned handle or its futures as needed"""
+        loop = self.loop
+        handle = EventHandle(event_type, payload, loop)
+        self._outstanding.add(handle.done)
+        handle.done.add_done_callback(self._outstanding.discard)
+
+        def listener(event: ServiceEvent):
+            status = event.status if event.done else None
+            try:
+                loop.call_soon_threadsafe(handle._update, event.started, status)
+            except RuntimeError:
+                # The loop closed while the service was still running
+                logger.debug(f"Event loop closed, not reporting {event.event_type} {event.status.value}")
+
+        # The listener may fire before dispatch returns, so the handle is complete first
+        handle.event = self.service.dispatch(event_type, payload, priority, listener=listener)
+        return handle
+
+    async def run(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL) -> EventStatus:
+        """Dispatch and wait for the event to finish"""
+        return await self.dispatch(event_type, payload, priority)
+
+    async def play(self, recording_name: str, priority: Priority = Priority.NORMAL) -> EventStatus:
+        return await self.run("play", recording_name, priority)
+
+    async def wait_until_idle(self):
+        """Wait until every event dispatched through this facade has finished"""
+        while self._outstanding:
+            await asyncio.wait(list(self._outstanding))
@@ -6,6 +6,7 @@ import random
 from livekit import rtc
 
 from lelamp.service.asr import FasterWhisperASR
+from lelamp.service.async_service import AsyncService
 
 WAKE_PHRASES = {"hey lelamp", "hi lelamp", "okay lelamp", "lelamp"}
 VALID_RECORDINGS = {
@@ -23,6 +24,9 @@ class AudioProcessor:
         self.tts = tts
         self.asr = FasterWhisperASR(model_size="base")
         self._active_streams = {}  # track_sid -> task
+        # dispatch() is synchronous; the facades return handles that resolve on this loop
+        self.motion = AsyncService(agent.motors_service)
+        self.lights = AsyncService(agent.rgb_service) if hasattr(agent, 'rgb_service') else None
 
     async def run(self, room: rtc.Room):
         print("🎙️ AudioProcessor started — listening to any speaker")
@@ -178,9 +182,7 @@ class AudioProcessor:
                 if func_name == "play_recording":
                     rec_name = args[0]
                     if rec_name in VALID_RECORDINGS:
-                        asyncio.create_task(
-                            self.agent.motors_service.dispatch("play", rec_name)
-                        )
+                        self.motion.dispatch("play", rec_name)
                         has_play = True
                         print(f"🎬 Playing recording: {rec_name}")
                     else:
@@ -189,10 +191,8 @@ class AudioProcessor:
                 elif func_name == "set_rgb_solid" and len(args) == 3:
                     r, g, b = args
                     if all(0 <= x <= 255 for x in (r, g, b)):
-                        if hasattr(self.agent, 'rgb_service'):
-                            asyncio.create_task(
-                                self.agent.rgb_service.dispatch("solid", (r, g, b))
-                            )
+                        if self.lights is not None:
+                            self.lights.dispatch("solid", (r, g, b))
                             print(f"💡 Setting RGB: ({r}, {g}, {b})")
                         else:
                             print("💡 Ignoring light command: RGB service not active.")
@@ -204,7 +204,7 @@ class AudioProcessor:
 
         if not has_play:
             motion = random.choice(DEFAULT_MOTIONS)
-            asyncio.create_task(self.agent.motors_service.dispatch("play", motion))
+            self.motion.dispatch("play", motion)
             print(f"🤖 Auto-playing motion: {motion}")
 
         return speech if speech else "..."
\ No newline at end of file
@@ -1,10 +1,12 @@
 import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional
-from enum import IntEnum
+from typing import Any, Callable, Optional
+from enum import Enum, IntEnum
 import logging
 
+logger = logging.getLogger(__name__)
+
 
 class Priority(IntEnum):
     LOW = 3
@@ -13,20 +15,74 @@ class Priority(IntEnum):
     CRITICAL = 0
 
 
+class EventStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    # Interrupted by a newer event, or by the service stopping
+    PREEMPTED = "preempted"
+    # Never started: replaced while pending, outranked at dispatch, or the service was not running
+    DROPPED = "dropped"
+    FAILED = "failed"
+
+
+EventListener = Callable[["ServiceEvent"], None]
+
+
 class ServiceEvent:
-    def __init__(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL):
+    def __init__(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL,
+                 listener: Optional[EventListener] = None):
         self.event_type = event_type
         self.payload = payload
         self.priority = priority
+        self.created = time.perf_counter()
+        self.status = EventStatus.PENDING
+        self.error: Optional[BaseException] = None
+        # Called from the service thread when the event starts and when it finishes
+        self.listener = listener
     
     def __lt__(self, other):
         return self.priority < other.priority
+    
+    @property
+    def started(self) -> bool:
+        return self.status is not EventStatus.PENDING and self.status is not EventStatus.DROPPED
+    
+    @property
+    def done(self) -> bool:
+        return self.status not in (EventStatus.PENDING, EventStatus.RUNNING)
+    
+    def mark_started(self):
+        if self.status is EventStatus.PENDING:
+            self.status = EventStatus.RUNNING
+            self._notify()
+    
+    def mark_finished(self, status: EventStatus, error: Optional[BaseException] = None):
+        if self.done:
+            return
+        self.status = status
+        self.error = error
+        self._notify()
+    
+    def _notify(self):
+        if self.listener is None:
+            return
+        try:
+            self.listener(self)
+        except Exception as e:
+            logger.warning(f"Listener of event {self.event_type} failed: {e}")
 
 
 class ServiceBase(ABC):
+    # Pending events at or above this priority interrupt the event being handled
+    # when the handler polls should_preempt()
+    preempt_priority: Priority = Priority.HIGH
+
     def __init__(self, name: str):
         self.name = name
+        # Event being handled, and the single event waiting to be handled next
         self._current_event: Optional[ServiceEvent] = None
+        self._pending_event: Optional[ServiceEvent] = None
         self._event_lock = threading.Lock()
         self._event_available = threading.Event()
         self._worker_thread: Optional[threading.Thread] = None
@@ -34,19 +90,28 @@ class ServiceBase(ABC):
         self._stop_event = threading.Event()
         self.logger = logging.getLogger(f"service.{name}")
     
-    def dispatch(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL):
+    def dispatch(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL,
+                 listener: Optional[EventListener] = None) -> ServiceEvent:
+        """Queue an event and return it; `listener` is told when it starts and finishes"""
+        event = ServiceEvent(event_type, payload, priority, listener)
         if not self._running.is_set():
             self.logger.warning(f"Service {self.name} is not running, ignoring event {event_type}")
-            return
-        
-        event = ServiceEvent(event_type, payload, priority)
+            event.mark_finished(EventStatus.DROPPED)
+            return event
         
+        dropped = None
         with self._event_lock:
-            if self._current_event is None or event.priority <= self._current_event.priority:
-                self._current_event = event
+            if self._pending_event is None or event.priority <= self._pending_event.priority:
+                dropped = self._pending_event
+                self._pending_event = event
                 self._event_available.set()
+            else:
+                dropped = event
         
+        if dropped is not None:
+            dropped.mark_finished(EventStatus.DROPPED)
         self.logger.debug(f"Dispatched event {event_type} with priority {priority.name}")
+        return event
     
     def start(self):
         if self._running.is_set():
@@ -74,24 +139,34 @@ class ServiceBase(ABC):
                 self.logger.warning(f"Service {self.name} did not stop within timeout")
             else:
                 self.logger.info(f"Service {self.name} stopped")
+        
+        with self._event_lock:
+            pending = self._pending_event
+            self._pending_event = None
+        if pending is not None:
+            pending.mark_finished(EventStatus.DROPPED)
     
     def _event_loop(self):
         while self._running.is_set():
             if self._event_available.wait(timeout=0.1):
                 with self._event_lock:
-                    if self._current_event:
-                        event = self._current_event
-                    else:
+                    event = self._pending_event
+                    self._pending_event = None
+                    self._event_available.clear()
+                    if event is None:
                         continue
+                    self._current_event = event
                 
+                event.mark_started()
                 try:
                     self.handle_event(event.event_type, event.payload)
+                    event.mark_finished(EventStatus.COMPLETED)
                 except Exception as e:
                     self.logger.error(f"Error handling event {event.event_type}: {e}")
+                    event.mark_finished(EventStatus.FAILED, e)
                 finally:
                     with self._event_lock:
                         self._current_event = None
-                        self._event_available.clear()
             
             if self._stop_event.is_set():
                 break
@@ -107,7 +182,37 @@ class ServiceBase(ABC):
     @property
     def has_pending_event(self) -> bool:
         with self._event_lock:
-            return self._current_event is not None
+            return self._current_event is not None or self._pending_event is not None
+    
+    def should_preempt(self) -> bool:
+        """True when a pending event should interrupt the one being handled.
+        
+        Long-running handlers poll this between steps. A pending event preempts
+        when it outranks the current one or is at least `preempt_priority`.
+        Stopping the service also preempts.
+        """
+        if self._stop_event.is_set():
+            return True
+        # Single attribute reads; the lock is not needed for this hint
+        pending = self._pending_event
+        current = self._current_event
+        if pending is None:
+            return False
+        if current is None:
+            return True
+        return pending.priority < current.priority or pending.priority <= self.preempt_priority
+    
+    def mark_preempted(self):
+        """Called by a handler that returns early because should_preempt() was True"""
+        event = self._current_event
+        if event is not None:
+            event.mark_finished(EventStatus.PREEMPTED)
+    
+    def mark_failed(self, error: BaseException):
+        """Called by a handler that reports a failure instead of raising it"""
+        event = self._current_event
+        if event is not None:
+            event.mark_finished(EventStatus.FAILED, error)
     
     def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
         """Wait until no pending events. Returns True if idle, False if timeout."""
@@ -1,42 +1,102 @@
 import os
-import csv
-import time
 import threading
-from typing import Any, List, Dict, Optional, Tuple
-from lelamp.follower import LeLampFollowerConfig, LeLampFollower
+from dataclasses import replace
+from typing import Any, Iterable, List, Dict, Optional, Tuple
+import numpy as np
+from lelamp.follower import BusWorker, LeLampFollowerConfig, LeLampFollower
+from lelamp.motion import (
+    CachedTrajectory, IdleMotion, LayerStack, MotionLimits, ProceduralIdle, crossfade, recording_index,
+    trajectory_cache,
+)
+from lelamp.motion.procedural import per_joint
+from lelamp.service.base import EventListener, EventStatus, Priority, ServiceEvent
+from lelamp.utils import FixedRateScheduler, OverrunPolicy
+from lelamp.utils.timing import DEFAULT_SPIN_MARGIN
 
 
 class AnimationService:
-    def __init__(self, port: str, lamp_id: str, fps: int = 30, duration: float = 5.0, idle_recording: str = "idle"):
+    def __init__(self, port: str, lamp_id: str, fps: int = 30, duration: float = 5.0, idle_recording: str = "idle",
+                 overrun_policy: OverrunPolicy = OverrunPolicy.SKIP, interpolation: str = "linear",
+                 motion_limits: Optional[MotionLimits] = None, io_thread: bool = True,
+                 telemetry_fraction: float = 0.0, telemetry_path: Optional[str] = None,
+                 warm_recordings: Optional[Iterable[str]] = None, spin_margin: float = DEFAULT_SPIN_MARGIN,
+                 idle_motion: Optional[IdleMotion] = None):
         self.port = port
         self.lamp_id = lamp_id
         self.fps = fps
+        self.overrun_policy = overrun_policy
+        # How long before each tick the loop stops sleeping and spins on the clock
+        self.spin_margin = spin_margin
+        self.interpolation = interpolation
+        # Transitions take as long as the distance requires under motion_limits;
+        # `duration` is the longest a transition may take.
         self.duration = duration
+        motion_limits = motion_limits or MotionLimits()
+        self.motion_limits = replace(motion_limits, max_duration=min(motion_limits.max_duration, duration))
         self.idle_recording = idle_recording
-        self.robot_config = LeLampFollowerConfig(port=port, id=lamp_id)
+        # With idle_motion, idle is generated procedurally instead of looping the idle recording
+        self.idle_motion = idle_motion
+        self._idle: Optional[ProceduralIdle] = None
+        # Write frames from a dedicated bus thread so serial timing cannot stall the playback loop
+        self.io_thread = io_thread
+        self._bus_worker: Optional[BusWorker] = None
+        # Interleaved Present_Position reads measuring how closely the servos track playback
+        self.robot_config = LeLampFollowerConfig(
+            port=port, id=lamp_id, telemetry_fraction=telemetry_fraction, telemetry_path=telemetry_path
+        )
         self.robot: LeLampFollower = None
         self.recordings_dir = os.path.join(os.path.dirname(__file__), "..", "..", "recordings")
         
-        # State management
-        self._recording_cache: Dict[str, List[Dict[str, float]]] = {}
-        self._current_state: Optional[Dict[str, float]] = None
+        # State management. Trajectories are (n_frames, n_joints) arrays resampled
+        # from the recording's timestamps onto this loop's 1/fps tick grid, with
+        # columns in self._joint_names order; the order is fixed on first use.
+        self._joint_names: Optional[List[str]] = None
+        # Shared LRU cache; idle is pinned and `warm_recordings` are loaded in the background on start
+        self._cache = trajectory_cache()
+        self.warm_recordings = warm_recordings
+        self._current_state: Optional[np.ndarray] = None
+        self._previous_state: Optional[np.ndarray] = None
         self._current_recording: Optional[str] = None
         self._current_frame_index: int = 0
-        self._current_actions: List[Dict[str, float]] = []
-        self._interpolation_frames: int = 0
-        self._interpolation_target: Optional[Dict[str, float]] = None
+        self._current_actions: Optional[np.ndarray] = None
+        self._blend_frames: Optional[np.ndarray] = None
+        self._blend_index: int = 0
+        # Current playback is a validated clip (see _start_recording), and whether the next frame steps further
+        # than validated, after a switch or skipped frames
+        self._checked = False
+        self._frame_skipped = False
+        # Override/additive layers composed over the base playback each tick
+        self._layers: Optional[LayerStack] = None
         
         # Custom event handling
         self._running = threading.Event()
-        self._event_queue = []
+        self._event_queue: List[ServiceEvent] = []
         self._event_lock = threading.Lock()
+        # Event being handled, and the play event whose clip is on the bus until it ends or is replaced
+        self._current_event: Optional[ServiceEvent] = None
+        self._playing_event: Optional[ServiceEvent] = None
         self._event_thread: Optional[threading.Thread] = None
+        self._scheduler: Optional[FixedRateScheduler] = None
     
     def start(self):
         self.robot = LeLampFollower(self.robot_config)
         self.robot.connect(calibrate=False)
+        self._joint_names = list(self.robot.action_features)
+        # The neutral pose may read the lamp's position, so take it before the worker owns the bus
+        if self.idle_motion is not None:
+            self._idle = ProceduralIdle(self._joint_names, self._neutral_pose(), self.idle_motion, self.fps)
+        else:
+            self._cache.pin(self.recordings_dir, self.idle_recording, self._joint_names, self.fps,
+                            self.interpolation)
+        if self.io_thread:
+            self._bus_worker = BusWorker(self.robot, name="animation-bus-io")
+            self._bus_worker.start()
         print(f"Animation service connected to {self.port}")
         
+        if self.warm_recordings:
+            self._cache.warm(self.recordings_dir, self.warm_recordings, self._joint_names, self.fps,
+                             self.interpolation)
+        
         # Start event processing thread
         self._running.set()
         self._event_thread = threading.Thread(target=self._event_loop, daemon=True)
@@ -51,43 +111,96 @@ class AnimationService:
         if self._event_thread and self._event_thread.is_alive():
             self._event_thread.join(timeout=timeout)
         
+        with self._event_lock:
+            queued, self._event_queue = self._event_queue, []
+        for event in queued:
+            event.mark_finished(EventStatus.DROPPED)
+        self._finish_playing(EventStatus.PREEMPTED)
+        
+        if self._bus_worker:
+            self._bus_worker.stop()
+            self._bus_worker = None
+        
         if self.robot:
             self.robot.disconnect()
             self.robot = None
     
-    def dispatch(self, event_type: str, payload: Any):
-        """Dispatch an event - same interface as ServiceBase"""
+    def dispatch(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL,
+                 listener: Optional[EventListener] = None) -> ServiceEvent:
+        """Dispatch an event - same interface as ServiceBase.
+        
+        Events are handled in dispatch order. A play event finishes when its
+        clip ends or another play replaces it; other events when handled.
+        """
+        event = ServiceEvent(event_type, payload, priority, listener)
         if not self._running.is_set():
             print(f"Animation service is not running, ignoring event {event_type}")
-            return
+            event.mark_finished(EventStatus.DROPPED)
+            return event
         
         with self._event_lock:
-            self._event_queue.append((event_type, payload))
+            self._event_queue.append(event)
+        return event
     
     def _event_loop(self):
         """Custom event loop that supports interruption"""
+        self._scheduler = FixedRateScheduler(self.fps, overrun=self.overrun_policy, spin_margin=self.spin_margin)
+        self._scheduler.start()
+        
         while self._running.is_set():
             # Check for events
             with self._event_lock:
-                if self._event_queue:
-                    event_type, payload = self._event_queue.pop(0)
-                else:
-                    event_type, payload = None, None
+                event = self._event_queue.pop(0) if self._event_queue else None
             
-            if event_type:
+            if event:
+                self._current_event = event
+                event.mark_started()
                 try:
-                    self.handle_event(event_type, payload)
+                    self.handle_event(event.event_type, event.payload)
+                    if event is not self._playing_event:
+                        event.mark_finished(EventStatus.COMPLETED)
                 except Exception as e:
-                    print(f"Error handling event {event_type}: {e}")
+                    print(f"Error handling event {event.event_type}: {e}")
+                    event.mark_finished(EventStatus.FAILED, e)
+                finally:
+                    self._current_event = None
             
             # Continue current playback
             self._continue_playback()
             
-            time.sleep(1.0 / self.fps)  # Frame rate timing
+            # Frame rate timing on absolute deadlines
+            ticks = self._scheduler.wait()
+            if ticks > 1:
+                self._skip_frames(ticks - 1)
+    
+    @property
+    def timing_stats(self) -> Dict[str, float]:
+        """Jitter statistics of the playback loop"""
+        if self._scheduler is None:
+            return {}
+        return self._scheduler.stats.summary()
+    
+    @property
+    def tracking_stats(self) -> Dict[str, Dict[str, float]]:
+        """Rolling per-joint tracking error and latency; empty unless telemetry_fraction > 0"""
+        if not self.robot:
+            return {}
+        return self.robot.tracking_stats
+    
+    @property
+    def bus_stats(self) -> Dict[str, Any]:
+        """Mailbox counters and per-transaction latency histograms of the bus I/O thread"""
+        if self._bus_worker is None:
+            return {}
+        return self._bus_worker.stats
     
     def handle_event(self, event_type: str, payload: Any):
         if event_type == "play":
             self._handle_play(payload)
+        elif event_type == "layer":
+            self._handle_layer(payload)
+        elif event_type == "idle":
+            self._handle_idle(payload)
         else:
             print(f"Unknown event type: {event_type}")
     
@@ -98,123 +211,223 @@ class AnimationService:
             return
         
         # Load the recording
-        actions = self._load_recording(recording_name)
-        if actions is None:
+        safe = False
+        if recording_name == self.idle_recording:
+            actions = self._idle_actions(transition=True)
+        else:
+            entry = self._load_entry(recording_name)
+            actions = entry.frames if entry is not None else None
+            safe = entry is not None and entry.safe
+        if actions is None or len(actions) == 0:
+            if self._current_event is not None:
+                self._current_event.mark_finished(EventStatus.FAILED, LookupError(f"Cannot play {recording_name}"))
             return
         
         print(f"Starting {recording_name} with interpolation")
+        self._start_recording(recording_name, actions, safe)
+        self._finish_playing(EventStatus.PREEMPTED)
+        self._playing_event = self._current_event
+    
+    def _handle_idle(self, payload: Any):
+        """Scale the procedural idle, e.g. {"gain": 0.3, "fade": 0.5} while speaking.
+        
+        Payload is a gain or a dict with keys: gain and fade (seconds, default 1).
+        """
+        if self._idle is None:
+            print("Idle event ignored: procedural idle is not enabled")
+            return
+        if not isinstance(payload, dict):
+            payload = {"gain": payload}
+        self._idle.set_gain(payload.get("gain", 1.0), payload.get("fade", 1.0))
+    
+    def _handle_layer(self, payload: Any):
+        """Add, reweight or remove a motion layer on top of the base playback.
+        
+        Payload is a recording name or a dict with keys: name, recording (defaults
+        to name), joints (list or {joint: weight}, default all), mode ("override"
+        or "additive"), weight, loop, fade (seconds) and remove.
+        """
+        if isinstance(payload, str):
+            payload = {"name": payload}
+        name = payload.get("name") or payload.get("recording")
+        if not name:
+            print(f"Layer event needs a name: {payload}")
+            return
+        
+        if payload.get("remove"):
+            if self._layers is not None:
+                self._layers.remove_layer(name, payload.get("fade"))
+            return
+        
+        # Reweight an existing layer without restarting it
+        if "recording" not in payload and self._layers is not None and self._layers.get(name) is not None:
+            self._layers.set_weight(name, payload.get("weight", 1.0), payload.get("fade"))
+            return
         
-        # Set up new playback
+        frames = self._load_recording(payload.get("recording", name))
+        if frames is None or len(frames) == 0:
+            return
+        
+        if self._layers is None:
+            self._layers = LayerStack(self._joint_names, self.fps)
+        self._layers.set_layer(
+            name,
+            frames,
+            joints=payload.get("joints"),
+            mode=payload.get("mode", "override"),
+            loop=payload.get("loop", False),
+            weight=payload.get("weight", 1.0),
+            fade=payload.get("fade"),
+        )
+        print(f"Layer {name} active on {payload.get('joints') or 'all joints'}")
+    
+    def _start_recording(self, recording_name: str, actions: np.ndarray, safe: bool = False):
+        """Switch playback to a trajectory, precomputing the crossfade from the current state.
+        
+        `safe` marks a clip validated against joint limits; its frames are sent
+        checked, i.e. clamped against a predicted rather than a freshly read
+        present position. The first frame after the switch is not.
+        """
+        self._checked = safe
+        self._frame_skipped = True
         self._current_recording = recording_name
         self._current_actions = actions
         self._current_frame_index = 0
+        self._blend_frames = None
+        self._blend_index = 0
         
-        # If we have a current state, set up interpolation to the first frame
+        # Crossfade into the moving clip; playback resumes after the frames it replaces
         if self._current_state is not None:
-            self._interpolation_frames = int(self.duration * self.fps)
-            self._interpolation_target = actions[0]
+            velocity = None
+            if self._previous_state is not None:
+                velocity = (self._current_state - self._previous_state) * self.fps
+            self._blend_frames, self._current_frame_index = crossfade(
+                self._current_state, actions, self.fps, self.motion_limits, velocity
+            )
+    
+    def _send_frame(self, frame: np.ndarray):
+        # Transitions track the base trajectory; layers only shape what is sent
+        self._previous_state = self._current_state
+        self._current_state = frame
+        # Layers and skipped frames take the output off the validated trajectory
+        checked = self._checked and not self._frame_skipped and not self._layers
+        self._frame_skipped = False
+        if self._layers:
+            frame = self._layers.evaluate(frame)
+        if self._bus_worker is not None:
+            self._bus_worker.post(frame, checked)
         else:
-            self._interpolation_frames = 0
-            self._interpolation_target = None
+            self.robot.send_positions(frame, checked=checked)
     
     def _continue_playback(self):
         """Continue current playback - called every frame"""
-        if not self._current_recording or not self._current_actions:
+        if not self._current_recording or self._current_actions is None:
             return
         
         try:
             # Handle interpolation to first frame
-            if self._interpolation_frames > 0 and self._interpolation_target is not None:
-                # Calculate interpolation progress
-                progress = 1.0 - (self._interpolation_frames / (self.duration * self.fps))
-                progress = max(0.0, min(1.0, progress))
-                
-                # Interpolate between current state and target
-                interpolated_action = {}
-                for joint in self._interpolation_target.keys():
-                    current_val = self._current_state.get(joint, 0)
-                    target_val = self._interpolation_target[joint]
-                    interpolated_action[joint] = current_val + (target_val - current_val) * progress
-                
-                self.robot.send_action(interpolated_action)
-                self._current_state = interpolated_action.copy()
-                self._interpolation_frames -= 1
+            if self._blend_frames is not None and self._blend_index < len(self._blend_frames):
+                self._send_frame(self._blend_frames[self._blend_index])
+                self._blend_index += 1
                 return
             
+            # Idle is the resting state, so playing it is done once the lamp has blended into it
+            if self._playing_event is not None and self._current_recording == self.idle_recording:
+                self._finish_playing(EventStatus.COMPLETED)
+            
+            # The procedural idle continues with its next chunk, without holding a frame in between
+            if (self._idle is not None and self._current_recording == self.idle_recording
+                    and self._current_frame_index >= len(self._current_actions)):
+                self._current_actions = self._idle.render()
+                self._current_frame_index = 0
+            
             # Play current frame
             if self._current_frame_index < len(self._current_actions):
-                action = self._current_actions[self._current_frame_index]
-                self.robot.send_action(action)
-                self._current_state = action.copy()
+                self._send_frame(self._current_actions[self._current_frame_index])
                 self._current_frame_index += 1
             else:
                 # Recording finished
                 if self._current_recording != self.idle_recording:
+                    self._finish_playing(EventStatus.COMPLETED)
                     # Interpolate back to idle
-                    idle_actions = self._load_recording(self.idle_recording)
+                    idle_actions = self._idle_actions(transition=True)
                     if idle_actions is not None and len(idle_actions) > 0:
-                        self._current_recording = self.idle_recording
-                        self._current_actions = idle_actions
-                        self._current_frame_index = 0
-                        # Set up interpolation back to idle
-                        if self._current_state is not None:
-                            self._interpolation_frames = int(self.duration * self.fps)
-                            self._interpolation_target = idle_actions[0]
+                        self._start_recording(self.idle_recording, idle_actions)
                 else:
-                    # Loop idle recording
+                    # Loop idle recording, picking up the file if it was re-recorded
+                    idle_actions = self._idle_actions()
+                    if idle_actions is not None and len(idle_actions) > 0:
+                        self._current_actions = idle_actions
                     self._current_frame_index = 0
                     
         except Exception as e:
             print(f"Error in playback: {e}")
+            self._finish_playing(EventStatus.FAILED, e)
             # Reset to safe state
             self._current_recording = None
-            self._current_actions = []
+            self._current_actions = None
             self._current_frame_index = 0
+            self._blend_frames = None
+    
+    def _finish_playing(self, status: EventStatus, error: Optional[Exception] = None):
+        event, self._playing_event = self._playing_event, None
+        if event is not None:
+            event.mark_finished(status, error)
+    
+    def _skip_frames(self, count: int):
+        """Drop frames missed by an overrun so playback stays on schedule"""
+        self._frame_skipped = True
+        if self._blend_frames is not None and self._blend_index < len(self._blend_frames):
+            step = min(count, len(self._blend_frames) - self._blend_index)
+            self._blend_index += step
+            count -= step
+        if self._current_actions is not None:
+            self._current_frame_index = min(self._current_frame_index + count, len(self._current_actions))
     
     def get_available_recordings(self) -> List[str]:
         """Get list of recording names available for this lamp ID"""
-        if not os.path.exists(self.recordings_dir):
-            return []
-        
-        recordings = []
-        suffix = f".csv"
-        
-        for filename in os.listdir(self.recordings_dir):
-            if filename.endswith(suffix):
-                # Remove the lamp_id suffix to get the recording name
-                recording_name = filename[:-len(suffix)]
-                recordings.append(recording_name)
-        
-        return sorted(recordings)
+        return list(recording_index(self.recordings_dir).names())
     
-    def _load_recording(self, recording_name: str) -> Optional[List[Dict[str, float]]]:
-        """Load a recording from cache or file"""
-        # Check cache first
-        if recording_name in self._recording_cache:
-            return self._recording_cache[recording_name]
-        
-        csv_filename = f"{recording_name}.csv"
-        csv_path = os.path.join(self.recordings_dir, csv_filename)
-        
-        if not os.path.exists(csv_path):
-            print(f"Recording not found: {csv_path}")
-            return None
+    def _idle_actions(self, transition: bool = False) -> Optional[np.ndarray]:
+        """Frames to continue idling with; a transition needs enough to blend into"""
+        if self._idle is None:
+            return self._load_recording(self.idle_recording)
+        n_frames = self._idle.chunk_frames
+        if transition:
+            n_frames += int(np.ceil(self.motion_limits.max_duration * self.fps))
+        return self._idle.render(n_frames)
+    
+    def _neutral_pose(self) -> np.ndarray:
+        """Pose the procedural idle is centred on: the idle recording's median, else where the lamp is now"""
+        idle_actions = self._load_recording(self.idle_recording)
+        if idle_actions is not None and len(idle_actions) > 0:
+            neutral = np.median(idle_actions, axis=0)
+        else:
+            observation = self.robot.get_observation()
+            neutral = np.array([observation[name] for name in self._joint_names], dtype=np.float64)
         
+        if self.idle_motion.neutral:
+            overrides = per_joint(self._joint_names, self.idle_motion.neutral, default=np.nan)
+            neutral = np.where(np.isnan(overrides), neutral, overrides)
+        return neutral
+    
+    def _load_recording(self, recording_name: str) -> Optional[np.ndarray]:
+        """Load a recording from cache or file, resampled to one row per control tick"""
+        entry = self._load_entry(recording_name)
+        return entry.frames if entry is not None else None
+    
+    def _load_entry(self, recording_name: str) -> Optional[CachedTrajectory]:
         try:
-            with open(csv_path, 'r') as csvfile:
-                csv_reader = csv.DictReader(csvfile)
-                actions = []
-                for row in csv_reader:
-                    # Extract action data (exclude timestamp column)
-                    action = {key: float(value) for key, value in row.items() if key != 'timestamp'}
-                    actions.append(action)
+            entry = self._cache.get(self.recordings_dir, recording_name, self._joint_names, self.fps,
+                                    self.interpolation)
+            if entry is None:
+                print(f"Recording not found: {recording_name}")
+                return None
             
-            # Cache the recording
-            self._recording_cache[recording_name] = actions
-            return actions
+            if self._joint_names is None:
+                self._joint_names = list(entry.joint_names)
+            return entry
             
         except Exception as e:
             print(f"Error loading recording {recording_name}: {e}")
             return None
-    
-    
\ No newline at end of file
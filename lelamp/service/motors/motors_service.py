@@ -1,18 +1,42 @@
 import os
-import csv
 import time
-from typing import Any, List
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
 from ..base import ServiceBase
 from lelamp.follower import LeLampFollowerConfig, LeLampFollower
+from lelamp.motion import MotionLimits, crossfade, recording_index, trajectory_cache
+from lelamp.utils import FixedRateScheduler, OverrunPolicy
+from lelamp.utils.timing import DEFAULT_SPIN_MARGIN
 
 
 class MotorsService(ServiceBase):
-    def __init__(self, port: str, lamp_id: str, fps: int = 30):
+    def __init__(self, port: str, lamp_id: str, fps: int = 30, overrun_policy: OverrunPolicy = OverrunPolicy.SKIP,
+                 interpolation: str = "linear", motion_limits: Optional[MotionLimits] = None,
+                 telemetry_fraction: float = 0.0, telemetry_path: Optional[str] = None,
+                 warm_recordings: Optional[Iterable[str]] = None, spin_margin: float = DEFAULT_SPIN_MARGIN):
         super().__init__("motors")
         self.port = port
         self.lamp_id = lamp_id
         self.fps = fps
-        self.robot_config = LeLampFollowerConfig(port=port, id=lamp_id)
+        self.overrun_policy = overrun_policy
+        # How long before each tick the loop stops sleeping and spins on the clock
+        self.spin_margin = spin_margin
+        self.interpolation = interpolation
+        self.motion_limits = motion_limits or MotionLimits()
+        self.last_timing_stats: Dict[str, float] = {}
+        # Seconds from dispatching the preempting event to its first frame on the bus
+        self.last_preemption_latency: Optional[float] = None
+        # Last two commanded frames, to blend from the current pose and velocity
+        self._current_state: Optional[np.ndarray] = None
+        self._previous_state: Optional[np.ndarray] = None
+        self._preempted = False
+        # Shared LRU cache of resampled recordings; `warm_recordings` are loaded in the background on start
+        self._cache = trajectory_cache()
+        self.warm_recordings = warm_recordings
+        # Interleaved Present_Position reads measuring how closely the servos track playback
+        self.robot_config = LeLampFollowerConfig(
+            port=port, id=lamp_id, telemetry_fraction=telemetry_fraction, telemetry_path=telemetry_path
+        )
         self.robot: LeLampFollower = None
         self.recordings_dir = os.path.join(os.path.dirname(__file__), "..", "..", "recordings")
     
@@ -21,12 +45,18 @@ class MotorsService(ServiceBase):
         self.robot = LeLampFollower(self.robot_config)
         self.robot.connect(calibrate=False)
         self.logger.info(f"Motors service connected to {self.port}")
+        if self.warm_recordings:
+            self._cache.warm(self.recordings_dir, self.warm_recordings, list(self.robot.action_features),
+                             self.fps, self.interpolation)
 
     def stop(self, timeout: float = 5.0):
+        # Stop the worker first so a clip playing now sees should_preempt() before the bus closes
+        super().stop(timeout)
         if self.robot:
             self.robot.disconnect()
             self.robot = None
-        super().stop(timeout)
+        self._current_state = None
+        self._previous_state = None
     
     def handle_event(self, event_type: str, payload: Any):
         if event_type == "play":
@@ -40,49 +70,75 @@ class MotorsService(ServiceBase):
             self.logger.error("Robot not connected")
             return
         
-        csv_filename = f"{recording_name}.csv"
-        csv_path = os.path.join(self.recordings_dir, csv_filename)
-        
-        if not os.path.exists(csv_path):
-            self.logger.error(f"Recording not found: {csv_path}")
-            return
-        
         try:
-            with open(csv_path, 'r') as csvfile:
-                csv_reader = csv.DictReader(csvfile)
-                actions = list(csv_reader)
+            # Keyframes or the recording's own timestamps, sampled on this loop's tick grid
+            entry = self._cache.get(self.recordings_dir, recording_name, list(self.robot.action_features),
+                                    self.fps, self.interpolation)
+            if entry is None:
+                self.logger.error(f"Recording not found: {recording_name}")
+                self.mark_failed(LookupError(f"Recording not found: {recording_name}"))
+                return
             
-            self.logger.info(f"Playing {len(actions)} actions from {recording_name}")
+            frames = entry.frames
+            # Frames of validated clips only need a predicted present position for their clamp, but
+            # the first frame after a switch and a frame after skipped ones step further than validated.
+            checked = False
+            self.logger.info(f"Playing {len(frames)} frames from {recording_name} at {self.fps} fps")
             
-            for row in actions:
-                t0 = time.perf_counter()
-                
-                # Extract action data (exclude timestamp column)
-                action = {key: float(value) for key, value in row.items() if key != 'timestamp'}
-                self.robot.send_action(action)
+            # Blend from wherever the last playback left the lamp, e.g. mid-gesture after a preemption
+            if self._current_state is not None:
+                velocity = None
+                if self._previous_state is not None:
+                    velocity = (self._current_state - self._previous_state) * self.fps
+                blend, consumed = crossfade(self._current_state, frames, self.fps, self.motion_limits, velocity)
+                frames = np.concatenate([blend, frames[consumed:]])
+            
+            preempting = self._preempted
+            self._preempted = False
+            event = self._current_event
+            
+            scheduler = FixedRateScheduler(self.fps, overrun=self.overrun_policy, spin_margin=self.spin_margin)
+            scheduler.start()
+            
+            index = 0
+            while index < len(frames):
+                if self.should_preempt():
+                    self._preempted = True
+                    self.mark_preempted()
+                    self.logger.info(f"Preempted {recording_name} at frame {index}/{len(frames)}")
+                    break
                 
-                # Use time.sleep instead of busy_wait to avoid blocking other threads
-                sleep_time = 1.0 / self.fps - (time.perf_counter() - t0)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+                self._send_frame(frames[index], checked)
+                if preempting and index == 0 and event is not None:
+                    self.last_preemption_latency = time.perf_counter() - event.created
+                    self.logger.info(
+                        f"Preemption by {recording_name} took {self.last_preemption_latency * 1000:.1f} ms"
+                    )
+                ticks = scheduler.wait()
+                checked = entry.safe and ticks == 1
+                index += ticks
             
-            self.logger.info(f"Finished playing recording: {recording_name}")
+            self.last_timing_stats = scheduler.stats.summary()
+            self.logger.debug(f"Playback timing for {recording_name}: {self.last_timing_stats}")
+            if not self._preempted:
+                self.logger.info(f"Finished playing recording: {recording_name}")
             
         except Exception as e:
             self.logger.error(f"Error playing recording {recording_name}: {e}")
+            self.mark_failed(e)
+    
+    @property
+    def tracking_stats(self) -> Dict[str, Dict[str, float]]:
+        """Rolling per-joint tracking error and latency; empty unless telemetry_fraction > 0"""
+        if not self.robot:
+            return {}
+        return self.robot.tracking_stats
+    
+    def _send_frame(self, frame: np.ndarray, checked: bool = False):
+        self.robot.send_positions(frame, checked=checked)
+        self._previous_state = self._current_state
+        self._current_state = frame
     
     def get_available_recordings(self) -> List[str]:
         """Get list of recording names available for this lamp ID"""
-        if not os.path.exists(self.recordings_dir):
-            return []
-        
-        recordings = []
-        suffix = f".csv"
-        
-        for filename in os.listdir(self.recordings_dir):
-            if filename.endswith(suffix):
-                # Remove the lamp_id suffix to get the recording name
-                recording_name = filename[:-len(suffix)]
-                recordings.append(recording_name)
-        
-        return sorted(recordings)
\ No newline at end of file
+        return list(recording_index(self.recordings_dir).names())
\ No newline at end of file
@@ -9,10 +9,8 @@ class EdgeTTS:
     def __init__(self, voice: str = "en-US-AvaNeural"):  # 支持 en/zh
         self.voice = voice
 
-    async def synthesize_and_play(self, text: str):
-        if not text.strip():
-            return
-
+    async def synthesize(self, text: str, path: str):
+        """Write `text` to `path` as 16 kHz mono WAV, without playing it"""
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
             tmp_path = f.name
 
@@ -22,16 +20,28 @@ class EdgeTTS:
             await communicate.save(tmp_path)
 
             # 转为 16kHz 单声道（确保兼容 aplay）
-            converted = tmp_path.replace(".wav", "_16k.wav")
             subprocess.run([
                 "ffmpeg", "-y", "-i", tmp_path,
-                "-ar", "16000", "-ac", "1", "-f", "wav", converted
+                "-ar", "16000", "-ac", "1", "-f", "wav", path
             ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    async def synthesize_and_play(self, text: str):
+        if not text.strip():
+            return
+
+        with tempfile.NamedTemporaryFile(suffix="_16k.wav", delete=False) as f:
+            converted = f.name
+
+        try:
+            await self.synthesize(text, converted)
+
             # 播放（阻塞直到结束）
             subprocess.run(["aplay", "-q", converted], check=True)
 
         finally:
-            for path in [tmp_path, converted]:
-                if os.path.exists(path):
-                    os.remove(path)
+            if os.path.exists(converted):
+                os.remove(converted)
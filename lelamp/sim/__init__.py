@@ -0,0 +1,3 @@
+from .sim_bus import SimBusConfig, SimulatedMotorsBus, BusTransaction, is_sim_port, make_motors_bus, packet_bytes
+
+__all__ = ['SimBusConfig', 'SimulatedMotorsBus', 'BusTransaction', 'is_sim_port', 'make_motors_bus', 'packet_bytes']
\ No newline at end of file
@@ -0,0 +1,257 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from lelamp.utils import sleep_until
+from lelamp.utils.feetech import BITS_PER_BYTE, packet_bytes
+
+logger = logging.getLogger(__name__)
+
+SIM_SCHEME = "sim://"
+
+
+def is_sim_port(port: str) -> bool:
+    return port.startswith(SIM_SCHEME)
+
+
+@dataclass
+class SimBusConfig:
+    """Latency and servo response model of a simulated bus.
+
+    Parsed from a port URL, e.g. `sim://?latency_ms=1.5&tau_ms=60&jitter_ms=0.2`.
+    """
+
+    # Fixed turnaround per transaction (USB adapter + servo return delay)
+    latency_ms: float = 1.0
+    # Uniform random extra latency in [0, jitter_ms]
+    jitter_ms: float = 0.0
+    # Wire time is added from the packet size at this baudrate
+    baudrate: int = 1_000_000
+    # First-order servo time constant; 0 makes the servo snap to its goal
+    tau_ms: float = 50.0
+    # Sleep for the modeled latency so wall-clock timing is realistic
+    realtime: bool = True
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_port(cls, port: str) -> "SimBusConfig":
+        query = parse_qs(urlparse(port).query)
+        config = cls()
+        for name, values in query.items():
+            if not hasattr(config, name):
+                raise ValueError(f"Unknown simulated bus option {name!r} in {port}")
+            current = getattr(config, name)
+            value = values[-1]
+            if isinstance(current, bool):
+                setattr(config, name, value.lower() in ("1", "true", "yes"))
+            elif isinstance(current, int) and not isinstance(current, bool):
+                setattr(config, name, int(value))
+            elif name == "seed":
+                setattr(config, name, int(value))
+            else:
+                setattr(config, name, float(value))
+        return config
+
+
+@dataclass
+class BusTransaction:
+    """One recorded bus transaction"""
+
+    start: float
+    duration: float
+    kind: str
+    data_name: str
+    values: Dict[str, float] = field(default_factory=dict)
+    bytes: int = 0
+
+
+class SimulatedMotorsBus:
+    """Stand-in for FeetechMotorsBus with a latency model and first-order servos.
+
+    Implements the subset of the MotorsBus API that LeLamp uses. Positions are
+    kept in normalized units (whatever the motors' norm mode produces), so
+    calibration is a no-op. Every transaction is appended to `history`.
+    """
+
+    def __init__(self, port: str, motors: Dict[str, Any], calibration: Optional[Dict[str, Any]] = None,
+                 config: Optional[SimBusConfig] = None):
+        self.port = port
+        self.motors = motors
+        self.calibration = calibration or {}
+        self.config = config or SimBusConfig.from_port(port)
+        self.history: List[BusTransaction] = []
+
+        n_motors = len(motors)
+        self._index = {motor: i for i, motor in enumerate(motors)}
+        self._present = np.zeros(n_motors, dtype=np.float64)
+        self._goal = np.zeros(n_motors, dtype=np.float64)
+        self._torque = np.zeros(n_motors, dtype=bool)
+        self._registers: Dict[Tuple[str, str], Any] = {}
+        self._last_update = time.perf_counter()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._connected = False
+
+    def __repr__(self) -> str:
+        return f"SimulatedMotorsBus(port={self.port!r})"
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def is_calibrated(self) -> bool:
+        return True
+
+    def connect(self, handshake: bool = True):
+        self._connected = True
+        self._last_update = time.perf_counter()
+        logger.info(f"{self} connected.")
+
+    def disconnect(self, disable_torque: bool = True):
+        if disable_torque:
+            self.disable_torque()
+        self._connected = False
+        logger.info(f"{self} disconnected.")
+
+    def configure_motors(self):
+        pass
+
+    def write_calibration(self, calibration: Dict[str, Any]):
+        self.calibration = calibration
+
+    def set_half_turn_homings(self) -> Dict[str, int]:
+        return dict.fromkeys(self.motors, 0)
+
+    def record_ranges_of_motion(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        return dict.fromkeys(self.motors, 0), dict.fromkeys(self.motors, 4095)
+
+    def setup_motor(self, motor: str):
+        pass
+
+    def enable_torque(self, motors=None):
+        self._set_torque(motors, True)
+
+    def disable_torque(self, motors=None):
+        self._set_torque(motors, False)
+
+    @contextmanager
+    def torque_disabled(self):
+        self.disable_torque()
+        try:
+            yield
+        finally:
+            self.enable_torque()
+
+    def read(self, data_name: str, motor: str) -> float:
+        return self.sync_read(data_name, [motor])[motor]
+
+    def write(self, data_name: str, motor: str, value: Any):
+        self._transaction("write", data_name, {motor: value})
+
+    def sync_read(self, data_name: str, motors=None) -> Dict[str, float]:
+        if motors is None:
+            motors = list(self.motors)
+        elif isinstance(motors, str):
+            motors = [motors]
+        return self._transaction("sync_read", data_name, dict.fromkeys(motors))
+
+    def sync_write(self, data_name: str, values) -> None:
+        if not isinstance(values, dict):
+            values = dict.fromkeys(self.motors, values)
+        self._transaction("sync_write", data_name, values)
+
+    def goal_trajectory(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Times and (n_writes, n_motors) goals of every Goal_Position sync_write"""
+        return self._trajectory("sync_write", "Goal_Position")
+
+    def present_trajectory(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Times and (n_reads, n_motors) positions of every Present_Position sync_read"""
+        return self._trajectory("sync_read", "Present_Position")
+
+    def _trajectory(self, kind: str, data_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            records = [t for t in self.history if t.kind == kind and t.data_name == data_name]
+        times = np.array([t.start for t in records], dtype=np.float64)
+        frames = np.full((len(records), len(self.motors)), np.nan)
+        for row, record in enumerate(records):
+            for motor, value in record.values.items():
+                frames[row, self._index[motor]] = value
+        return times, frames
+
+    def _set_torque(self, motors, enabled: bool):
+        motors = list(self.motors) if motors is None else ([motors] if isinstance(motors, str) else motors)
+        self._transaction("sync_write", "Torque_Enable", dict.fromkeys(motors, int(enabled)))
+
+    def _transaction(self, kind: str, data_name: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        if not self._connected:
+            raise ConnectionError(f"{self} is not connected.")
+
+        with self._lock:
+            start = time.perf_counter()
+            self._advance_servos(start)
+            n_bytes = packet_bytes(kind, data_name, len(values))
+            duration = (
+                self.config.latency_ms * 1e-3
+                + n_bytes * BITS_PER_BYTE / self.config.baudrate
+                + self._random.uniform(0.0, self.config.jitter_ms * 1e-3)
+            )
+
+            if kind == "sync_read":
+                values = {motor: self._read_register(data_name, motor) for motor in values}
+            else:
+                values = dict(values)
+                for motor, value in values.items():
+                    self._write_register(data_name, motor, value)
+
+            self.history.append(BusTransaction(start, duration, kind, data_name, values, n_bytes))
+
+        if self.config.realtime:
+            sleep_until(start + duration)
+        return values
+
+    def _read_register(self, data_name: str, motor: str) -> Any:
+        index = self._index[motor]
+        if data_name == "Present_Position":
+            return float(self._present[index])
+        if data_name == "Goal_Position":
+            return float(self._goal[index])
+        if data_name == "Torque_Enable":
+            return int(self._torque[index])
+        return self._registers.get((data_name, motor), 0)
+
+    def _write_register(self, data_name: str, motor: str, value: Any):
+        index = self._index[motor]
+        if data_name == "Goal_Position":
+            self._goal[index] = value
+        elif data_name == "Torque_Enable":
+            self._torque[index] = bool(value)
+        else:
+            self._registers[(data_name, motor)] = value
+
+    def _advance_servos(self, now: float):
+        """First-order response of every torque-enabled servo toward its goal"""
+        dt = now - self._last_update
+        self._last_update = now
+        if dt <= 0:
+            return
+        tau = self.config.tau_ms * 1e-3
+        alpha = 1.0 if tau <= 0 else 1.0 - np.exp(-dt / tau)
+        self._present += np.where(self._torque, (self._goal - self._present) * alpha, 0.0)
+
+
+def make_motors_bus(port: str, motors: Dict[str, Any], calibration: Optional[Dict[str, Any]] = None):
+    """FeetechMotorsBus for a serial port, SimulatedMotorsBus for a `sim://` port"""
+    if is_sim_port(port):
+        return SimulatedMotorsBus(port=port, motors=motors, calibration=calibration)
+
+    from lerobot.motors.feetech import FeetechMotorsBus
+
+    return FeetechMotorsBus(port=port, motors=motors, calibration=calibration)
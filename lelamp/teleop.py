@@ -0,0 +1,163 @@
+import argparse
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .follower import BusWorker, LeLampFollower, LeLampFollowerConfig
+from .leader import LeLampLeader, LeLampLeaderConfig
+from .motion.recorder import RecordingWriter
+from .motion.recording import BINARY_SUFFIX, CSV_SUFFIX
+from .utils import FixedRateScheduler, LatencyHistogram
+from .utils.timing import DEFAULT_SPIN_MARGIN
+
+# Follower captures go in a subdirectory, which recording listings do not descend into,
+# so they are never offered as gestures to play
+CAPTURES_DIR = "_captures"
+
+
+class Teleoperator:
+    """Streams leader positions to the follower with the read and write on separate threads.
+
+    A reader thread samples the leader on a fixed-rate schedule and posts each
+    pose to the follower's BusWorker, whose thread writes it while the next
+    read is already under way. Each stream can be captured through a
+    RecordingWriter: the leader stream with its read timestamps, the follower
+    stream with the goals actually written.
+    """
+
+    def __init__(self, leader: LeLampLeader, follower: LeLampFollower, fps: int = 60,
+                 spin_margin: float = DEFAULT_SPIN_MARGIN, leader_writer: Optional[RecordingWriter] = None,
+                 follower_writer: Optional[RecordingWriter] = None):
+        self.leader = leader
+        self.follower = follower
+        self.fps = fps
+        self.leader_writer = leader_writer
+        self.follower_writer = follower_writer
+        self.read_latency = LatencyHistogram()
+        self.frames = 0
+
+        self._keys = list(follower.action_features)
+        self._positions = np.zeros(len(self._keys), dtype=np.float64)
+        self._scheduler = FixedRateScheduler(fps, spin_margin=spin_margin)
+        on_write = follower_writer.push if follower_writer is not None else None
+        self._worker = BusWorker(follower, name="teleop-follower-io", on_write=on_write)
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._worker.start()
+        self._running.set()
+        self._thread = threading.Thread(target=self._read_loop, name="teleop-leader-read", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._running.clear()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._worker.stop(timeout)
+        for writer in (self.leader_writer, self.follower_writer):
+            if writer is not None:
+                writer.close(timeout)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        bus = self._worker.stats
+        return {
+            "frames": self.frames,
+            "read": self.read_latency.summary(),
+            "write": bus["frame"],
+            "dropped": bus["dropped"],
+            "jitter": self._scheduler.stats.summary(),
+        }
+
+    def _read_loop(self):
+        self._scheduler.start()
+        while self._running.is_set():
+            try:
+                t0 = time.perf_counter()
+                action = self.leader.get_action()
+                self.read_latency.record(time.perf_counter() - t0)
+
+                positions = self._positions
+                positions[:] = [action[key] for key in self._keys]
+                self._worker.post(positions)
+                if self.leader_writer is not None:
+                    self.leader_writer.push(t0, positions)
+                self.frames += 1
+            except Exception as e:
+                print(f"Error reading leader: {e}")
+
+            self._scheduler.wait()
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    read, write, jitter = stats["read"], stats["write"], stats["jitter"]
+    return (
+        f"frames {stats['frames']:6d} | "
+        f"read p50 {read['p50_ms']:5.2f} p99 {read['p99_ms']:5.2f} ms | "
+        f"write p50 {write['p50_ms']:5.2f} p99 {write['p99_ms']:5.2f} ms | "
+        f"jitter p99 {jitter['p99_ms']:5.2f} ms | "
+        f"overruns {jitter['overruns']} dropped {stats['dropped']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the follower lamp live from the leader lamp")
+    parser.add_argument('--leader-port', type=str, required=True, help='Serial port of the leader lamp')
+    parser.add_argument('--leader-id', type=str, required=True, help='ID of the leader lamp')
+    parser.add_argument('--follower-port', type=str, required=True, help='Serial port of the follower lamp')
+    parser.add_argument('--follower-id', type=str, required=True, help='ID of the follower lamp')
+    parser.add_argument('--fps', type=int, default=60, help='Streaming rate (default: 60)')
+    parser.add_argument('--name', type=str, help='Also record the session under this name')
+    parser.add_argument('--format', type=str, choices=['csv', 'bin'], default='csv',
+                        help='Recording format (default: csv)')
+    parser.add_argument('--spin-margin-ms', type=float, default=DEFAULT_SPIN_MARGIN * 1000,
+                        help='Spin this long before each frame deadline instead of sleeping (default: %(default)s)')
+    args = parser.parse_args()
+
+    leader = LeLampLeader(LeLampLeaderConfig(port=args.leader_port, id=args.leader_id))
+    leader.connect(calibrate=False)
+    follower = LeLampFollower(LeLampFollowerConfig(port=args.follower_port, id=args.follower_id))
+    follower.connect(calibrate=False)
+
+    # The leader stream is a regular recording; the follower stream holds the goals actually sent
+    leader_writer = follower_writer = None
+    if args.name:
+        recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
+        captures_dir = os.path.join(recordings_dir, CAPTURES_DIR)
+        os.makedirs(captures_dir, exist_ok=True)
+        suffix = BINARY_SUFFIX if args.format == "bin" else CSV_SUFFIX
+        joint_names = list(follower.action_features)
+        leader_path = os.path.join(recordings_dir, f"{args.name}{suffix}")
+        follower_path = os.path.join(captures_dir, f"{args.name}_follower{suffix}")
+        leader_writer = RecordingWriter(leader_path, joint_names, fmt=args.format)
+        follower_writer = RecordingWriter(follower_path, joint_names, fmt=args.format)
+        print(f"Recording leader to {leader_path} and follower to {follower_path}")
+
+    teleop = Teleoperator(leader, follower, fps=args.fps, spin_margin=args.spin_margin_ms / 1000,
+                          leader_writer=leader_writer, follower_writer=follower_writer)
+    print(f"Streaming leader to follower at {args.fps} fps, press Ctrl+C to stop")
+    teleop.start()
+    try:
+        while True:
+            time.sleep(1.0)
+            print(format_stats(teleop.stats), end="\r", flush=True)
+    except KeyboardInterrupt:
+        print()
+        print("Shutting down teleop...")
+    finally:
+        teleop.stop()
+        print(format_stats(teleop.stats))
+        for writer in (leader_writer, follower_writer):
+            if writer is not None:
+                stats = writer.stats
+                print(f"{writer.path}: {stats['written']} frames written, {stats['dropped']} dropped")
+        follower.disconnect()
+        leader.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from .timing import FixedRateScheduler, OverrunPolicy, JitterStats, LatencyHistogram, PrecisionTimer, sleep_until
+
+__all__ = ['FixedRateScheduler', 'OverrunPolicy', 'JitterStats', 'LatencyHistogram', 'PrecisionTimer', 'sleep_until']
\ No newline at end of file
@@ -0,0 +1,19 @@
+# Feetech protocol framing: 0xFF 0xFF, id, length, instruction, checksum
+PACKET_OVERHEAD = 6
+# Serial bytes are sent 8N1, i.e. 10 bits on the wire per byte
+BITS_PER_BYTE = 10
+# Register width in bytes for the data names the runtime uses
+REGISTER_SIZES = {"Goal_Position": 2, "Present_Position": 2, "Torque_Enable": 1}
+
+
+def packet_bytes(kind: str, data_name: str, n_motors: int) -> int:
+    """Bytes on the wire for one Feetech transaction, request and status packets included"""
+    size = REGISTER_SIZES.get(data_name, 2)
+    if kind == "sync_write":
+        # address + length + per motor (id + data)
+        return PACKET_OVERHEAD + 2 + n_motors * (1 + size)
+    if kind == "sync_read":
+        # one request for all motors, then one status packet per motor
+        return PACKET_OVERHEAD + 2 + n_motors + n_motors * (PACKET_OVERHEAD + size)
+    # single write: address + data, then one status packet
+    return PACKET_OVERHEAD + 1 + size + PACKET_OVERHEAD
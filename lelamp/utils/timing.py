@@ -0,0 +1,202 @@
+import math
+import time
+from bisect import bisect_left
+from collections import deque
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+# Sleeping is only trusted up to this much before a deadline; the remainder
+# is spun out on the clock. Linux wake-up latency on a Pi is a few hundred
+# microseconds, so one millisecond keeps the spin short but safe.
+DEFAULT_SPIN_MARGIN = 0.001
+
+
+def sleep_until(deadline: float, spin_margin: float = DEFAULT_SPIN_MARGIN):
+    """Sleep until `deadline` on the perf_counter clock, spinning only the last `spin_margin` seconds"""
+    remaining = deadline - time.perf_counter()
+    if remaining > spin_margin:
+        time.sleep(remaining - spin_margin)
+    while time.perf_counter() < deadline:
+        pass
+
+
+class OverrunPolicy(str, Enum):
+    # Drop the ticks that were missed and resume on the original grid
+    SKIP = "skip"
+    # Run the missed ticks back to back until the loop is on schedule again
+    CATCH_UP = "catch_up"
+
+
+class JitterStats:
+    """Rolling record of how late each tick woke up relative to its deadline"""
+
+    def __init__(self, window: int = 1000):
+        self._samples = deque(maxlen=window)
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.max_lateness = 0.0
+
+    def record(self, lateness: float):
+        self._samples.append(lateness)
+        self.ticks += 1
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+
+    def percentile(self, q: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, float]:
+        samples = self._samples
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "mean_ms": (sum(samples) / len(samples) * 1e3) if samples else 0.0,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": self.max_lateness * 1e3,
+        }
+
+
+class PrecisionTimer:
+    """sleep_until with a configurable spin margin and a record of how late each wake-up was.
+
+    Use it in place of a busy wait: the thread sleeps until `spin_margin`
+    before the deadline and only spins the remainder.
+    """
+
+    def __init__(self, spin_margin: float = DEFAULT_SPIN_MARGIN, window: int = 1000):
+        self.spin_margin = spin_margin
+        self.stats = JitterStats(window)
+
+    def sleep_until(self, deadline: float) -> float:
+        """Wait for `deadline` (perf_counter clock); returns the wake-up error in seconds"""
+        if time.perf_counter() > deadline:
+            self.stats.overruns += 1
+        else:
+            sleep_until(deadline, self.spin_margin)
+        error = time.perf_counter() - deadline
+        self.stats.record(error)
+        return error
+
+    def sleep(self, seconds: float) -> float:
+        return self.sleep_until(time.perf_counter() + seconds)
+
+
+class LatencyHistogram:
+    """Log-spaced histogram of durations, cheap enough to record every bus transaction.
+
+    Bucket upper bounds run from `min_ms` to `max_ms` with `per_decade` buckets
+    per factor of ten; anything slower lands in a final overflow bucket.
+    Percentiles are reported as the upper bound of the bucket they fall in,
+    capped at the largest duration seen.
+    """
+
+    def __init__(self, min_ms: float = 0.05, max_ms: float = 1000.0, per_decade: int = 10):
+        n_buckets = int(math.ceil(math.log10(max_ms / min_ms) * per_decade)) + 1
+        self.bounds_ms: List[float] = [min_ms * 10 ** (i / per_decade) for i in range(n_buckets)]
+        self._bounds = [bound * 1e-3 for bound in self.bounds_ms]
+        self.counts: List[int] = [0] * (n_buckets + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect_left(self._bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Upper bound in seconds of the bucket holding the q-th percentile"""
+        if not self.count:
+            return 0.0
+        target = q / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return min(self._bounds[index], self.max) if index < len(self._bounds) else self.max
+        return self.max
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """(upper bound ms, count) of every non-empty bucket; the overflow bucket is bounded by inf"""
+        bounds = self.bounds_ms + [math.inf]
+        return [(bound, count) for bound, count in zip(bounds, self.counts) if count]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": (self.total / self.count * 1e3) if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": self.max * 1e3,
+        }
+
+
+class FixedRateScheduler:
+    """Paces a loop on absolute monotonic deadlines so timing error never accumulates.
+
+    Call `start()` right before the first iteration and `wait()` at the end of
+    each one. `wait()` returns how many ticks elapsed: 1 when on time, more
+    than 1 when an overrun was resolved by skipping ticks.
+    """
+
+    def __init__(self, rate_hz: float, overrun: OverrunPolicy = OverrunPolicy.SKIP,
+                 spin_margin: float = DEFAULT_SPIN_MARGIN, max_catch_up: int = 5, window: int = 1000):
+        if rate_hz <= 0:
+            raise ValueError(f"rate_hz must be positive, got {rate_hz}")
+        self.period = 1.0 / rate_hz
+        self.overrun = OverrunPolicy(overrun)
+        self.max_catch_up = max_catch_up
+        self.timer = PrecisionTimer(spin_margin, window)
+        self._next_deadline: Optional[float] = None
+
+    @property
+    def stats(self) -> JitterStats:
+        return self.timer.stats
+
+    @property
+    def spin_margin(self) -> float:
+        return self.timer.spin_margin
+
+    @property
+    def rate_hz(self) -> float:
+        return 1.0 / self.period
+
+    def start(self, now: Optional[float] = None):
+        now = time.perf_counter() if now is None else now
+        self._next_deadline = now + self.period
+
+    def wait(self) -> int:
+        if self._next_deadline is None:
+            self.start()
+
+        deadline = self._next_deadline
+        now = time.perf_counter()
+
+        if now <= deadline:
+            self.timer.sleep_until(deadline)
+            self._next_deadline = deadline + self.period
+            return 1
+
+        # Overrun: the work of this tick ran past its deadline
+        self.stats.overruns += 1
+        self.stats.record(now - deadline)
+        missed = int((now - deadline) // self.period)
+
+        if self.overrun == OverrunPolicy.CATCH_UP and missed < self.max_catch_up:
+            # Return immediately; subsequent ticks run back to back until on time
+            self._next_deadline = deadline + self.period
+            return 1
+
+        # Skip the ticks that can no longer be met and stay on the original grid
+        self.stats.skipped += missed
+        self._next_deadline = deadline + (missed + 1) * self.period
+        return missed + 1
@@ -0,0 +1,74 @@
+import argparse
+import os
+
+from .motion.keyframes import load_trajectory
+from .motion.recording import list_recording_names
+from .motion.validation import VALIDATION_MODES, JointLimits, validate_source
+
+
+def validate_recording(recordings_dir, recording_name, fps=30, limits=None, mode="report"):
+    """Validate one recording at its recorded rate, as the trajectory cache does. Returns the report or None."""
+    trajectory = load_trajectory(recordings_dir, recording_name, fps=fps)
+    if trajectory is None:
+        print(f"Skipping {recording_name}: no recording found")
+        return None
+
+    _, report = validate_source(trajectory, limits, mode)
+    joint_names = [name.removesuffix(".pos") for name in trajectory.joint_names]
+
+    if not report.violations:
+        status = "ok"
+    elif not report.fixed:
+        status = "UNSAFE"
+    elif report.safe:
+        status = f"stretched x{report.stretch:.2f}" if mode == "stretch" else "clipped"
+    else:
+        status = "UNSAFE after fixing"
+    print(f"{recording_name}: {status}")
+    print(f"  Frames: {report.frames} ({report.frames / report.fps:.2f}s at {report.fps:.0f} fps)")
+    if report.violations:
+        print(f"  Violations: {report.position_violations} position, {report.velocity_violations} velocity, "
+              f"{report.acceleration_violations} acceleration")
+    for label, unit, peaks in (("velocity", "/s", report.peak_velocity),
+                               ("acceleration", "/s^2", report.peak_acceleration)):
+        peak = max(range(len(peaks)), key=peaks.__getitem__, default=None)
+        if peak is not None:
+            print(f"  Peak {label}: {peaks[peak]:.1f}{unit} on {joint_names[peak]}")
+    print()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check recordings against joint limits")
+    parser.add_argument('--name', type=str, help='Name of the recording to check (default: all recordings)')
+    parser.add_argument('--dir', type=str, default=os.path.join(os.path.dirname(__file__), "recordings"),
+                        help='Recordings directory')
+    parser.add_argument('--fps', type=int, default=30,
+                        help='Rate of recordings without timestamps (default: 30); others are checked at their own')
+    parser.add_argument('--mode', type=str, choices=VALIDATION_MODES, default='report',
+                        help='How violations would be fixed on load (default: report, leave them)')
+    defaults = JointLimits()
+    parser.add_argument('--min-position', type=float, default=defaults.position_min,
+                        help='Lowest joint position (default: %(default)s)')
+    parser.add_argument('--max-position', type=float, default=defaults.position_max,
+                        help='Highest joint position (default: %(default)s)')
+    parser.add_argument('--max-velocity', type=float, default=defaults.max_velocity,
+                        help='Joint velocity limit in units per second (default: %(default)s)')
+    parser.add_argument('--max-acceleration', type=float, default=defaults.max_acceleration,
+                        help='Joint acceleration limit in units per second squared (default: %(default)s)')
+    args = parser.parse_args()
+
+    names = [args.name] if args.name else list_recording_names(args.dir)
+    if not names:
+        print(f"No recordings found in {args.dir}")
+        return
+
+    limits = JointLimits(args.min_position, args.max_position, args.max_velocity, args.max_acceleration)
+    reports = [validate_recording(args.dir, name, args.fps, limits, args.mode) for name in names]
+    reports = [report for report in reports if report is not None]
+    failing = sum(1 for report in reports if report.violations)
+    print(f"{len(reports) - failing} of {len(reports)} recordings within limits")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from dotenv import load_dotenv
 import subprocess
 from lelamp.service.tts import EdgeTTS
-from lelamp.service.audio_processor import AudioProcessor
+from lelamp.service.audio_processor import AudioProcessor, VALID_RECORDINGS
 
 from livekit import agents, api, rtc
 from livekit.agents import (
@@ -49,7 +49,8 @@ Never hallucinate function names. Only use the ones listed.""")
         self.motors_service = MotorsService(
             port=port,
             lamp_id=lamp_id,
-            fps=30
+            fps=30,
+            warm_recordings=VALID_RECORDINGS
         )
         # self.rgb_service = RGBService(
         #     led_count=64,
@@ -15,6 +15,7 @@ from livekit.plugins import (
     noise_cancellation,
 )
 from typing import Union
+from lelamp.motion import IdleMotion
 from lelamp.service.motors.animation_service import AnimationService
 from lelamp.service.rgb.rgb_service import RGBService
 
@@ -47,7 +48,8 @@ Demo rules:
             lamp_id=lamp_id,
             fps=30,
             duration=3.0,
-            idle_recording="idle"
+            idle_recording="idle",
+            idle_motion=IdleMotion()
         )
         self.rgb_service = RGBService(
             led_count=40,
@@ -240,6 +242,12 @@ async def entrypoint(ctx: agents.JobContext):
         )
     )
 
+    # Idle calms down while the lamp is talking
+    @session.on("agent_state_changed")
+    def on_agent_state_changed(event):
+        gain = 0.3 if event.new_state == "speaking" else 1.0
+        agent.animation_service.dispatch("idle", {"gain": gain, "fade": 0.5})
+
     await session.start(
         room=ctx.room,
         agent=agent,
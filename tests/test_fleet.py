@@ -0,0 +1,52 @@
+import os
+import shutil
+
+import pytest
+
+# lelamp.fleet drives LeLampFollower robots, which need lerobot
+pytest.importorskip("lerobot")
+
+from lelamp.fleet import LampFleet  # noqa: E402
+
+RECORDINGS = os.path.join(os.path.dirname(__file__), "..", "lelamp", "recordings")
+
+PORTS = {"lamp0": "sim://", "lamp1": "sim://?latency_ms=2"}
+
+
+@pytest.fixture
+def connected(monkeypatch):
+    """Every lamp the fleet connects, kept after the fleet lets go of it"""
+    lamps = []
+    connect = LampFleet._connect
+
+    def recording_connect(lamp_id, port):
+        lamp = connect(lamp_id, port)
+        lamps.append(lamp)
+        return lamp
+
+    monkeypatch.setattr(LampFleet, "_connect", staticmethod(recording_connect))
+    return lamps
+
+
+def test_clip_returns_to_idle(tmp_path, connected):
+    for name in ("idle", "nod"):
+        shutil.copy(os.path.join(RECORDINGS, f"{name}.csv"), tmp_path / f"{name}.csv")
+    fleet = LampFleet(PORTS, recordings_dir=str(tmp_path))
+    fleet.start()
+    try:
+        fleet.play("nod", offset=0.1)
+        assert fleet.is_playing
+        assert fleet.wait_until_idle(timeout=15)
+    finally:
+        fleet.stop()
+    assert not any(lamp.robot.bus.is_connected for lamp in connected)
+
+
+def test_missing_idle_fails_start_and_disconnects(tmp_path, connected):
+    shutil.copy(os.path.join(RECORDINGS, "nod.csv"), tmp_path / "nod.csv")
+    fleet = LampFleet(PORTS, recordings_dir=str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        fleet.start()
+    assert len(connected) == len(PORTS)
+    assert not any(lamp.robot.bus.is_connected for lamp in connected)
+    assert not fleet.is_playing
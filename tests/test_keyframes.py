@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from lelamp.motion import KeyframeTrajectory, Trajectory, read_keyframes, write_keyframes
+from lelamp.motion.keyframes import simplify
+
+
+def random_walk(n=600, fps=30.0, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = np.cumsum(rng.normal(0.0, 0.8, size=(n, 3)), axis=0)
+    # A joint that never moves
+    frames[:, 2] = 12.5
+    return Trajectory(np.arange(n) / fps, frames, ["a.pos", "b.pos", "c.pos"])
+
+
+@pytest.mark.parametrize("tolerance", [0.05, 0.25, 1.0])
+def test_error_stays_within_tolerance(tolerance):
+    trajectory = random_walk()
+    keyframes = KeyframeTrajectory.from_trajectory(trajectory, tolerance)
+    error = np.abs(keyframes.sample(trajectory.times) - trajectory.frames)
+    assert error.max() <= tolerance + 1e-9
+    assert keyframes.n_keyframes < trajectory.frames.size
+
+
+def test_file_round_trip_keeps_the_bound(tmp_path):
+    trajectory = random_walk()
+    tolerance = 0.25
+    path = tmp_path / "walk.lkf"
+    write_keyframes(KeyframeTrajectory.from_trajectory(trajectory, tolerance), str(path))
+    keyframes = read_keyframes(str(path))
+    assert keyframes.joint_names == trajectory.joint_names
+    # Keyframes are stored as float32
+    error = np.abs(keyframes.sample(trajectory.times) - trajectory.frames)
+    assert error.max() <= tolerance + 1e-3
+
+
+def test_held_joint_and_endpoints():
+    trajectory = random_walk()
+    keyframes = KeyframeTrajectory.from_trajectory(trajectory, 0.25)
+    times, values = keyframes.keys[2]
+    assert len(times) == 2 and np.all(values == 12.5)
+    for times, _ in keyframes.keys:
+        assert times[0] == 0.0 and times[-1] == pytest.approx(trajectory.duration)
+
+
+def test_simplify_short_series():
+    assert simplify(np.array([0.0, 1.0]), np.array([3.0, 4.0]), 0.1).tolist() == [0, 1]
+    assert simplify(np.array([0.0, 1.0, 2.0]), np.array([0.0, 1.0, 2.0]), 0.1).tolist() == [0, 2]
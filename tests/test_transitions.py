@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from lelamp.motion import MotionLimits, crossfade, transition_duration
+from lelamp.motion.transitions import minimum_jerk
+
+FPS = 30.0
+
+
+def ramp(start, n=120, step=0.5):
+    return np.asarray(start, dtype=np.float64) + step * np.arange(n)[:, None]
+
+
+def test_minimum_jerk_endpoints():
+    assert minimum_jerk(np.array([0.0, 0.5, 1.0])).tolist() == [0.0, 0.5, 1.0]
+
+
+def test_duration_is_bounded():
+    limits = MotionLimits()
+    start = np.zeros(5)
+    assert transition_duration(start, start, limits) == limits.min_duration
+    assert transition_duration(start, np.full(5, 1e4), limits) == limits.max_duration
+    far = transition_duration(start, np.full(5, 50.0), limits)
+    near = transition_duration(start, np.full(5, 5.0), limits)
+    assert limits.min_duration <= near < far <= limits.max_duration
+
+
+@pytest.mark.parametrize("velocity", [None, np.array([20.0, -20.0])])
+def test_crossfade_starts_on_the_pose_and_lands_on_the_clip(velocity):
+    start = np.array([40.0, -30.0])
+    clip = ramp([0.0, 0.0])
+    frames, consumed = crossfade(start, clip, FPS, MotionLimits(), velocity)
+    assert np.allclose(frames[0], start)
+    assert consumed == len(frames)
+    # The blend ends a single clip step short of where playback continues
+    assert np.allclose(frames[-1], clip[consumed], atol=1.0)
+    assert np.abs(np.diff(frames, axis=0)).max() < np.abs(start - clip[0]).max()
+
+
+def test_crossfade_into_a_short_clip_holds_its_last_frame():
+    start = np.array([40.0, -30.0])
+    clip = np.array([[0.0, 0.0], [1.0, 1.0]])
+    frames, consumed = crossfade(start, clip, FPS, MotionLimits())
+    assert consumed == len(clip)
+    assert len(frames) > len(clip)
+    assert np.allclose(frames[0], start)
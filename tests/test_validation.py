@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import pytest
+
+from lelamp.motion import JointLimits, Trajectory, check_trajectory, load_trajectory, validate_trajectory
+from lelamp.motion.recording import list_recording_names
+from lelamp.motion.validation import SOURCE_FPS, validate_source
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "lelamp", "recordings")
+
+
+def sway(fps, seconds=3.0, glitch=True):
+    """Two joints swaying well within the default limits, with a dropped-sample jump on the first"""
+    t = np.arange(int(seconds * fps)) / fps
+    frames = np.stack([30.0 * np.sin(t), 10.0 * np.cos(2.0 * t)], axis=1)
+    if glitch:
+        frames[len(frames) // 2, 0] += 60.0
+    return frames
+
+
+@pytest.mark.parametrize("fps", [30, 100])
+def test_within_limits_is_returned_unchanged(fps):
+    frames = sway(fps, glitch=False)
+    fixed, report = validate_trajectory(frames, fps, JointLimits(), "clip")
+    assert fixed is frames
+    assert report.safe and not report.fixed and report.violations == 0
+
+
+@pytest.mark.parametrize("fps", [30, 100])
+def test_clip_keeps_timing_and_fits_limits(fps):
+    frames = sway(fps)
+    fixed, report = validate_trajectory(frames, fps, JointLimits(), "clip")
+    assert report.velocity_violations > 0
+    assert report.fixed and report.safe
+    assert fixed.shape == frames.shape
+    assert check_trajectory(fixed, fps, JointLimits()).safe
+    # Only the neighbourhood of the glitch moves
+    assert np.allclose(fixed[:len(frames) // 4], frames[:len(frames) // 4])
+
+
+@pytest.mark.parametrize("fps", [30, 100])
+def test_stretch_lengthens_and_fits_limits(fps):
+    frames = sway(fps)
+    limits = JointLimits(max_velocity=20.0, max_acceleration=200.0)
+    fixed, report = validate_trajectory(frames, fps, limits, "stretch")
+    assert report.safe
+    assert report.stretch > 1.0
+    assert len(fixed) > len(frames)
+    assert check_trajectory(fixed, fps, limits).safe
+
+
+def test_positions_are_clipped_to_the_range():
+    frames = sway(30, glitch=False) * 4.0
+    fixed, report = validate_trajectory(frames, 30, JointLimits(max_velocity=1e6, max_acceleration=1e9), "clip")
+    assert report.position_violations > 0
+    assert fixed.min() >= -100.0 and fixed.max() <= 100.0
+
+
+def test_report_mode_counts_without_fixing():
+    frames = sway(30)
+    fixed, report = validate_trajectory(frames, 30, JointLimits(), "report")
+    assert fixed is frames
+    assert report.violations > 0 and not report.safe and not report.fixed
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        validate_trajectory(sway(30), 30, JointLimits(), "smooth")
+
+
+def test_source_validation_does_not_depend_on_playback_rate():
+    # Corners between samples become one-tick acceleration spikes once resampled to a faster loop
+    frames = sway(SOURCE_FPS, glitch=False)
+    frames[::6] += 0.5
+    trajectory = Trajectory(np.arange(len(frames)) / SOURCE_FPS, frames, ["a.pos", "b.pos"])
+    limits = JointLimits()
+    assert check_trajectory(trajectory.resample(SOURCE_FPS), SOURCE_FPS, limits).safe
+    assert not check_trajectory(trajectory.resample(100), 100, limits).safe
+
+    checked, report = validate_source(trajectory, limits, "clip")
+    assert checked is trajectory
+    assert report.safe and report.fps == pytest.approx(SOURCE_FPS)
+
+
+@pytest.mark.parametrize("name", list_recording_names(RECORDINGS_DIR))
+def test_shipped_recordings_are_within_default_limits(name):
+    _, report = validate_source(load_trajectory(RECORDINGS_DIR, name), JointLimits())
+    assert report.safe, f"{name}: {report}"
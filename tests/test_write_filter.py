@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+# lelamp.follower imports the robot class, which needs lerobot
+pytest.importorskip("lerobot")
+
+from lelamp.follower.write_filter import DeltaWriteFilter  # noqa: E402
+from lelamp.utils.feetech import packet_bytes  # noqa: E402
+
+MOTORS = ["base_yaw", "base_pitch", "elbow_pitch"]
+
+
+def test_zero_deadband_is_disabled():
+    assert not DeltaWriteFilter(MOTORS).enabled
+    assert DeltaWriteFilter(MOTORS, {"base_yaw": 0.5}).enabled
+
+
+def test_first_frame_writes_every_motor():
+    write_filter = DeltaWriteFilter(MOTORS, 0.5)
+    assert write_filter.select(np.zeros(3)).all()
+    assert write_filter.stats.full_writes == 1
+
+
+def test_deadband_skips_small_moves_until_they_add_up():
+    write_filter = DeltaWriteFilter(MOTORS, 0.5, full_write_interval=0)
+    write_filter.select(np.zeros(3))
+    assert not write_filter.select(np.array([0.3, 0.0, 2.0]))[0]
+    # Measured from the value last written, so the drift goes out once it passes the deadband
+    assert write_filter.select(np.array([0.6, 0.0, 2.0])).tolist() == [True, False, False]
+    assert not write_filter.select(np.array([0.6, 0.0, 2.0])).any()
+    assert write_filter.stats.packets_saved == 1
+
+
+def test_full_write_interval_refreshes_held_goals():
+    write_filter = DeltaWriteFilter(MOTORS, 0.5, full_write_interval=4)
+    goal = np.zeros(3)
+    written = [write_filter.select(goal).all() for _ in range(9)]
+    assert written == [True, False, False, False, True, False, False, False, True]
+
+
+def test_reset_forces_a_full_write():
+    write_filter = DeltaWriteFilter(MOTORS, 0.5, full_write_interval=0)
+    write_filter.select(np.zeros(3))
+    write_filter.reset()
+    assert write_filter.select(np.zeros(3)).all()
+
+
+def test_per_motor_deadband_and_byte_accounting():
+    write_filter = DeltaWriteFilter(MOTORS, {"base_yaw": 5.0}, full_write_interval=0)
+    write_filter.select(np.zeros(3))
+    assert write_filter.select(np.array([1.0, 1.0, 0.0])).tolist() == [False, True, False]
+    stats = write_filter.stats
+    full = packet_bytes("sync_write", "Goal_Position", 3)
+    assert stats.bytes_sent == full + packet_bytes("sync_write", "Goal_Position", 1)
+    assert stats.bytes_saved == full - packet_bytes("sync_write", "Goal_Position", 1)
+    with pytest.raises(KeyError):
+        DeltaWriteFilter(MOTORS, {"shoulder": 1.0})